@@ -0,0 +1,124 @@
+"""Benchmark parsing of the Eleos AI research page.
+
+Compares the single-sweep parser used by ``eleos_blog`` with the previous
+approach, which called ``get_text()`` on every ancestor of every post link
+until a date matched, and on the next <p>/<div> for the description. Pages are
+synthesized with a growing number of posts; some cards have no date, so their
+ancestor walk climbs to <body> like on the real page. Both parsers must return
+the same posts.
+
+Usage:
+    python benchmarks/eleos_parse.py [--posts 50 200 800] [--repeat 3] [--fixture page.html]
+"""
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "feed_generators"))
+
+from eleos_blog import BASE_URL, parse_blog_html, parse_date  # noqa: E402
+
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August"]
+
+
+def synthesize_page(post_count):
+    """Build a research page listing ``post_count`` posts in nested card markup."""
+    cards = []
+    for i in range(post_count):
+        date = f"<p>Blog · {MONTHS[i % 8]} {i % 28 + 1}, 2025</p>" if i % 5 else ""
+        cards.append(
+            f'<div class="card"><div class="meta">{date}</div>'
+            f'<div class="title"><a href="/post/post-{i}">Research post number {i}</a></div>'
+            f"<div><p>Summary of post {i}. " + "Body text that goes on. " * 10 + "</p></div></div>"
+        )
+    grid = "".join(cards)
+    return (
+        "<html><head><script>var config = {};</script></head><body>"
+        f'<div class="page"><div class="section"><div class="grid">{grid}</div></div></div>'
+        "</body></html>"
+    )
+
+
+def legacy_parse(html_content):
+    """The previous ancestor-walking implementation, kept for comparison."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    blog_posts = []
+    seen_links = set()
+    for link in soup.find_all("a", href=re.compile(r"^/post/")):
+        href = link.get("href", "")
+        if not href or href in seen_links:
+            continue
+        seen_links.add(href)
+        title = link.get_text(strip=True)
+        if not title or len(title) < 3:
+            continue
+
+        date = None
+        parent = link.parent
+        while parent and not date:
+            text = parent.get_text()
+            date_match = re.search(r"(?:Blog\s*·\s*)?([A-Z][a-z]+\s+\d{1,2},?\s+\d{4})", text)
+            if date_match:
+                date = parse_date(date_match.group(1))
+                break
+            parent = parent.parent
+            if parent and parent.name == "body":
+                break
+
+        description = title
+        next_elem = link.find_next(["p", "div"])
+        if next_elem and next_elem.get_text(strip=True):
+            desc_text = next_elem.get_text(strip=True)
+            if len(desc_text) > 10 and desc_text != title:
+                description = desc_text[:300]
+
+        blog_posts.append({"title": title, "date": date, "description": description, "link": f"{BASE_URL}{href}"})
+    return blog_posts
+
+
+def time_call(func, html_content, repeat):
+    """Return (median milliseconds, result) of ``func(html_content)``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html_content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fixture", type=Path, help="Recorded research page HTML")
+    args = parser.parse_args()
+
+    if args.fixture:
+        pages = [(args.fixture.name, args.fixture.read_text(encoding="utf-8"))]
+    else:
+        pages = [(f"{n} posts", synthesize_page(n)) for n in args.posts]
+
+    print(f"{'page':<16}{'size':>10}{'single sweep':>22}{'legacy':>22}")
+    for label, html_content in pages:
+        new_ms, new_posts = time_call(parse_blog_html, html_content, args.repeat)
+        old_ms, old_posts = time_call(legacy_parse, html_content, args.repeat)
+        if new_posts != old_posts:
+            sys.exit(f"{label}: single-sweep parser disagrees with the legacy parser")
+        print(
+            f"{label:<16}{len(html_content) // 1024:>8}KB"
+            f"{new_ms:>12.1f} ms ({len(new_posts):>4})"
+            f"{old_ms:>12.1f} ms ({len(old_posts):>4})"
+        )
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
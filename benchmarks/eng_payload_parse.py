@@ -0,0 +1,116 @@
+"""Benchmark parsing of the Anthropic Engineering page's Next.js RSC payload.
+
+Compares the streaming flight-row decoder used by ``anthropic_eng_blog`` with
+the previous approach (regex over the escaped script plus a 2000-character
+window per slug). By default the pages are synthesized with a growing number
+of articles so the scaling is visible; pass ``--fixture`` to time a saved page
+instead, e.g. tests/fixtures/anthropic_engineering.html (the page shape the
+unit tests decode) or a fresh copy of https://www.anthropic.com/engineering.
+
+Usage:
+    python benchmarks/eng_payload_parse.py [--articles 50 200 800] [--repeat 5] [--fixture page.html]
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "feed_generators"))
+
+from anthropic_eng_blog import parse_engineering_html  # noqa: E402
+
+
+def synthesize_page(article_count):
+    """Build an engineering page whose RSC payload lists ``article_count`` articles."""
+    body = "Long-form body text with unicode — “quotes” and newlines.\n" * 40
+    rows = [f"1:T{len(body.encode('utf-8')):x},{body}"]
+    articles = [
+        {
+            "_type": "engineeringArticle",
+            "publishedOn": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "slug": {"_type": "slug", "current": f"article-{i}"},
+            "body": "$1" if i % 3 else [{"_type": "block", "text": body}],
+            "summary": f"Summary of article {i} with \"quoted\" text",
+            "title": f"Engineering article number {i}",
+        }
+        for i in range(article_count)
+    ]
+    rows.append("2:" + json.dumps(["$", "div", None, {"articles": articles}], ensure_ascii=False, separators=(",", ":")))
+    payload = "\n".join(rows) + "\n"
+
+    # Next.js pushes the payload in several chunks; the article list sits in one of them
+    scripts = [
+        f"<script>self.__next_f.push([1,{json.dumps(chunk)}])</script>"
+        for chunk in ('0:["$","html",null,{}]\n', payload)
+    ]
+    return "<html><body>" + "".join(scripts) + "</body></html>"
+
+
+def legacy_parse(html_content):
+    """The previous regex-window implementation, kept for comparison."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    script_content = next(
+        (
+            s.string
+            for s in soup.find_all("script")
+            if s.string and "publishedOn" in s.string and "engineeringArticle" in s.string
+        ),
+        None,
+    )
+    if not script_content:
+        return []
+
+    pattern = r'\\"publishedOn\\":\\"([^"]+?)\\",\\"slug\\":\{[^}]*?\\"current\\":\\"([^"]+?)\\"'
+    articles = []
+    for published_date, slug in re.findall(pattern, script_content):
+        slug_pos = script_content.find(f'\\"current\\":\\"{slug}\\"')
+        search_section = script_content[slug_pos:slug_pos + 2000]
+        title_match = re.search(r'\\"title\\":\\"(.*?)(?<!\\)\\"', search_section)
+        articles.append((published_date, slug, title_match.group(1) if title_match else None))
+    return articles
+
+
+def time_call(func, html_content, repeat):
+    """Return (median milliseconds, result length) of ``func(html_content)``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html_content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--articles", type=int, nargs="+", default=[50, 200, 800])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--fixture", type=Path, help="Recorded engineering page HTML")
+    args = parser.parse_args()
+
+    if args.fixture:
+        pages = [(args.fixture.name, args.fixture.read_text(encoding="utf-8"))]
+    else:
+        pages = [(f"{n} articles", synthesize_page(n)) for n in args.articles]
+
+    print(f"{'page':<16}{'size':>10}{'streaming':>22}{'legacy':>22}")
+    for label, html_content in pages:
+        new_ms, new_count = time_call(parse_engineering_html, html_content, args.repeat)
+        old_ms, old_count = time_call(legacy_parse, html_content, args.repeat)
+        print(
+            f"{label:<16}{len(html_content) // 1024:>8}KB"
+            f"{new_ms:>12.1f} ms ({new_count:>4})"
+            f"{old_ms:>12.1f} ms ({old_count:>4})"
+        )
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,95 @@
+"""Measure the cold-start import cost of every feed generator.
+
+Each generator is imported in a fresh interpreter with ``python -X importtime``
+and the cumulative time of its imports is reported, together with the heaviest
+top-level packages it pulls in. Results can be saved with ``--json`` and compared
+against an earlier run with ``--baseline``.
+
+Usage:
+    python benchmarks/startup_importtime.py [--repeat 3] [--json out.json] [--baseline out.json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+GENERATORS_DIR = Path(__file__).resolve().parent.parent / "feed_generators"
+SKIP_SCRIPTS = {"run_all_feeds.py"}
+
+
+def run_importtime(module_name):
+    """Import a generator under ``-X importtime`` and return its import tree.
+
+    Returns:
+        list: (depth, module, cumulative microseconds) entries in report order
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=GENERATORS_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative)))
+    return entries
+
+
+def measure(module_name, repeat):
+    """Return (median total ms, heaviest direct imports) for one generator."""
+    totals = []
+    direct_imports = []
+    for _ in range(repeat):
+        entries = run_importtime(module_name)
+        totals.append(sum(us for depth, _, us in entries if depth == 0) / 1000)
+        direct_imports = [(name, us) for depth, name, us in entries if depth == 1]
+    heaviest = sorted(direct_imports, key=lambda item: item[1], reverse=True)[:4]
+    return statistics.median(totals), heaviest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generator cold-start import time")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per generator (median is reported)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against results from an earlier --json run")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+
+    results = {}
+    for script in sorted(GENERATORS_DIR.glob("*.py")):
+        if script.name in SKIP_SCRIPTS:
+            continue
+        try:
+            total_ms, heaviest = measure(script.stem, args.repeat)
+        except RuntimeError as e:
+            print(f"{script.stem:<36} failed to import: {e}")
+            continue
+
+        results[script.stem] = round(total_ms, 1)
+        delta = ""
+        if script.stem in baseline:
+            delta = f" ({total_ms - baseline[script.stem]:+8.1f} ms)"
+        top = ", ".join(f"{name} {us / 1000:.0f}ms" for name, us in heaviest)
+        print(f"{script.stem:<36} {total_ms:8.1f} ms{delta}  [{top}]")
+
+    print(f"\nTotal cold-start import cost per run: {sum(results.values()):.1f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+if __name__ == "__main__":
+    main()
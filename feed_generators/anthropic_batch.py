@@ -0,0 +1,117 @@
+"""Generate the Selenium-backed www.anthropic.com feeds in one browser session.
+
+Each source first tries its cheap paths (sitemap discovery, embedded page data).
+Only the sources that still have no articles are rendered, all in one Chrome
+session that warms up on the origin once, instead of one Chrome and one bot
+check per script. run_all_feeds.py runs this script in place of the individual
+news and research scripts.
+"""
+
+import logging
+from functools import partial
+
+import anthropic_news_blog
+import anthropic_research_blog
+from utils.browser import render_pages
+from utils.enrich import enrich_articles
+from utils.health import record_failure, record_run, should_skip
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+ORIGIN = "https://www.anthropic.com"
+
+# Feed name -> how to build it. "render" runs inside the shared session and its
+# result is handed to "parse"; the warmup already waited for the origin, so the
+# per-page settle time is short. "enrich" fills in summaries and full text from
+# the article pages (see utils.enrich).
+SOURCES = {
+    "anthropic_news": {
+        "module": anthropic_news_blog,
+        "fetch": anthropic_news_blog.fetch_news_articles_without_browser,
+        "render": partial(anthropic_news_blog.render_news_cards, wait_time=1),
+        "parse": anthropic_news_blog.parse_news_cards,
+        "enrich": True,
+    },
+    "anthropic_research": {
+        "module": anthropic_research_blog,
+        "fetch": anthropic_research_blog.fetch_research_articles_embedded,
+        "render": partial(anthropic_research_blog.render_research_page, wait_time=1),
+        "parse": anthropic_research_blog.parse_research_html,
+    },
+}
+
+
+def save_feed(feed_name, source, articles, selector_hits=None):
+    """Record the source's health and write its feed if articles were found."""
+    module = source["module"]
+    record_run(module.__file__, len(articles), selector_hits)
+    if not articles:
+        logger.warning(f"No articles found for {feed_name}")
+        return False
+
+    if source.get("enrich"):
+        enrich_articles(articles, feed_name)
+    feed = module.generate_rss_feed(articles, feed_name)
+    module.save_rss_feed(feed, feed_name)
+    logger.info(f"Successfully generated {feed_name} feed with {len(articles)} articles")
+    return True
+
+
+def main():
+    """Build every source, rendering only those without a cheaper data path."""
+    success = True
+    needs_render = {}
+
+    for feed_name, source in SOURCES.items():
+        if should_skip(source["module"].__file__):
+            continue
+        try:
+            articles = source["fetch"]()
+        except Exception as e:
+            logger.warning(f"Cheap fetch failed for {feed_name}: {e}")
+            articles = []
+
+        if articles:
+            success = save_feed(feed_name, source, articles) and success
+        else:
+            needs_render[feed_name] = source
+
+    if not needs_render:
+        logger.info("All sources built without a browser")
+        return success
+
+    logger.info(f"Rendering {', '.join(needs_render)} in one browser session")
+    try:
+        allow = {item for source in needs_render.values() for item in source["module"].RENDER_ALLOW}
+        pages = render_pages(
+            ORIGIN,
+            {name: source["render"] for name, source in needs_render.items()},
+            allow=tuple(allow),
+        )
+    except Exception as e:
+        logger.error(f"Browser session failed: {e}")
+        for source in needs_render.values():
+            record_failure(source["module"].__file__, e)
+        return False
+
+    for feed_name, source in needs_render.items():
+        rendered = pages.get(feed_name)
+        if rendered is None:
+            record_failure(source["module"].__file__, "page was not rendered")
+            success = False
+            continue
+        try:
+            selector_hits = {}
+            articles = source["parse"](rendered, selector_hits)
+            success = save_feed(feed_name, source, articles, selector_hits) and success
+        except Exception as e:
+            logger.error(f"Failed to generate {feed_name} feed: {e}")
+            record_failure(source["module"].__file__, e)
+            success = False
+
+    return success
+
+
+if __name__ == "__main__":
+    main()
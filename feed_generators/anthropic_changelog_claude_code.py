@@ -1,15 +1,28 @@
 import logging
+import os
 import re
 from pathlib import Path
 
 import requests
-from feedgen.feed import FeedGenerator
+
+from utils.changelog_dates import resolve_version_dates
+from utils.fetch import request_with_retries
+from utils.output import write_feed
+from utils.state import load_state, save_state
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+CHANGELOG_URL = "https://raw.githubusercontent.com/anthropics/claude-code/main/CHANGELOG.md"
+# Parsed versions (all of them, newest first) and the ETag of the last fetch
+STATE_NAME = "claude_code_changelog"
+MAX_FEED_ITEMS = 200
+GITHUB_REPO = "anthropics/claude-code"
+# Permanent version -> date cache, each version is looked up in the git history once
+VERSION_DATES_STATE = "claude_code_version_dates"
+
 
 def get_project_root():
     return Path(__file__).parent.parent
@@ -21,90 +34,93 @@ def ensure_feeds_directory():
     return feeds_dir
 
 
-def fetch_changelog_content(
-    url="https://raw.githubusercontent.com/anthropics/claude-code/main/CHANGELOG.md",
-):
+def fetch_changelog_updates(state, url=CHANGELOG_URL):
+    # Returns (new or updated items, ETag); items is None if the file is unchanged.
+    # New versions are prepended to CHANGELOG.md, so the streamed body is only read
+    # until the first known version below the previous head.
     try:
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+
+        with request_with_retries(url, headers=headers, stream=True) as response:
+            if response.status_code == 304:
+                logger.info("Changelog unchanged since last run")
+                return None, state["etag"]
+            response.raise_for_status()
+            response.encoding = response.encoding or "utf-8"
+
+            # The head version can gain entries, so it is parsed again
+            known_versions = {item["version"] for item in state.get("items", [])}
+            stop_versions = known_versions - {state.get("head_version")}
+            items = [
+                build_changelog_item(version, changes)
+                for version, changes in iter_changelog_sections(
+                    response.iter_lines(decode_unicode=True), stop_versions
+                )
+            ]
+            return items, response.headers.get("ETag")
     except requests.RequestException as e:
         logger.error(f"Error fetching changelog content: {str(e)}")
         raise
 
 
-def parse_changelog_markdown(markdown_content, max_versions=50):
-    try:
-        items = []
-        lines = markdown_content.split("\n")
-        current_version = None
-        current_changes = []
-
-        for line in lines:
-            line = line.strip()
-
-            # Check for version headers (## 1.0.71, ## 1.0.70, etc.)
-            if line.startswith("## ") and re.match(r"## \d+\.\d+\.\d+", line):
-                # Save previous version if exists
-                if current_version and current_changes:
-                    version_anchor = current_version.replace(".", "")
-                    # Create HTML list for description
-                    description_html = (
-                        "<ul>"
-                        + "".join(f"<li>{change}</li>" for change in current_changes)
-                        + "</ul>"
-                    )
-                    items.append(
-                        {
-                            "title": f"v{current_version}",
-                            "link": f"https://github.com/anthropics/claude-code/blob/main/CHANGELOG.md#{version_anchor}",
-                            "description": description_html,
-                            "category": "Changelog",
-                        }
-                    )
-                    if len(items) >= max_versions:
-                        break
-
-                # Start new version
-                current_version = line[3:].strip()  # Remove "## "
-                current_changes = []
-                continue
-
-            # Check for bullet points under a version
-            if current_version and line.startswith("- "):
-                change_description = line[2:].strip()  # Remove "- "
-                if change_description:
-                    current_changes.append(change_description)
-
-        # Don't forget the last version (if we haven't hit the limit)
-        if current_version and current_changes and len(items) < max_versions:
-            version_anchor = current_version.replace(".", "")
-            description_html = (
-                "<ul>"
-                + "".join(f"<li>{change}</li>" for change in current_changes)
-                + "</ul>"
-            )
-            items.append(
-                {
-                    "title": f"v{current_version}",
-                    "link": f"https://github.com/anthropics/claude-code/blob/main/CHANGELOG.md#{version_anchor}",
-                    "description": description_html,
-                    "category": "Changelog",
-                }
-            )
-
-        logger.info(f"Successfully parsed {len(items)} changelog items")
-        return items
+def iter_changelog_sections(lines, stop_versions=()):
+    # Yields (version, changes) newest first, stopping at any version in stop_versions
+    current_version = None
+    current_changes = []
 
-    except Exception as e:
-        logger.error(f"Error parsing markdown content: {str(e)}")
-        raise
+    for line in lines:
+        line = line.strip()
+
+        # Check for version headers (## 1.0.71, ## 1.0.70, etc.)
+        if line.startswith("## ") and re.match(r"## \d+\.\d+\.\d+", line):
+            # Yield previous version if exists
+            if current_version and current_changes:
+                yield current_version, current_changes
+
+            # Start new version
+            current_version = line[3:].strip()  # Remove "## "
+            current_changes = []
+            if current_version in stop_versions:
+                return
+            continue
+
+        # Check for bullet points under a version
+        if current_version and line.startswith("- "):
+            change_description = line[2:].strip()  # Remove "- "
+            if change_description:
+                current_changes.append(change_description)
 
+    # Don't forget the last version
+    if current_version and current_changes:
+        yield current_version, current_changes
+
+
+def build_changelog_item(version, changes):
+    version_anchor = version.replace(".", "")
+    # Create HTML list for description
+    description_html = "<ul>" + "".join(f"<li>{change}</li>" for change in changes) + "</ul>"
+    return {
+        "title": f"v{version}",
+        "version": version,
+        "link": f"https://github.com/anthropics/claude-code/blob/main/CHANGELOG.md#{version_anchor}",
+        "description": description_html,
+        "category": "Changelog",
+    }
+
+
+def merge_changelog_items(new_items, previous_items):
+    # Newly parsed versions replace their previous copies and go on top
+    new_versions = {item["version"] for item in new_items}
+    return new_items + [item for item in previous_items if item["version"] not in new_versions]
+
+
+def generate_rss_feed(items, feed_name="anthropic_changelog_claude_code", version_dates=None):
+    from feedgen.feed import FeedGenerator
 
-def generate_rss_feed(items, feed_name="anthropic_changelog_claude_code"):
     try:
         fg = FeedGenerator()
         fg.title("Claude Code Changelog")
@@ -122,13 +138,15 @@ def generate_rss_feed(items, feed_name="anthropic_changelog_claude_code"):
         fg.link(href=f"https://anthropic.com/feed_{feed_name}.xml", rel="self")
 
         # feedgen reverses order, so reverse items to maintain newest-first
-        for item in reversed(items):
+        for item in reversed(items[:MAX_FEED_ITEMS]):
             fe = fg.add_entry()
             fe.title(item["title"])
             fe.description(item["description"])
             fe.link(href=item["link"])
             fe.category(term=item["category"])
             fe.id(item["link"])
+            if version_dates and item["version"] in version_dates:
+                fe.published(version_dates[item["version"]])
 
         logger.info("Successfully generated RSS feed")
         return fg
@@ -142,7 +160,7 @@ def save_rss_feed(feed_generator, feed_name="anthropic_changelog_claude_code"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
     except Exception as e:
@@ -152,17 +170,32 @@ def save_rss_feed(feed_generator, feed_name="anthropic_changelog_claude_code"):
 
 def main(feed_name="anthropic_changelog_claude_code"):
     try:
-        markdown_content = fetch_changelog_content()
-        items = parse_changelog_markdown(markdown_content)
+        state = load_state(STATE_NAME, {}) or {}
+        new_items, etag = fetch_changelog_updates(state)
+        if new_items is None:
+            items = state["items"]
+        else:
+            items = merge_changelog_items(new_items, state.get("items", []))
+            logger.info(f"Parsed {len(new_items)} new or updated versions, {len(items)} in total")
 
         if not items:
             logger.warning("No changelog items found")
             return False
 
-        feed = generate_rss_feed(items, feed_name)
+        # Set CLAUDE_CODE_REPO_PATH to a local clone to resolve dates without the GitHub API
+        version_dates = resolve_version_dates(
+            [item["version"] for item in items[:MAX_FEED_ITEMS]],
+            GITHUB_REPO,
+            "CHANGELOG.md",
+            VERSION_DATES_STATE,
+            clone_path=os.environ.get("CLAUDE_CODE_REPO_PATH"),
+        )
+
+        feed = generate_rss_feed(items, feed_name, version_dates)
         output_file = save_rss_feed(feed, feed_name)
+        save_state(STATE_NAME, {"etag": etag, "head_version": items[0]["version"], "items": items})
 
-        logger.info(f"Successfully generated RSS feed with {len(items)} items")
+        logger.info(f"Successfully generated RSS feed with {min(len(items), MAX_FEED_ITEMS)} items")
         return True
 
     except Exception as e:
@@ -1,11 +1,11 @@
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
-import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.embedded import extract_rsc_payload, get_slug, iter_dicts, iter_flight_rows, parse_iso_date
+from utils.fetch import fetch_html
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -26,12 +26,7 @@ def ensure_feeds_directory():
 def fetch_engineering_content(url="https://www.anthropic.com/engineering"):
     """Fetch engineering page content from Anthropic's website."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching engineering content: {str(e)}")
         raise
@@ -48,77 +43,64 @@ def validate_article(article):
     return True
 
 
+def _resolve_text(value, text_rows):
+    """Resolve ``$<id>`` references to RSC text rows."""
+    if isinstance(value, str) and value.startswith("$") and value[1:] in text_rows:
+        return text_rows[value[1:]]
+    return value
+
+
+def iter_engineering_records(payload):
+    """Yield engineering article records from an RSC payload in a single pass."""
+    text_rows = {}
+    for row_id, value in iter_flight_rows(payload):
+        if isinstance(value, str):
+            text_rows[row_id] = value
+            continue
+        for record in iter_dicts(value):
+            if "publishedOn" in record and get_slug(record) and record.get("title"):
+                yield {
+                    "publishedOn": record["publishedOn"],
+                    "slug": get_slug(record),
+                    "title": _resolve_text(record["title"], text_rows),
+                    "summary": _resolve_text(record.get("summary"), text_rows),
+                }
+
+
 def parse_engineering_html(html_content):
     """Parse the engineering HTML content and extract article information from embedded JSON."""
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
-        articles = []
-
-        # Find the Next.js script tag containing article data
-        script_tag = None
-        for script in soup.find_all("script"):
-            if script.string and "publishedOn" in script.string and "engineeringArticle" in script.string:
-                script_tag = script
-                break
-
-        if not script_tag:
+        # The article list is shipped in the Next.js RSC payload (self.__next_f.push chunks)
+        payload = extract_rsc_payload(html_content)
+        if "publishedOn" not in payload:
             logger.error("Could not find Next.js data script containing article information")
             return []
 
-        script_content = script_tag.string
-
-        # Extract article data from the escaped JSON in the Next.js script
-        # Pattern matches: publishedOn, slug, title, and summary fields
-        import re
-
-        pattern = r'\\"publishedOn\\":\\"([^"]+?)\\",\\"slug\\":\{[^}]*?\\"current\\":\\"([^"]+?)\\"'
-        matches = re.findall(pattern, script_content)
-
-        logger.info(f"Found {len(matches)} articles from JSON data")
-
-        for published_date, slug in matches:
+        articles = []
+        seen_links = set()
+        for record in iter_engineering_records(payload):
+            slug = record["slug"]
             try:
-                # Construct the full URL from the slug
                 link = f"https://www.anthropic.com/engineering/{slug}"
-
-                # Find the article object containing this slug to get title and summary
-                # Search for the section containing this slug
-                slug_pos = script_content.find(f'\\"current\\":\\"{slug}\\"')
-                if slug_pos == -1:
+                if link in seen_links:
                     continue
 
-                # Search forward from slug position to find the title and summary
-                # The structure is: ...publishedOn, slug, ...other fields..., summary, title}
-                search_section = script_content[slug_pos:slug_pos + 2000]
-
-                # Extract title and summary (they appear AFTER the slug in the data)
-                # Use negative lookbehind to handle escaped quotes correctly
-                title_match = re.search(r'\\"title\\":\\"(.*?)(?<!\\)\\"', search_section)
-                title = title_match.group(1) if title_match else slug.replace("-", " ").title()
-                # Unescape the title using re.sub to handle all escaped characters
-                title = re.sub(r'\\(.)', r'\1', title) if title else title
-
-                # Extract summary/description
-                summary_match = re.search(r'\\"summary\\":\\"(.*?)(?<!\\)\\"', search_section)
-                description = summary_match.group(1) if summary_match else title
-                # Unescape the description
-                description = re.sub(r'\\(.)', r'\1', description) if description else description
-
-                # Parse the date
-                date = datetime.strptime(published_date, "%Y-%m-%d")
-                date = date.replace(hour=0, minute=0, second=0, tzinfo=pytz.UTC)
+                title = record["title"] if isinstance(record["title"], str) else slug.replace("-", " ").title()
+                summary = record["summary"]
+                description = summary if isinstance(summary, str) and summary else title
 
                 article = {
                     "title": title,
                     "link": link,
-                    "description": description if description else title,
-                    "date": date,
+                    "description": description,
+                    "date": parse_iso_date(record["publishedOn"]),
                     "category": "Engineering",
                 }
 
                 if validate_article(article):
+                    seen_links.add(link)
                     articles.append(article)
-                    logger.info(f"Found article: {title} ({published_date})")
+                    logger.info(f"Found article: {title} ({record['publishedOn']})")
 
             except Exception as e:
                 logger.warning(f"Error parsing article {slug}: {str(e)}")
@@ -134,6 +116,8 @@ def parse_engineering_html(html_content):
 
 def generate_rss_feed(articles, feed_name="anthropic_engineering"):
     """Generate RSS feed from engineering articles."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Anthropic Engineering Blog")
@@ -179,7 +163,7 @@ def save_rss_feed(feed_generator, feed_name="anthropic_engineering"):
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
 
         # Save the feed
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -1,16 +1,21 @@
+import json
 import logging
+import re
 import time
-import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytz
-import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
-from feedgen.feed import FeedGenerator
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+
+from utils.browser import setup_selenium_driver, wait_for_selector
+from utils.health import record_failure, record_run
+from utils.embedded import extract_articles, extract_page_metadata, parse_iso_date
+from utils.enrich import enrich_articles
+from utils.existing import load_feed_articles, merge_articles
+from utils.fetch import fetch_html
+from utils.output import write_feed
+from utils.sitemap import discover_changed_urls, remember_discovery
+from utils.state import load_state, save_state
 
 # Set up logging
 logging.basicConfig(
@@ -18,6 +23,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+NEWS_URL = "https://www.anthropic.com/news"
+# Resources the page needs while rendering; everything else heavy is blocked (see utils.browser)
+RENDER_ALLOW = ()
+
+# Enumerate articles from sitemap.xml instead of clicking "See more" (None disables it)
+SITEMAP_DISCOVERY = {
+    "sitemap_url": "https://www.anthropic.com/sitemap.xml",
+    "path_prefix": "/news/",
+}
+# Upper bound on article pages fetched per run; the rest are picked up next run
+MAX_ARTICLE_FETCHES = 40
+
+DATE_FORMATS = [
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%b %d %Y",
+    "%B %d %Y",
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+]
+
+# Runs in the page and returns the news cards as one compact JSON string, so the
+# rendered DOM never has to be serialized and parsed again in Python
+COLLECT_CARDS_JS = r"""
+const seen = new Set();
+const cards = [];
+for (const a of document.querySelectorAll('a[href*="/news/"]')) {
+  const href = a.href.split("#")[0];
+  if (seen.has(href) || /\/news\/?$/.test(href)) continue;
+  seen.add(href);
+  const titleEl = a.querySelector("h2, h3, h4, [class*='title'], [class*='headline']");
+  const timeEl = a.querySelector("time");
+  let date = timeEl ? (timeEl.getAttribute("datetime") || timeEl.textContent) : "";
+  if (!date) {
+    const match = a.textContent.match(/[A-Z][a-z]{2,8}\.? \d{1,2},? \d{4}/);
+    date = match ? match[0] : "";
+  }
+  const categoryEl = a.querySelector("[class*='subject'], [class*='category'], span.text-label");
+  cards.push({
+    href: href,
+    title: titleEl ? titleEl.textContent.trim() : "",
+    date: date.trim(),
+    category: categoryEl ? categoryEl.textContent.trim() : "",
+  });
+}
+return JSON.stringify(cards);
+"""
+
+# Clicks the first visible "See more" control; returns false when there is none
+CLICK_SEE_MORE_JS = r"""
+const visible = (el) => el.offsetParent !== null;
+let button = [...document.querySelectorAll("[class*='seeMore'], [class*='see-more'], button[class*='More']")]
+  .find(visible);
+if (!button) {
+  button = [...document.querySelectorAll("button, a, div, span")]
+    .find((el) => /^(See|Load) more$/i.test(el.textContent.trim()) && visible(el));
+}
+if (!button) return false;
+button.click();
+return true;
+"""
+
 
 def stable_fallback_date(identifier):
     """Generate a stable date from a URL or title hash.
@@ -42,91 +109,165 @@ def ensure_feeds_directory():
     return feeds_dir
 
 
-def setup_selenium_driver():
-    """Set up Selenium WebDriver with undetected-chromedriver."""
-    options = uc.ChromeOptions()
-    options.add_argument("--headless")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+def fetch_news_articles_embedded(url=NEWS_URL, existing_articles=None):
+    """Fetch articles from the news page's embedded Next.js data over plain HTTP.
+
+    The embedded data only lists recent articles, so they are merged with the
+    articles already in the feed (default: read from the existing feed).
+    """
+    try:
+        logger.info(f"Fetching embedded article data from URL: {url}")
+        html_content = fetch_html(url)
+    except Exception as e:
+        logger.warning(f"Error fetching news page over HTTP: {e}")
+        return []
+
+    articles = []
+    for article in extract_articles(html_content, link_prefix=NEWS_URL):
+        article["category"] = article["category"] or "News"
+        article["date"] = article["date"] or stable_fallback_date(article["link"])
+        if validate_article(article):
+            articles.append(article)
+
+    logger.info(f"Parsed {len(articles)} articles from embedded data")
+    if not articles:
+        return []
+    if existing_articles is None:
+        existing_articles = load_existing_feed_articles()
+    return merge_articles(articles, existing_articles)
+
+
+def fetch_news_articles_sitemap(discovery_config=SITEMAP_DISCOVERY, existing_articles=None):
+    """Build the article list from sitemap.xml, fetching only new or changed articles.
+
+    At most MAX_ARTICLE_FETCHES articles are fetched per run, newest first, so
+    the articles are merged with those already in the feed (default: read from
+    the existing feed) until every sitemap article has been fetched once.
+    """
+    discovery, changed = discover_changed_urls("anthropic_news", **discovery_config)
+    cached = load_state("anthropic_news_articles", {}) or {}
+
+    changed = [link for link in changed if not link.rstrip("/").endswith("/news")]
+    unprocessed = changed[MAX_ARTICLE_FETCHES:]
+    for link in changed[:MAX_ARTICLE_FETCHES]:
+        try:
+            metadata = extract_page_metadata(fetch_html(link))
+        except Exception as e:
+            logger.warning(f"Error fetching article {link}: {e}")
+            unprocessed.append(link)
+            continue
+
+        if not metadata["title"]:
+            logger.warning(f"Could not extract title for article: {link}")
+            unprocessed.append(link)
+            continue
+
+        title = re.sub(r"\s*[\\|]\s*Anthropic$", "", metadata["title"])
+        cached[link] = {
+            "title": title,
+            "description": metadata["description"] or title,
+            "date": metadata["date"].isoformat() if metadata["date"] else None,
+        }
+
+    articles = []
+    for link in discovery["urls"]:
+        entry = cached.get(link)
+        if not entry:
+            continue
+        article = {
+            "title": entry["title"],
+            "link": link,
+            "date": parse_iso_date(entry["date"]) or stable_fallback_date(link),
+            "category": "News",
+            "description": entry["description"],
+        }
+        if validate_article(article):
+            articles.append(article)
+
+    # Only keep metadata for articles still listed in the sitemap
+    save_state(
+        "anthropic_news_articles",
+        {link: entry for link, entry in cached.items() if link in discovery["urls"]},
     )
-    return uc.Chrome(options=options)
+    remember_discovery("anthropic_news", discovery, unprocessed)
 
+    logger.info(f"Built {len(articles)} articles from sitemap discovery")
+    if not articles:
+        return []
+    if existing_articles is None:
+        existing_articles = load_existing_feed_articles()
+    return merge_articles(articles, existing_articles)
 
-def fetch_news_content(url="https://www.anthropic.com/news"):
-    """Fetch the fully loaded HTML content of the news page using Selenium."""
-    driver = None
-    try:
-        logger.info(f"Fetching content from URL: {url}")
-        driver = setup_selenium_driver()
-        driver.get(url)
 
-        # Wait for initial page load
-        wait_time = 5
+def fetch_news_articles_without_browser():
+    """Collect articles from sitemap discovery, then from the embedded page data."""
+    articles = []
+    if SITEMAP_DISCOVERY:
+        try:
+            articles = fetch_news_articles_sitemap()
+        except Exception as e:
+            logger.warning(f"Sitemap discovery failed: {e}")
+    if not articles:
+        articles = fetch_news_articles_embedded()
+    return articles
+
+
+def render_news_cards(driver, url=NEWS_URL, wait_time=5, known_links=None, max_clicks=20):
+    """Render the news page and collect its cards in the browser.
+
+    "See more" is clicked only until a card that is already in the feed shows up,
+    so a normal run does not click at all.
+
+    Args:
+        driver: Selenium WebDriver to render with
+        url: News listing URL
+        wait_time: Seconds to let the page settle before looking for articles
+        known_links: Links already in the feed (default: read from the existing feed)
+        max_clicks: Safety limit on "See more" clicks
+
+    Returns:
+        list: Card dicts with href, title, date and category text
+    """
+    if known_links is None:
+        known_links = {article["link"] for article in load_existing_feed_articles()}
+
+    logger.info(f"Fetching content from URL: {url}")
+    driver.get(url)
+
+    # Wait for initial page load
+    if wait_time:
         logger.info(f"Waiting {wait_time} seconds for the page to fully load...")
         time.sleep(wait_time)
 
-        # Wait for news articles to be present
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/news/']"))
-            )
-            logger.info("News articles loaded successfully")
-        except Exception:
-            logger.warning("Could not confirm articles loaded, proceeding anyway...")
-
-        # Click "See more" button repeatedly until it's no longer available
-        max_clicks = 20  # Safety limit
-        clicks = 0
-        while clicks < max_clicks:
-            try:
-                # Look for the "See more" button using multiple selectors
-                see_more_button = None
-                selectors = [
-                    "[class*='seeMore']",
-                    "[class*='see-more']",
-                    "button[class*='More']",
-                ]
-                for selector in selectors:
-                    try:
-                        see_more_button = driver.find_element(By.CSS_SELECTOR, selector)
-                        if see_more_button and see_more_button.is_displayed():
-                            break
-                        see_more_button = None
-                    except Exception:
-                        continue
-
-                # Also try finding by text content using XPath
-                if not see_more_button:
-                    try:
-                        see_more_button = driver.find_element(
-                            By.XPATH,
-                            "//*[contains(text(), 'See more') or contains(text(), 'Load more')]",
-                        )
-                    except Exception:
-                        pass
-
-                if see_more_button and see_more_button.is_displayed():
-                    logger.info(f"Clicking 'See more' button (click {clicks + 1})...")
-                    driver.execute_script("arguments[0].click();", see_more_button)
-                    clicks += 1
-                    time.sleep(2)  # Wait for content to load
-                else:
-                    logger.info(
-                        f"No more 'See more' button found after {clicks} clicks"
-                    )
-                    break
-            except Exception as e:
-                # No more "See more" button found
-                logger.info(
-                    f"No more 'See more' button found after {clicks} clicks: {e}"
-                )
-                break
-
-        html_content = driver.page_source
-        logger.info("Successfully fetched HTML content")
-        return html_content
+    # Wait for news articles to be present
+    if wait_for_selector(driver, "a[href*='/news/']"):
+        logger.info("News articles loaded successfully")
+    else:
+        logger.warning("Could not confirm articles loaded, proceeding anyway...")
+
+    clicks = 0
+    while True:
+        cards = json.loads(driver.execute_script(COLLECT_CARDS_JS))
+        if any(card["href"] in known_links for card in cards):
+            logger.info(f"Reached already known articles after {clicks} clicks")
+            break
+        if clicks >= max_clicks or not driver.execute_script(CLICK_SEE_MORE_JS):
+            logger.info(f"No more 'See more' button found after {clicks} clicks")
+            break
+        clicks += 1
+        logger.info(f"Clicked 'See more' button (click {clicks})...")
+        time.sleep(2)  # Wait for content to load
+
+    logger.info(f"Collected {len(cards)} news cards")
+    return cards
+
+
+def fetch_news_cards(url=NEWS_URL):
+    """Collect the news cards of the rendered news page using Selenium."""
+    driver = None
+    try:
+        driver = setup_selenium_driver(allow=RENDER_ALLOW)
+        return render_news_cards(driver, url)
 
     except Exception as e:
         logger.error(f"Error fetching content: {e}")
@@ -136,111 +277,47 @@ def fetch_news_content(url="https://www.anthropic.com/news"):
             driver.quit()
 
 
-def extract_title(card):
-    """Extract title using multiple fallback selectors."""
-    selectors = [
-        # New FeaturedGrid layout
-        "h2[class*='featuredTitle']",
-        "h4[class*='title']",
-        # New PublicationList layout
-        "span[class*='title']",
-        # Legacy selectors
-        "h3.PostCard_post-heading__Ob1pu",
-        "h3.Card_headline__reaoT",
-        "h3[class*='headline']",
-        "h3[class*='heading']",
-        "h2[class*='headline']",
-        "h2[class*='heading']",
-        "h3",
-        "h2",
-    ]
-    for selector in selectors:
-        elem = card.select_one(selector)
-        if elem and elem.text.strip():
-            return elem.text.strip()
-    return None
-
-
-def extract_date(card):
-    """Extract date using multiple fallback selectors and formats."""
-    selectors = [
-        # New layout selectors - time element is most reliable
-        "time[class*='date']",
-        "time",
-        # Legacy selectors
-        "p.detail-m",
-        "div.PostList_post-date__djrOA",
-        "p[class*='date']",
-        "div[class*='date']",
-    ]
-
-    date_formats = [
-        "%b %d, %Y",
-        "%B %d, %Y",
-        "%b %d %Y",
-        "%B %d %Y",
-        "%Y-%m-%d",
-        "%m/%d/%Y",
-    ]
-
-    for selector in selectors:
-        # Use select() to get all matching elements, not just the first one
-        elems = card.select(selector)
-        for elem in elems:
-            date_text = elem.text.strip()
-            # Try to parse it as a date
-            for date_format in date_formats:
-                try:
-                    date = datetime.strptime(date_text, date_format)
-                    return date.replace(tzinfo=pytz.UTC)
-                except ValueError:
-                    continue
-
-    return None
-
-
-def extract_category(card, date_elem_text=None):
-    """Extract category using multiple fallback selectors."""
-    selectors = [
-        # New layout selectors
-        "span[class*='subject']",  # PublicationList layout
-        "span.caption.bold",  # FeaturedGrid layout (category before date)
-        # Legacy selectors
-        "span.text-label",
-        "p.detail-m",
-        "span[class*='category']",
-        "div[class*='category']",
-    ]
-
-    for selector in selectors:
-        elem = card.select_one(selector)
-        if elem:
-            text = elem.text.strip()
-            # Skip if this is the date element
-            if date_elem_text and text == date_elem_text:
-                continue
-            # Skip if it looks like a date
-            if any(
-                month in text
-                for month in [
-                    "Jan",
-                    "Feb",
-                    "Mar",
-                    "Apr",
-                    "May",
-                    "Jun",
-                    "Jul",
-                    "Aug",
-                    "Sep",
-                    "Oct",
-                    "Nov",
-                    "Dec",
-                ]
-            ):
-                continue
-            return text
-
-    return "News"
+def parse_card_date(date_text):
+    """Parse the date text of a news card."""
+    date_text = date_text.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            date = datetime.strptime(date_text, date_format)
+            return date.replace(tzinfo=pytz.UTC)
+        except ValueError:
+            continue
+    return parse_iso_date(date_text)
+
+
+def parse_news_cards(cards, selector_hits=None, existing_articles=None):
+    """Turn collected news cards into articles merged with the existing feed.
+
+    Args:
+        cards: Card dicts returned by render_news_cards
+        selector_hits: Optional dict filled with the number of matches per key selector
+        existing_articles: Articles already in the feed (default: read from the existing feed)
+    """
+    if existing_articles is None:
+        existing_articles = load_existing_feed_articles()
+    if selector_hits is not None:
+        selector_hits['a[href*="/news/"]'] = len(cards)
+
+    articles = []
+    for card in cards:
+        title = " ".join(card["title"].split())
+        article = {
+            "title": title,
+            "link": card["href"],
+            "date": parse_card_date(card["date"]) or stable_fallback_date(card["href"]),
+            "category": card["category"] or "News",
+            "description": title,  # Using title as description fallback
+        }
+        if validate_article(article):
+            articles.append(article)
+
+    merged = merge_articles(articles, existing_articles)
+    logger.info(f"Parsed {len(articles)} articles from cards, kept {len(merged) - len(articles)} from the existing feed")
+    return merged
 
 
 def validate_article(article):
@@ -260,88 +337,10 @@ def validate_article(article):
     return True
 
 
-def parse_news_html(html_content):
-    """Parse the news HTML content and extract article information."""
-    try:
-        soup = BeautifulSoup(html_content, "html.parser")
-        articles = []
-        seen_links = set()
-        unknown_structures = 0
-
-        # Find all links that point to news articles
-        # Use flexible selectors to catch current and future card types
-        # Handle both relative (/news/...) and absolute (https://www.anthropic.com/news/...) URLs
-        all_news_links = soup.select(
-            'a[href*="/news/"], a[href*="anthropic.com/news/"]'
-        )
-
-        logger.info(f"Found {len(all_news_links)} potential news article links")
-
-        for card in all_news_links:
-            href = card.get("href", "")
-            if not href:
-                continue
-
-            # Build full URL
-            link = "https://www.anthropic.com" + href if href.startswith("/") else href
-
-            # Skip duplicates
-            if link in seen_links:
-                continue
-
-            # Skip the main news page link and anchor links
-            if link.endswith("/news") or link.endswith("/news/") or "/news#" in link:
-                continue
-
-            seen_links.add(link)
-
-            # Extract title using fallback chain
-            title = extract_title(card)
-            if not title:
-                logger.debug(f"Could not extract title for link: {link}")
-                logger.debug(f"Card HTML preview: {str(card)[:200]}")
-                unknown_structures += 1
-                continue
-
-            # Extract date using fallback chain
-            date = extract_date(card)
-            if not date:
-                logger.warning(f"Could not extract date for article: {title}")
-                date = stable_fallback_date(link)
-
-            # Extract category
-            category = extract_category(card)
-
-            # Create article object
-            article = {
-                "title": title,
-                "link": link,
-                "date": date,
-                "category": category,
-                "description": title,  # Using title as description fallback
-            }
-
-            # Validate article before adding
-            if validate_article(article):
-                articles.append(article)
-            else:
-                unknown_structures += 1
-
-        if unknown_structures > 0:
-            logger.warning(
-                f"Encountered {unknown_structures} links with unknown or invalid structures"
-            )
-
-        logger.info(f"Successfully parsed {len(articles)} valid articles")
-        return articles
-
-    except Exception as e:
-        logger.error(f"Error parsing HTML content: {str(e)}")
-        raise
-
-
 def generate_rss_feed(articles, feed_name="anthropic_news"):
     """Generate RSS feed from news articles."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Anthropic News")
@@ -370,6 +369,8 @@ def generate_rss_feed(articles, feed_name="anthropic_news"):
             fe.published(article["date"])
             fe.category(term=article["category"])
             fe.id(article["link"])
+            if article.get("content"):
+                fe.content(article["content"], type="CDATA")
 
         logger.info("Successfully generated RSS feed")
         return fg
@@ -389,7 +390,7 @@ def save_rss_feed(feed_generator, feed_name="anthropic_news"):
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
 
         # Save the feed
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -398,37 +399,32 @@ def save_rss_feed(feed_generator, feed_name="anthropic_news"):
         raise
 
 
-def get_existing_links_from_feed(feed_path):
-    """Parse the existing RSS feed and return a set of all article links."""
-    existing_links = set()
-    try:
-        if not feed_path.exists():
-            return existing_links
-        tree = ET.parse(feed_path)
-        root = tree.getroot()
-        # RSS 2.0: items under channel/item
-        for item in root.findall("./channel/item"):
-            link_elem = item.find("link")
-            if link_elem is not None and link_elem.text:
-                existing_links.add(link_elem.text.strip())
-    except Exception as e:
-        logger.warning(f"Failed to parse existing feed for deduplication: {str(e)}")
-    return existing_links
+def load_existing_feed_articles(feed_name="anthropic_news"):
+    """Read the articles of the previously generated feed."""
+    return load_feed_articles(ensure_feeds_directory() / f"feed_{feed_name}.xml", default_category="News")
 
 
 def main(feed_name="anthropic_news"):
     """Main function to generate RSS feed from Anthropic's news page."""
     try:
-        # Fetch news content using Selenium
-        html_content = fetch_news_content()
-
-        # Parse articles from HTML
-        articles = parse_news_html(html_content)
+        # Try sitemap discovery and the embedded page data first,
+        # only render with Selenium if both fail
+        articles = fetch_news_articles_without_browser()
+        selector_hits = None
+        if not articles:
+            logger.info("No embedded article data found, falling back to Selenium")
+            cards = fetch_news_cards()
+            selector_hits = {}
+            articles = parse_news_cards(cards, selector_hits)
+        record_run(__file__, len(articles), selector_hits)
 
         if not articles:
             logger.warning("No articles found. Please check the HTML structure.")
             return False
 
+        # Add article summaries and full text, fetching only articles not seen before
+        enrich_articles(articles, feed_name)
+
         # Generate RSS feed with all articles
         feed = generate_rss_feed(articles, feed_name)
 
@@ -440,6 +436,7 @@ def main(feed_name="anthropic_news"):
 
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {str(e)}")
+        record_failure(__file__, e)
         return False
 
 
@@ -1,11 +1,15 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from datetime import datetime, timedelta
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.fetch import fetch_html
+from utils.output import write_feed
+from utils.parsing import parse_subtree
 
 # Set up logging
 logging.basicConfig(
@@ -13,6 +17,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Article pages fetched at once; utils.fetch keeps them within the host's rate limit
+ARTICLE_FETCH_WORKERS = 8
+# Only the table of contents (index page) and article body (article pages) are parsed
+TOC_STRAINER = SoupStrainer("div", class_="toc")
+ARTICLE_STRAINER = SoupStrainer("d-article")
+
 
 def stable_fallback_date(identifier):
     """Generate a stable date from a URL or title hash."""
@@ -36,12 +46,7 @@ def ensure_feeds_directory():
 def fetch_red_content(url="https://red.anthropic.com/"):
     """Fetch content from Anthropic's red team blog."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching red team blog content: {str(e)}")
         raise
@@ -70,13 +75,7 @@ def parse_date(date_text):
 def fetch_article_date(article_url):
     """Fetch the publication date from an individual article page."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(article_url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = parse_subtree(fetch_html(article_url), ARTICLE_STRAINER, "d-article")
 
         # Look for date in d-article section
         article_section = soup.select_one("d-article")
@@ -101,7 +100,7 @@ def fetch_article_date(article_url):
 def parse_red_html(html_content):
     """Parse the red team blog HTML content and extract article information."""
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = parse_subtree(html_content, TOC_STRAINER, "div.toc")
         articles = []
         seen_links = set()
 
@@ -166,26 +165,27 @@ def parse_red_html(html_content):
             description_elem = article_link.select_one("div.description")
             description = description_elem.text.strip() if description_elem else title
 
-            # Fetch actual publication date from the article page
-            article_date = fetch_article_date(link)
-
-            # Fallback to current date from main page if fetching fails
-            if not article_date:
-                article_date = (
-                    current_date if current_date else stable_fallback_date(link)
-                )
-                logger.warning(f"Using fallback date for article: {title}")
-
-            # Create article object
+            # Create article object; the date section is the fallback date
             article = {
                 "title": title,
                 "link": link,
-                "date": article_date,
+                "date": current_date,
                 "description": description,
             }
 
             articles.append(article)
-            logger.debug(f"Found article: {title} (date: {article_date})")
+
+        # Fetch actual publication dates from the article pages concurrently
+        with ThreadPoolExecutor(max_workers=ARTICLE_FETCH_WORKERS) as executor:
+            article_dates = list(executor.map(fetch_article_date, [a["link"] for a in articles]))
+
+        for article, article_date in zip(articles, article_dates):
+            # Fallback to current date from main page if fetching fails
+            if not article_date:
+                article_date = article["date"] or stable_fallback_date(article["link"])
+                logger.warning(f"Using fallback date for article: {article['title']}")
+            article["date"] = article_date
+            logger.debug(f"Found article: {article['title']} (date: {article_date})")
 
         logger.info(f"Successfully parsed {len(articles)} articles")
         return articles
@@ -197,6 +197,8 @@ def parse_red_html(html_content):
 
 def generate_rss_feed(articles, feed_name="anthropic_red"):
     """Generate RSS feed from red team blog articles."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Anthropic Frontier Red Team Blog")
@@ -245,7 +247,7 @@ def save_rss_feed(feed_generator, feed_name="anthropic_red"):
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
 
         # Save the feed
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -1,16 +1,24 @@
-import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
 from datetime import datetime
 import pytz
-from feedgen.feed import FeedGenerator
 import time
 import logging
 from pathlib import Path
 
+from utils.browser import setup_selenium_driver, wait_for_selector
+from utils.health import record_failure, record_run
+from utils.embedded import extract_articles
+from utils.existing import load_feed_articles, merge_articles
+from utils.fetch import fetch_html
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+RESEARCH_URL = "https://www.anthropic.com/research"
+# Resources the page needs while rendering; everything else heavy is blocked (see utils.browser)
+RENDER_ALLOW = ()
+
 
 def get_project_root():
     """Get the project root directory."""
@@ -24,46 +32,60 @@ def ensure_feeds_directory():
     return feeds_dir
 
 
-def setup_selenium_driver():
-    """Set up Selenium WebDriver with undetected-chromedriver."""
-    options = uc.ChromeOptions()
-    options.add_argument("--headless")  # Ensure headless mode is enabled
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    )
-    return uc.Chrome(options=options)
-
+def fetch_research_articles_embedded(url=RESEARCH_URL, existing_articles=None):
+    """Fetch articles from the research page's embedded Next.js data over plain HTTP.
 
-def fetch_research_content_selenium(url="https://www.anthropic.com/research"):
-    """Fetch the fully loaded HTML content of the research page using Selenium."""
-    driver = None
+    The embedded data only lists recent articles, so they are merged with the
+    articles already in the feed (default: read from the existing feed).
+    """
     try:
-        logger.info(f"Fetching content from URL: {url}")
-        driver = setup_selenium_driver()
-        driver.get(url)
-
-        # Wait for the page to fully load
-        wait_time = 10
+        logger.info(f"Fetching embedded article data from URL: {url}")
+        html_content = fetch_html(url)
+    except Exception as e:
+        logger.warning(f"Error fetching research page over HTTP: {e}")
+        return []
+
+    articles = []
+    for article in extract_articles(html_content, link_prefix=RESEARCH_URL):
+        article["category"] = article["category"] or "Research"
+        if validate_article(article):
+            articles.append(article)
+
+    logger.info(f"Parsed {len(articles)} articles from embedded data")
+    if not articles:
+        return []
+    if existing_articles is None:
+        existing_articles = load_existing_feed_articles()
+    return merge_articles(articles, existing_articles)
+
+
+def render_research_page(driver, url=RESEARCH_URL, wait_time=10):
+    """Load the research page in an open browser session and return its HTML."""
+    logger.info(f"Fetching content from URL: {url}")
+    driver.get(url)
+
+    # Wait for the page to fully load
+    if wait_time:
         logger.info(f"Waiting {wait_time} seconds for the page to fully load...")
         time.sleep(wait_time)
 
-        # Wait for research articles to load by checking for specific elements
-        try:
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
+    # Wait for research articles to be present
+    if wait_for_selector(driver, "a[href*='/research/']"):
+        logger.info("Research articles loaded successfully")
+    else:
+        logger.warning("Could not confirm articles loaded, proceeding anyway...")
 
-            # Wait for research articles to be present
-            WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/research/']")))
-            logger.info("Research articles loaded successfully")
-        except:
-            logger.warning("Could not confirm articles loaded, proceeding anyway...")
+    html_content = driver.page_source
+    logger.info("Successfully fetched HTML content")
+    return html_content
 
-        html_content = driver.page_source
-        logger.info("Successfully fetched HTML content")
-        return html_content
+
+def fetch_research_content_selenium(url=RESEARCH_URL):
+    """Fetch the fully loaded HTML content of the research page using Selenium."""
+    driver = None
+    try:
+        driver = setup_selenium_driver(allow=RENDER_ALLOW)
+        return render_research_page(driver, url)
 
     except Exception as e:
         logger.error(f"Error fetching content: {e}")
@@ -160,8 +182,10 @@ def validate_article(article):
     return True
 
 
-def parse_research_html(html_content):
+def parse_research_html(html_content, selector_hits=None):
     """Parse the research HTML content and extract article information."""
+    from bs4 import BeautifulSoup
+
     try:
         soup = BeautifulSoup(html_content, "html.parser")
         articles = []
@@ -170,6 +194,8 @@ def parse_research_html(html_content):
         # Look for research article links using flexible selector
         research_links = soup.select("a[href*='/research/']")
         logger.info(f"Found {len(research_links)} potential research article links")
+        if selector_hits is not None:
+            selector_hits["a[href*='/research/']"] = len(research_links)
 
         for link in research_links:
             try:
@@ -240,6 +266,8 @@ def parse_research_html(html_content):
 
 def generate_rss_feed(articles, feed_name="anthropic_research"):
     """Generate RSS feed from research articles."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Anthropic Research")
@@ -294,7 +322,7 @@ def save_rss_feed(feed_generator, feed_name="anthropic_research"):
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
 
         # Save the feed
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -303,14 +331,23 @@ def save_rss_feed(feed_generator, feed_name="anthropic_research"):
         raise
 
 
+def load_existing_feed_articles(feed_name="anthropic_research"):
+    """Read the articles of the previously generated feed."""
+    return load_feed_articles(ensure_feeds_directory() / f"feed_{feed_name}.xml", default_category="Research")
+
+
 def main(feed_name="anthropic_research"):
     """Main function to generate RSS feed from Anthropic's research page."""
     try:
-        # Fetch research content using Selenium
-        html_content = fetch_research_content_selenium()
-
-        # Parse articles from HTML
-        articles = parse_research_html(html_content)
+        # Try the embedded page data first, only render with Selenium if that fails
+        articles = fetch_research_articles_embedded()
+        selector_hits = None
+        if not articles:
+            logger.info("No embedded article data found, falling back to Selenium")
+            html_content = fetch_research_content_selenium()
+            selector_hits = {}
+            articles = parse_research_html(html_content, selector_hits)
+        record_run(__file__, len(articles), selector_hits)
 
         if not articles:
             logger.warning("No articles found. Please check the HTML structure.")
@@ -327,6 +364,7 @@ def main(feed_name="anthropic_research"):
 
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {str(e)}")
+        record_failure(__file__, e)
         return False
 
 
@@ -4,13 +4,14 @@ RSS Feed Generator for Surge AI Blog
 Scrapes https://www.surgehq.ai/blog and generates an RSS feed
 """
 
-import requests
 from bs4 import BeautifulSoup
-from feedgen.feed import FeedGenerator
 from datetime import datetime, timedelta
 from dateutil import parser
 import pytz
 
+from utils.fetch import request_with_retries
+from utils.output import write_feed
+
 
 def stable_fallback_date(identifier):
     """Generate a stable date from a URL or title hash."""
@@ -21,6 +22,7 @@ def stable_fallback_date(identifier):
 
 def generate_blogsurgeai_feed():
     """Generate RSS feed for Surge AI blog"""
+    from feedgen.feed import FeedGenerator
 
     # Initialize feed generator
     fg = FeedGenerator()
@@ -44,8 +46,7 @@ def generate_blogsurgeai_feed():
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        response = request_with_retries(url, headers=headers, timeout=30)
     except Exception as e:
         print(f"Error fetching blog page: {e}")
         return
@@ -123,7 +124,7 @@ def generate_blogsurgeai_feed():
 
     # Generate RSS feed
     output_path = "feeds/feed_blogsurgeai.xml"
-    fg.rss_file(output_path, pretty=True)
+    write_feed(fg, output_path)
     print(f"\nRSS feed generated successfully: {output_path}")
 
 
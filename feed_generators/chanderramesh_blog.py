@@ -3,16 +3,23 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.fetch import fetch_html
+from utils.fingerprint import generate_unless_unchanged
+from utils.items import FeedItem, add_feed_entry
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Next.js asset paths embed the build ID and change on every deploy
+FINGERPRINT_RULES = [(r"/_next/static/[^\"'\s,]+", "")]
+
 
 def stable_fallback_date(identifier):
     """Generate a stable date from a URL or title hash."""
@@ -36,12 +43,7 @@ def ensure_feeds_directory():
 def fetch_html_content(url):
     """Fetch HTML content from the given URL."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching content from {url}: {str(e)}")
         raise
@@ -96,19 +98,19 @@ def parse_writing_page(html_content, base_url="https://chanderramesh.com"):
                 parse_date(date_str) if date_str else None
             ) or stable_fallback_date(full_url)
 
-            blog_post = {
-                "title": title,
-                "link": full_url,
-                "description": description,
-                "pub_date": pub_date,
-            }
+            blog_post = FeedItem(
+                title=title,
+                link=full_url,
+                description=description,
+                date=pub_date,
+            )
 
             blog_posts.append(blog_post)
             logger.info(f"Parsed: {title} ({date_str})")
 
         # Sort by date ascending (oldest first) since feedgen reverses the order
         # This ensures newest posts appear first in the final RSS feed
-        blog_posts.sort(key=lambda x: x["pub_date"], reverse=False)
+        blog_posts.sort(key=lambda x: x.date, reverse=False)
 
         logger.info(f"Successfully parsed {len(blog_posts)} blog posts")
         return blog_posts
@@ -120,6 +122,8 @@ def parse_writing_page(html_content, base_url="https://chanderramesh.com"):
 
 def generate_rss_feed(blog_posts, feed_name="chanderramesh"):
     """Generate RSS feed from blog posts."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Chander Ramesh - Writing")
@@ -137,12 +141,7 @@ def generate_rss_feed(blog_posts, feed_name="chanderramesh"):
 
         # Add entries
         for post in blog_posts:
-            fe = fg.add_entry()
-            fe.title(post["title"])
-            fe.description(post["description"])
-            fe.link(href=post["link"])
-            fe.published(post["pub_date"])
-            fe.id(post["link"])
+            add_feed_entry(fg, post)
 
         logger.info("Successfully generated RSS feed")
         return fg
@@ -157,7 +156,7 @@ def save_rss_feed(feed_generator, feed_name="chanderramesh"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -166,22 +165,35 @@ def save_rss_feed(feed_generator, feed_name="chanderramesh"):
         raise
 
 
+def generate_feed(html_content, feed_name="chanderramesh"):
+    """Parse the writing page and write the feed."""
+    # Parse blog posts
+    blog_posts = parse_writing_page(html_content)
+
+    # Generate RSS feed
+    feed = generate_rss_feed(blog_posts, feed_name)
+
+    # Save feed to file
+    _output_file = save_rss_feed(feed, feed_name)
+    return True
+
+
 def main(blog_url="https://chanderramesh.com/writing", feed_name="chanderramesh"):
     """Main function to generate RSS feed from blog URL."""
     try:
         # Fetch blog content
         html_content = fetch_html_content(blog_url)
 
-        # Parse blog posts
-        blog_posts = parse_writing_page(html_content)
-
-        # Generate RSS feed
-        feed = generate_rss_feed(blog_posts, feed_name)
-
-        # Save feed to file
-        _output_file = save_rss_feed(feed, feed_name)
-
-        return True
+        # Skip parsing when the listing has not changed since the last run
+        feed_path = ensure_feeds_directory() / f"feed_{feed_name}.xml"
+        return generate_unless_unchanged(
+            feed_name,
+            html_content,
+            __file__,
+            feed_path,
+            lambda: generate_feed(html_content, feed_name),
+            FINGERPRINT_RULES,
+        )
 
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {str(e)}")
@@ -1,21 +1,28 @@
 import argparse
 import json
+import os
 import re
 from datetime import datetime
 from pathlib import Path
 
 import pytz
-import requests
 from bs4 import BeautifulSoup
-from feedgen.feed import FeedGenerator
 import logging
 
+from utils.fetch import fetch_html
+from utils.archive import DEFAULT_PAGE_SIZE, get_archive_page_count, write_archived_feed
+from utils.items import FeedItem, add_feed_entry, parse_item_date
+from utils.output import FEEDS_BASE_URL
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 BLOG_URL = "https://cursor.com/blog"
 FEED_NAME = "cursor"
 
+# Number of newest posts published in the feed; older ones go to archive pages
+FEED_WINDOW = 50
+
 
 def get_project_root():
     """Get the project root directory."""
@@ -23,7 +30,12 @@ def get_project_root():
 
 
 def get_cache_file():
-    """Get the cache file path."""
+    """Get the cache file path (append-only JSON Lines, oldest post first)."""
+    return get_project_root() / "cache" / "cursor_posts.jsonl"
+
+
+def get_legacy_cache_file():
+    """Get the path of the old single-document JSON cache."""
     return get_project_root() / "cache" / "cursor_posts.json"
 
 
@@ -36,12 +48,7 @@ def get_feeds_dir():
 
 def fetch_page(url):
     """Fetch a single page HTML."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-    return response.text
+    return fetch_html(url, timeout=30)
 
 
 def parse_posts(html):
@@ -68,13 +75,13 @@ def parse_posts(html):
         category_el = card.find("span", class_="capitalize")
         category = category_el.get_text(strip=True).rstrip(" ·") if category_el else ""
 
-        posts.append({
-            "url": href,
-            "title": title,
-            "description": description,
-            "date": date,
-            "category": category,
-        })
+        posts.append(FeedItem(
+            title=title,
+            link=href,
+            description=description,
+            date=parse_item_date(date),
+            category=category or None,
+        ))
 
     # Find next page link - look for links containing "Next" or "Older"
     next_link = None
@@ -96,48 +103,95 @@ def parse_posts(html):
     return posts, next_url
 
 
-def load_cache():
-    """Load existing cache or return empty structure."""
+def _sort_key(post):
+    return post.date or datetime.min.replace(tzinfo=pytz.UTC)
+
+
+def migrate_legacy_cache():
+    """Convert the old cursor_posts.json cache into the JSON Lines format."""
+    legacy_file = get_legacy_cache_file()
+    if not legacy_file.exists() or get_cache_file().exists():
+        return
+    with open(legacy_file, "r") as f:
+        posts = [FeedItem.from_dict(post) for post in json.load(f).get("posts", [])]
+    write_all_posts(posts)
+    legacy_file.unlink()
+    logger.info(f"Migrated {len(posts)} posts from {legacy_file.name} to {get_cache_file().name}")
+
+
+def read_newest_posts(limit):
+    """Read the newest ``limit`` posts from the end of the cache, newest first.
+
+    Only the tail of the file is read, so the cost does not grow with the archive.
+    """
     cache_file = get_cache_file()
-    if cache_file.exists():
-        with open(cache_file, "r") as f:
-            data = json.load(f)
-            logger.info(f"Loaded cache with {len(data.get('posts', []))} posts")
-            return data
-    logger.info("No cache file found, will do full fetch")
-    return {"last_updated": None, "posts": []}
+    if not cache_file.exists():
+        return []
+
+    block_size = 64 * 1024
+    with open(cache_file, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b""
+        # Read one extra line so a partially read first line is never used
+        while position > 0 and buffer.count(b"\n") <= limit:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            buffer = f.read(read_size) + buffer
+
+    lines = [line for line in buffer.splitlines() if line.strip()][-limit:]
+    posts = [FeedItem.from_dict(json.loads(line)) for line in lines]
+    posts.sort(key=_sort_key, reverse=True)
+    return posts
+
+
+def read_all_posts():
+    """Read every cached post, newest first."""
+    cache_file = get_cache_file()
+    if not cache_file.exists():
+        return []
+    with open(cache_file, "r", encoding="utf-8") as f:
+        posts = [FeedItem.from_dict(json.loads(line)) for line in f if line.strip()]
+    posts.sort(key=_sort_key, reverse=True)
+    return posts
+
+
+def append_posts(posts):
+    """Append new posts to the cache, oldest first."""
+    if not posts:
+        return
+    cache_file = get_cache_file()
+    cache_file.parent.mkdir(exist_ok=True)
+    with open(cache_file, "a") as f:
+        for post in sorted(posts, key=_sort_key):
+            f.write(json.dumps(post.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+    logger.info(f"Appended {len(posts)} posts to {cache_file}")
 
 
-def save_cache(posts):
-    """Save posts to cache file."""
+def write_all_posts(posts):
+    """Rewrite the whole cache from a complete post list (used for full resets)."""
     cache_file = get_cache_file()
     cache_file.parent.mkdir(exist_ok=True)
-    data = {
-        "last_updated": datetime.now(pytz.UTC).isoformat(),
-        "posts": posts,
-    }
-    with open(cache_file, "w") as f:
-        json.dump(data, f, indent=2)
+    tmp_file = cache_file.with_suffix(".jsonl.tmp")
+    with open(tmp_file, "w") as f:
+        for post in sorted(posts, key=_sort_key):
+            f.write(json.dumps(post.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+    os.replace(tmp_file, cache_file)
     logger.info(f"Saved cache with {len(posts)} posts to {cache_file}")
 
 
-def merge_posts(new_posts, cached_posts):
-    """Merge new posts into cache, dedupe by URL, sort by date desc."""
-    existing_urls = {p["url"] for p in cached_posts}
-    merged = list(cached_posts)
-
-    added_count = 0
+def merge_posts(new_posts, recent_posts):
+    """Return the posts from page 1 that are not already among the recent cached posts."""
+    existing_urls = {p.link for p in recent_posts}
+    added = []
     for post in new_posts:
-        if post["url"] not in existing_urls:
-            merged.append(post)
-            existing_urls.add(post["url"])
-            added_count += 1
+        if post.link not in existing_urls:
+            added.append(post)
+            existing_urls.add(post.link)
 
-    logger.info(f"Added {added_count} new posts to cache")
-
-    # Sort by date descending
-    merged.sort(key=lambda p: p.get("date", ""), reverse=True)
-    return merged
+    logger.info(f"Found {len(added)} new posts to add to cache")
+    return added
 
 
 def fetch_all_pages():
@@ -156,22 +210,19 @@ def fetch_all_pages():
         url = next_url
         page_num += 1
 
-    # Dedupe by URL (in case of overlaps)
-    seen = set()
-    unique_posts = []
-    for post in all_posts:
-        if post["url"] not in seen:
-            unique_posts.append(post)
-            seen.add(post["url"])
+    # Dedupe by URL (in case of overlaps); items compare by their link
+    unique_posts = list(dict.fromkeys(all_posts))
 
     # Sort by date descending
-    unique_posts.sort(key=lambda p: p.get("date", ""), reverse=True)
+    unique_posts.sort(key=_sort_key, reverse=True)
     logger.info(f"Total unique posts across all pages: {len(unique_posts)}")
     return unique_posts
 
 
 def generate_rss_feed(posts):
     """Generate RSS feed from posts."""
+    from feedgen.feed import FeedGenerator
+
     fg = FeedGenerator()
     fg.title("Cursor Blog")
     fg.description("The AI Code Editor")
@@ -181,24 +232,10 @@ def generate_rss_feed(posts):
     fg.logo("https://cursor.com/favicon.ico")
     fg.subtitle("Latest updates from Cursor")
     fg.link(href=BLOG_URL, rel="alternate")
-    fg.link(href=f"https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_{FEED_NAME}.xml", rel="self")
+    fg.link(href=f"{FEEDS_BASE_URL}/feed_{FEED_NAME}.xml", rel="self")
 
     for post in posts:
-        fe = fg.add_entry()
-        fe.title(post["title"])
-        fe.description(post["description"])
-        fe.link(href=post["url"])
-        fe.id(post["url"])
-
-        if post.get("date"):
-            try:
-                dt = datetime.fromisoformat(post["date"].replace("Z", "+00:00"))
-                fe.published(dt)
-            except ValueError:
-                pass
-
-        if post.get("category"):
-            fe.category(term=post["category"])
+        add_feed_entry(fg, post)
 
     logger.info(f"Generated RSS feed with {len(posts)} entries")
     return fg
@@ -208,27 +245,38 @@ def save_rss_feed(feed_generator):
     """Save the RSS feed to a file."""
     feeds_dir = get_feeds_dir()
     output_file = feeds_dir / f"feed_{FEED_NAME}.xml"
-    feed_generator.rss_file(str(output_file), pretty=True)
+    write_archived_feed(feed_generator, output_file, window=FEED_WINDOW)
     logger.info(f"Saved RSS feed to {output_file}")
     return output_file
 
 
 def main(full_reset=False):
     """Main function to generate RSS feed."""
-    cache = load_cache()
+    migrate_legacy_cache()
+    recent_posts = read_newest_posts(FEED_WINDOW)
 
-    if full_reset or not cache["posts"]:
+    full_fetch = full_reset or not recent_posts
+    if full_fetch:
         mode = "full reset" if full_reset else "no cache exists"
         logger.info(f"Running full fetch ({mode})")
-        posts = fetch_all_pages()
+        write_all_posts(fetch_all_pages())
+        added = []
     else:
         logger.info("Running incremental update (page 1 only)")
         html = fetch_page(BLOG_URL)
-        new_posts, _ = parse_posts(html)
-        logger.info(f"Found {len(new_posts)} posts on page 1")
-        posts = merge_posts(new_posts, cache["posts"])
-
-    save_cache(posts)
+        page_posts, _ = parse_posts(html)
+        logger.info(f"Found {len(page_posts)} posts on page 1")
+        added = merge_posts(page_posts, recent_posts)
+        append_posts(added)
+
+    # Archive pages are append-only, so only posts not archived yet go into the
+    # feed: at most a window plus a page of them were left in the feed by the
+    # last run, and the posts just added come on top
+    output_file = get_feeds_dir() / f"feed_{FEED_NAME}.xml"
+    if full_fetch or not get_archive_page_count(output_file):
+        posts = read_all_posts()
+    else:
+        posts = read_newest_posts(FEED_WINDOW + DEFAULT_PAGE_SIZE + len(added))
     feed = generate_rss_feed(posts)
     save_rss_feed(feed)
 
@@ -1,18 +1,28 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 import pytz
 import re
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.fetch import fetch_html
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://eleosai.org"
 
+POST_HREF_PATTERN = re.compile(r'^/post/')
+# "October 31, 2025"; a leading "Blog · " is dropped by parse_date anyway
+DATE_PATTERN = re.compile(r'[A-Z][a-z]+\s+\d{1,2},?\s+\d{4}')
+DESCRIPTION_LENGTH = 300
+# String types get_text() includes (not comments, scripts or styles)
+TEXT_TYPES = (NavigableString, CData)
+
 
 def get_project_root():
     """Get the project root directory."""
@@ -29,12 +39,7 @@ def ensure_feeds_directory():
 def fetch_blog_content(url):
     """Fetch blog content from the given URL."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching blog content: {str(e)}")
         raise
@@ -57,17 +62,76 @@ def parse_date(date_text):
             return None
 
 
+def index_document(soup):
+    """Walk the document once, recording the text and position of every element.
+
+    Returns:
+        dict: ``strings`` (the text nodes ``get_text()`` includes, in document
+        order), ``offsets`` (character offset of each string in the document
+        text, plus the total length), ``spans`` (id of each tag -> range of
+        string indices it contains), ``links`` (the post links, in order) and
+        ``blocks`` (every <p> and <div> with its position in document order)
+    """
+    strings = []
+    offsets = [0]
+    spans = {id(soup): [0, None]}
+    links = []
+    blocks = []
+    open_tags = [soup]
+
+    for position, node in enumerate(soup.descendants):
+        while open_tags[-1] is not node.parent:
+            spans[id(open_tags.pop())][1] = len(strings)
+
+        if isinstance(node, Tag):
+            spans[id(node)] = [len(strings), None]
+            open_tags.append(node)
+            if node.name == "a" and POST_HREF_PATTERN.match(node.get("href", "")):
+                links.append((position, node))
+            elif node.name in ("p", "div"):
+                blocks.append((position, node))
+        elif type(node) in TEXT_TYPES:
+            strings.append(node)
+            offsets.append(offsets[-1] + len(node))
+
+    for tag in open_tags:
+        spans[id(tag)][1] = len(strings)
+
+    return {"strings": strings, "offsets": offsets, "spans": spans, "links": links, "blocks": blocks}
+
+
+def leading_text(index, tag, limit):
+    """``tag.get_text(strip=True)``, stopping once it is longer than ``limit``."""
+    first, end = index["spans"][id(tag)]
+    text = ""
+    for string in index["strings"][first:end]:
+        text += string.strip()
+        if len(text) > limit:
+            break
+    return text
+
+
 def parse_blog_html(html_content):
-    """Parse the blog HTML content and extract post information."""
+    """Parse the blog HTML content and extract post information.
+
+    Each post gets the first date found in the text of its closest ancestor
+    (below <body>) that contains one, and the text of the first <p> or <div>
+    after the link as description. Both are looked up in one index of the
+    document instead of calling get_text() on every ancestor of every link.
+    """
     try:
         soup = BeautifulSoup(html_content, "html.parser")
+        index = index_document(soup)
         blog_posts = []
 
-        # Find all links to posts
-        post_links = soup.find_all('a', href=re.compile(r'^/post/'))
+        # Every date in the document text; a tag's text is a contiguous slice of it
+        offsets = index["offsets"]
+        date_matches = list(DATE_PATTERN.finditer("".join(index["strings"])))
+        date_starts = [match.start() for match in date_matches]
+        block_positions = [position for position, _ in index["blocks"]]
 
         seen_links = set()
-        for link in post_links:
+        for position, link in index["links"]:
             href = link.get('href', '')
             if not href or href in seen_links:
                 continue
@@ -81,27 +145,27 @@ def parse_blog_html(html_content):
             # Construct full URL
             full_url = f"{BASE_URL}{href}"
 
-            # Try to find date - look for text containing date pattern before/near the link
+            # Find the first date in the text of the closest ancestor that has one
             date = None
             parent = link.parent
-            while parent and not date:
-                text = parent.get_text()
-                # Look for "Blog · Date" or just date patterns
-                date_match = re.search(r'(?:Blog\s*·\s*)?([A-Z][a-z]+\s+\d{1,2},?\s+\d{4})', text)
-                if date_match:
-                    date = parse_date(date_match.group(1))
+            while parent:
+                first, end = index["spans"][id(parent)]
+                i = bisect_left(date_starts, offsets[first])
+                if i < len(date_matches) and date_matches[i].end() <= offsets[end]:
+                    date = parse_date(date_matches[i].group(0))
                     break
                 parent = parent.parent
                 if parent and parent.name == 'body':
                     break
 
-            # Get description - look for nearby paragraph text
+            # Get description - the first paragraph or div after the link
             description = title
-            next_elem = link.find_next(['p', 'div'])
-            if next_elem and next_elem.get_text(strip=True):
-                desc_text = next_elem.get_text(strip=True)
+            i = bisect_right(block_positions, position)
+            if i < len(block_positions):
+                # Text longer than both limits is neither the title nor too short
+                desc_text = leading_text(index, index["blocks"][i][1], max(DESCRIPTION_LENGTH, len(title)))
                 if len(desc_text) > 10 and desc_text != title:
-                    description = desc_text[:300]
+                    description = desc_text[:DESCRIPTION_LENGTH]
 
             blog_posts.append({
                 "title": title,
@@ -120,6 +184,8 @@ def parse_blog_html(html_content):
 
 def generate_rss_feed(blog_posts, feed_name="eleos"):
     """Generate RSS feed from blog posts."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Eleos AI Research")
@@ -155,7 +221,7 @@ def save_rss_feed(feed_generator, feed_name="eleos"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -1,17 +1,27 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from datetime import datetime, timedelta
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.enrich import enrich_articles, enrichment_pending
+from utils.fetch import fetch_html
+from utils.fingerprint import generate_unless_unchanged
+from utils.items import FeedItem, add_feed_entry
+from utils.output import FEEDS_BASE_URL, write_feed
+from utils.parsing import parse_subtree
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Quarto stamps listing rows with file modification times, which change on every site rebuild
+FINGERPRINT_RULES = [(r'\sdata-listing-file-modified-sort="\d*"', "")]
+LISTING_STRAINER = SoupStrainer(id="listing-blog-listings")
+
 
 def stable_fallback_date(identifier):
     """Generate a stable date from a URL or title hash."""
@@ -35,12 +45,7 @@ def ensure_feeds_directory():
 def fetch_html_content(url):
     """Fetch HTML content from the given URL."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching content from {url}: {str(e)}")
         raise
@@ -54,7 +59,10 @@ def parse_blog_page(html_content, base_url="https://hamel.dev"):
         base_url: Base URL for the website
     """
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
+        # Only the listing table is parsed
+        soup = parse_subtree(
+            html_content, LISTING_STRAINER, "#listing-blog-listings tbody tr"
+        )
         blog_posts = []
 
         # Find all blog post rows in the listing table
@@ -97,12 +105,12 @@ def parse_blog_page(html_content, base_url="https://hamel.dev"):
                     )
                     pub_date = stable_fallback_date(full_url)
 
-                blog_post = {
-                    "title": title,
-                    "link": full_url,
-                    "description": title,  # Use title as description since we don't fetch article content
-                    "pub_date": pub_date,
-                }
+                blog_post = FeedItem(
+                    title=title,
+                    link=full_url,
+                    description=title,  # Use title as description since we don't fetch article content
+                    date=pub_date,
+                )
 
                 blog_posts.append(blog_post)
                 logger.info(f"Parsed post: {title} ({date_text})")
@@ -121,6 +129,8 @@ def parse_blog_page(html_content, base_url="https://hamel.dev"):
 
 def generate_rss_feed(blog_posts, feed_name="hamel"):
     """Generate RSS feed from blog posts."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Hamel Husain's Blog")
@@ -135,18 +145,13 @@ def generate_rss_feed(blog_posts, feed_name="hamel"):
         fg.subtitle("Applied AI engineering, machine learning, and data science")
         fg.link(href="https://hamel.dev/", rel="alternate")
         fg.link(
-            href=f"https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_{feed_name}.xml",
+            href=f"{FEEDS_BASE_URL}/feed_{feed_name}.xml",
             rel="self",
         )
 
         # Add entries
         for post in blog_posts:
-            fe = fg.add_entry()
-            fe.title(post["title"])
-            fe.description(post["description"])
-            fe.link(href=post["link"])
-            fe.published(post["pub_date"])
-            fe.id(post["link"])
+            add_feed_entry(fg, post)
 
         logger.info("Successfully generated RSS feed")
         return fg
@@ -161,7 +166,7 @@ def save_rss_feed(feed_generator, feed_name="hamel"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -170,22 +175,46 @@ def save_rss_feed(feed_generator, feed_name="hamel"):
         raise
 
 
+def generate_feed(html_content, feed_name="hamel"):
+    """Parse the listing page, enrich the posts and write the feed.
+
+    Returns None while some posts are not enriched yet, so the feed is generated
+    (and failed article fetches retried) on the next run even if the listing
+    has not changed.
+    """
+    # Parse blog posts
+    blog_posts = parse_blog_page(html_content)
+
+    # Add article summaries and full text, fetching only posts not seen before
+    blog_posts = enrich_articles(blog_posts, feed_name)
+
+    # Generate RSS feed
+    feed = generate_rss_feed(blog_posts, feed_name)
+
+    # Save feed to file
+    _output_file = save_rss_feed(feed, feed_name)
+
+    if enrichment_pending(blog_posts, feed_name):
+        return None
+    return True
+
+
 def main(blog_url="https://hamel.dev/", feed_name="hamel"):
     """Main function to generate RSS feed from blog URL."""
     try:
         # Fetch blog content
         html_content = fetch_html_content(blog_url)
 
-        # Parse blog posts
-        blog_posts = parse_blog_page(html_content)
-
-        # Generate RSS feed
-        feed = generate_rss_feed(blog_posts, feed_name)
-
-        # Save feed to file
-        _output_file = save_rss_feed(feed, feed_name)
-
-        return True
+        # Skip parsing when the listing has not changed since the last run
+        feed_path = ensure_feeds_directory() / f"feed_{feed_name}.xml"
+        return generate_unless_unchanged(
+            feed_name,
+            html_content,
+            __file__,
+            feed_path,
+            lambda: generate_feed(html_content, feed_name),
+            FINGERPRINT_RULES,
+        )
 
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {str(e)}")
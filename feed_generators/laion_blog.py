@@ -1,12 +1,14 @@
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import pytz
 import re
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.embedded import extract_next_data
+from utils.fetch import fetch_html
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -29,12 +31,7 @@ def ensure_feeds_directory():
 def fetch_blog_content(url):
     """Fetch blog content from the given URL."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching blog content: {str(e)}")
         raise
@@ -67,25 +64,15 @@ def parse_date(date_text):
 
 def parse_blog_html(html_content):
     """Parse the blog HTML content and extract post information from Next.js JSON data."""
-    import json
-
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
         blog_posts = []
 
-        # Find Next.js data script
-        script_tag = soup.find('script', id='__NEXT_DATA__')
-        if not script_tag:
-            logger.error("Could not find __NEXT_DATA__ script tag")
-            return []
-
-        # Parse JSON data
-        try:
-            data = json.loads(script_tag.string)
-            posts_data = data.get('props', {}).get('pageProps', {}).get('posts', [])
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse JSON: {e}")
+        # Read the Next.js data script without building a DOM for the whole page
+        data = extract_next_data(html_content)
+        if not data:
+            logger.error("Could not find a valid __NEXT_DATA__ script tag")
             return []
+        posts_data = data.get('props', {}).get('pageProps', {}).get('posts', [])
 
         for post in posts_data:
             slug = post.get('slug', '')
@@ -135,6 +122,8 @@ def parse_blog_html(html_content):
 
 def generate_rss_feed(blog_posts, feed_name="laion"):
     """Generate RSS feed from blog posts."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("LAION Blog")
@@ -170,7 +159,7 @@ def save_rss_feed(feed_generator, feed_name="laion"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -2,14 +2,20 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.fetch import fetch_html
+from utils.fingerprint import generate_unless_unchanged
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Asset URLs carry a version query string that changes on every deploy
+FINGERPRINT_RULES = [(r"\?v=[\w.-]+", "")]
+
 
 def get_project_root():
     """Get the project root directory."""
@@ -28,12 +34,7 @@ def ensure_feeds_directory():
 def fetch_blog_content(url):
     """Fetch blog content from the given URL."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching blog content: {str(e)}")
         raise
@@ -74,6 +75,8 @@ def parse_blog_html(html_content):
 
 def generate_rss_feed(blog_posts, feed_name="ollama"):
     """Generate RSS feed from blog posts."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Ollama Blog")
@@ -115,7 +118,7 @@ def save_rss_feed(feed_generator, feed_name="ollama"):
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
 
         # Save the feed
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -124,22 +127,35 @@ def save_rss_feed(feed_generator, feed_name="ollama"):
         raise
 
 
+def generate_feed(html_content, feed_name="ollama"):
+    """Parse the blog page and write the feed."""
+    # Parse blog posts from HTML
+    blog_posts = parse_blog_html(html_content)
+
+    # Generate RSS feed
+    feed = generate_rss_feed(blog_posts, feed_name)
+
+    # Save feed to file
+    output_file = save_rss_feed(feed, feed_name)
+    return True
+
+
 def main(blog_url="https://ollama.com/blog", feed_name="ollama"):
     """Main function to generate RSS feed from blog URL."""
     try:
         # Fetch blog content
         html_content = fetch_blog_content(blog_url)
 
-        # Parse blog posts from HTML
-        blog_posts = parse_blog_html(html_content)
-
-        # Generate RSS feed
-        feed = generate_rss_feed(blog_posts, feed_name)
-
-        # Save feed to file
-        output_file = save_rss_feed(feed, feed_name)
-
-        return True
+        # Skip parsing when the listing has not changed since the last run
+        feed_path = ensure_feeds_directory() / f"feed_{feed_name}.xml"
+        return generate_unless_unchanged(
+            feed_name,
+            html_content,
+            __file__,
+            feed_path,
+            lambda: generate_feed(html_content, feed_name),
+            FINGERPRINT_RULES,
+        )
 
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {str(e)}")
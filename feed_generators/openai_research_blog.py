@@ -1,18 +1,26 @@
-import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import pytz
-from feedgen.feed import FeedGenerator
 import time
 import logging
 from pathlib import Path
 
+from utils.browser import setup_selenium_driver
+from utils.embedded import extract_articles
+from utils.enrich import enrich_articles
+from utils.existing import load_feed_articles, merge_articles
+from utils.fetch import fetch_html
+from utils.health import record_failure, record_run
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
+# Resources the page needs while rendering; everything else heavy is blocked (see utils.browser)
+RENDER_ALLOW = ()
+
 
 def stable_fallback_date(identifier):
     """Generate a stable date from a URL or title hash."""
@@ -21,16 +29,54 @@ def stable_fallback_date(identifier):
     return epoch + timedelta(days=hash_val)
 
 
-def setup_selenium_driver():
-    """Set up Selenium WebDriver with undetected-chromedriver."""
-    options = uc.ChromeOptions()
-    options.add_argument("--headless")  # Ensure headless mode is enabled
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    )
-    return uc.Chrome(options=options)
+def get_feed_path(feed_name="openai_research"):
+    """Get the path the feed is written to."""
+    return Path("feeds") / f"feed_{feed_name}.xml"
+
+
+def validate_article(article):
+    """Validate that article has all required fields with reasonable values."""
+    if not article.get("title") or len(article["title"]) < 5:
+        logger.warning(f"Invalid title for article: {article.get('link', 'unknown')}")
+        return False
+
+    if not article.get("link") or not article["link"].startswith("http"):
+        logger.warning(f"Invalid link for article: {article.get('title', 'unknown')}")
+        return False
+
+    if not article.get("date"):
+        logger.warning(f"Missing date for article: {article.get('title', 'unknown')}")
+        return False
+
+    return True
+
+
+def fetch_research_articles_embedded(url, existing_articles=None):
+    """Fetch articles from the page's embedded Next.js data over plain HTTP.
+
+    The articles are merged with those already in the feed (default: read from
+    the existing feed), so older articles are kept.
+    """
+    try:
+        logger.info(f"Fetching embedded article data from URL: {url}")
+        html_content = fetch_html(url)
+    except Exception as e:
+        logger.warning(f"Error fetching research page over HTTP: {e}")
+        return []
+
+    articles = []
+    for article in extract_articles(html_content, link_prefix="https://openai.com/index"):
+        article["category"] = "Research"
+        article["date"] = article["date"] or stable_fallback_date(article["link"])
+        if validate_article(article):
+            articles.append(article)
+
+    logger.info(f"Parsed {len(articles)} articles from embedded data")
+    if not articles:
+        return []
+    if existing_articles is None:
+        existing_articles = load_feed_articles(get_feed_path(), default_category="Research")
+    return merge_articles(articles, existing_articles)
 
 
 def fetch_news_content_selenium(url):
@@ -38,7 +84,7 @@ def fetch_news_content_selenium(url):
     driver = None
     try:
         logger.info(f"Fetching content from URL: {url}")
-        driver = setup_selenium_driver()
+        driver = setup_selenium_driver(allow=RENDER_ALLOW)
         driver.get(url)
 
         # Log wait time
@@ -58,13 +104,16 @@ def fetch_news_content_selenium(url):
             driver.quit()
 
 
-def parse_openai_news_html(html_content):
+def parse_openai_news_html(html_content, selector_hits=None):
     """Parse the HTML content from OpenAI's Research News page."""
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_content, "html.parser")
     articles = []
 
     # Extract news items that contain `/index` in the href
     news_items = soup.select("a[href*='/index']")  # Look for links containing '/index'
+    title_hits = 0
 
     for item in news_items:
         try:
@@ -72,6 +121,7 @@ def parse_openai_news_html(html_content):
             title_elem = item.select_one("div.line-clamp-4")
             if not title_elem:
                 continue
+            title_hits += 1
             title = title_elem.text.strip()
 
             # Extract link
@@ -89,25 +139,31 @@ def parse_openai_news_html(html_content):
             else:
                 date = stable_fallback_date(link)
 
-            articles.append(
-                {
-                    "title": title,
-                    "link": link,
-                    "date": date,
-                    "category": "Research",
-                    "description": title,
-                }
-            )
+            article = {
+                "title": title,
+                "link": link,
+                "date": date,
+                "category": "Research",
+                "description": title,
+            }
+            if validate_article(article):
+                articles.append(article)
         except Exception as e:
             logger.warning(f"Skipping an article due to parsing error: {e}")
             continue
 
+    if selector_hits is not None:
+        selector_hits["a[href*='/index']"] = len(news_items)
+        selector_hits["div.line-clamp-4"] = title_hits
+
     logger.info(f"Parsed {len(articles)} articles")
     return articles
 
 
 def generate_rss_feed(articles, feed_name="openai_research"):
     """Generate RSS feed from parsed articles."""
+    from feedgen.feed import FeedGenerator
+
     fg = FeedGenerator()
     fg.title("OpenAI Research News")
     fg.description("Latest research news and updates from OpenAI")
@@ -121,6 +177,8 @@ def generate_rss_feed(articles, feed_name="openai_research"):
         fe.description(article["description"])
         fe.published(article["date"])
         fe.category(term=article["category"])
+        if article.get("content"):
+            fe.content(article["content"], type="CDATA")
 
     logger.info("RSS feed generated successfully")
     return fg
@@ -128,10 +186,9 @@ def generate_rss_feed(articles, feed_name="openai_research"):
 
 def save_rss_feed(feed_generator, feed_name="openai_research"):
     """Save RSS feed to an XML file."""
-    feeds_dir = Path("feeds")
-    feeds_dir.mkdir(exist_ok=True)
-    output_file = feeds_dir / f"feed_{feed_name}.xml"
-    feed_generator.rss_file(str(output_file), pretty=True)
+    output_file = get_feed_path(feed_name)
+    output_file.parent.mkdir(exist_ok=True)
+    write_feed(feed_generator, output_file)
     logger.info(f"RSS feed saved to {output_file}")
     return output_file
 
@@ -141,14 +198,23 @@ def main():
     url = "https://openai.com/news/research/?limit=500"
 
     try:
-        html_content = fetch_news_content_selenium(url)
-        articles = parse_openai_news_html(html_content)
+        # Try the embedded page data first, only render with Selenium if that fails
+        articles = fetch_research_articles_embedded(url)
+        selector_hits = None
+        if not articles:
+            logger.info("No embedded article data found, falling back to Selenium")
+            html_content = fetch_news_content_selenium(url)
+            selector_hits = {}
+            articles = parse_openai_news_html(html_content, selector_hits)
+        record_run(__file__, len(articles), selector_hits)
         if not articles:
             logger.warning("No articles were parsed. Check your selectors.")
+        enrich_articles(articles, "openai_research")
         feed = generate_rss_feed(articles)
         save_rss_feed(feed)
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {e}")
+        record_failure(__file__, e)
 
 
 if __name__ == "__main__":
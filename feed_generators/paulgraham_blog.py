@@ -1,25 +1,34 @@
-import os
 import requests
 from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from datetime import datetime
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 import re
 
+from utils.fetch import fetch_html
+from utils.archive import write_archived_feed
+from utils.items import FeedItem, add_feed_entry
+from utils.output import FEEDS_BASE_URL
+from utils.pipeline import fetch_and_parse
+from utils.state import load_state, save_state
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
-
-def stable_fallback_date(identifier):
-    """Generate a stable date from a URL or title hash."""
-    hash_val = abs(hash(identifier)) % 730
-    epoch = datetime(2023, 1, 1, 0, 0, 0, tzinfo=pytz.UTC)
-    return epoch + timedelta(days=hash_val)
+# Article pages fetched at once; utils.fetch keeps them within the host's rate limit
+ARTICLE_FETCH_WORKERS = 8
+DESCRIPTION_LENGTH = 500
+# Newest essays kept in the feed; older ones go to archive pages
+FEED_WINDOW = 50
+# Parsed essays are cached by URL in cache/, so each run only fetches new essays
+ESSAYS_STATE = "paulgraham_essays"
+# Essays fetched per run at most; at the host's rate limit this stays well
+# within the script timeout, and the rest are fetched by the following runs
+MAX_NEW_ESSAYS_PER_RUN = 60
 
 
 def get_project_root():
@@ -37,12 +46,7 @@ def ensure_feeds_directory():
 def fetch_html_content(url):
     """Fetch HTML content from the given URL."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching content from {url}: {str(e)}")
         raise
@@ -105,6 +109,20 @@ def get_article_content(article_html):
         return None, None
 
 
+def parse_article(article_html):
+    """Parse an essay page into a compact (description, pub_date) record.
+
+    Runs in a parse worker process, so only the description is sent back
+    rather than the whole essay.
+    """
+    content, pub_date = get_article_content(article_html)
+    if content:
+        description = content[:DESCRIPTION_LENGTH] + "..." if len(content) > DESCRIPTION_LENGTH else content
+    else:
+        description = "No description available"
+    return description, pub_date
+
+
 def parse_essays_page(html_content, base_url="https://paulgraham.com", max_essays=300):
     """Parse the essays HTML page and extract blog post information.
 
@@ -126,6 +144,7 @@ def parse_essays_page(html_content, base_url="https://paulgraham.com", max_essay
         # Limit to first N essays (they're listed in reverse chronological order)
         links_to_process = links[:max_essays]
 
+        essays = []
         for link in links_to_process:
             # Extract title and link
             title = link.text.strip()
@@ -134,35 +153,52 @@ def parse_essays_page(html_content, base_url="https://paulgraham.com", max_essay
                 continue
 
             full_url = f"{base_url}/{href}" if not href.startswith("http") else href
-
-            logger.info(f"Fetching article: {title}")
-
-            # Fetch article content once and reuse it
-            article_html = fetch_html_content(full_url)
-            content, pub_date = get_article_content(article_html)
-
-            if content:
-                description = content[:500] + "..." if len(content) > 500 else content
-            else:
-                description = "No description available"
-
-            blog_post = {
-                "title": title,
-                "link": full_url,
+            essays.append((title, full_url))
+
+        # Only essays that are not cached yet are fetched, newest first
+        cached = load_state(ESSAYS_STATE, {}) or {}
+        new_urls = [url for _, url in essays if url not in cached]
+        if len(new_urls) > MAX_NEW_ESSAYS_PER_RUN:
+            logger.info(f"{len(new_urls) - MAX_NEW_ESSAYS_PER_RUN} new essays left for the next runs")
+            new_urls = new_urls[:MAX_NEW_ESSAYS_PER_RUN]
+
+        # Fetch the article pages concurrently and parse them on all cores
+        logger.info(f"Fetching {len(new_urls)} new articles, {len(essays) - len(new_urls)} cached")
+        records = fetch_and_parse(
+            new_urls,
+            parse_article,
+            fetch=fetch_html_content,
+            io_workers=ARTICLE_FETCH_WORKERS,
+        )
+        for url, (description, pub_date) in zip(new_urls, records):
+            cached[url] = {
                 "description": description,
-                "pub_date": pub_date
-                or stable_fallback_date(
-                    full_url
-                ),  # Fallback to stable date if none found
+                "date": pub_date.isoformat() if pub_date else None,
             }
+        if new_urls:
+            save_state(ESSAYS_STATE, cached)
+
+        # Keep the essays page order
+        for title, full_url in essays:
+            if full_url not in cached:
+                continue
+            record = cached[full_url]
 
             # There are a handful (~7) old blog posts where parsing the date doesn't work very well.
             # In order to avoid sending hourly emails for this, we're just skipping them altogether.
             # We can spend more time on this if/when it ever becomes an issue.
-            if pub_date:
-                blog_posts.append(blog_post)
-            else:
+            if not record["date"]:
                 logger.warning(f"Skipping post '{title}' - no date found")
+                continue
+
+            blog_posts.append(
+                FeedItem(
+                    title=title,
+                    link=full_url,
+                    description=record["description"],
+                    date=datetime.fromisoformat(record["date"]),
+                )
+            )
 
         logger.info(f"Successfully parsed {len(blog_posts)} blog posts")
         return blog_posts
@@ -174,6 +210,8 @@ def parse_essays_page(html_content, base_url="https://paulgraham.com", max_essay
 
 def generate_rss_feed(blog_posts, feed_name="paulgraham"):
     """Generate RSS feed from blog posts."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Paul Graham Essays")
@@ -185,16 +223,11 @@ def generate_rss_feed(blog_posts, feed_name="paulgraham"):
         fg.author({"name": "Paul Graham"})
         fg.subtitle("Paul Graham's Essays and Writings")
         fg.link(href="https://paulgraham.com/articles.html", rel="alternate")
-        fg.link(href=f"https://paulgraham.com/feed_{feed_name}.xml", rel="self")
+        fg.link(href=f"{FEEDS_BASE_URL}/feed_{feed_name}.xml", rel="self")
 
         # Add entries
         for post in blog_posts:
-            fe = fg.add_entry()
-            fe.title(post["title"])
-            fe.description(post["description"])
-            fe.link(href=post["link"])
-            fe.published(post["pub_date"])
-            fe.id(post["link"])
+            add_feed_entry(fg, post)
 
         logger.info("Successfully generated RSS feed")
         return fg
@@ -209,7 +242,7 @@ def save_rss_feed(feed_generator, feed_name="paulgraham"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_archived_feed(feed_generator, output_filename, window=FEED_WINDOW)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
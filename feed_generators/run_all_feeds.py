@@ -1,12 +1,81 @@
 import os
+import signal
 import subprocess
 import logging
 import sys
+import tempfile
+import time
+
+from utils.deadline import DEADLINE_ENV
+from utils.health import record_failure, should_skip
+from utils.publish import publish_feeds
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Seconds a script may run before it is killed; Selenium scripts get more room
+DEFAULT_SCRIPT_TIMEOUT = 120
+SCRIPT_TIMEOUTS = {
+    "anthropic_batch.py": 300,
+    "openai_research_blog.py": 180,
+    "suleyman_blog.py": 180,
+}
+# Scripts that generate other scripts' feeds in one go (one shared browser session);
+# the generated scripts are not run on their own
+BATCH_SCRIPTS = {
+    "anthropic_batch.py": ["anthropic_news_blog.py", "anthropic_research_blog.py"],
+}
+# Wall-clock budget for the whole run; scripts not started within it are skipped
+RUN_BUDGET = int(os.environ.get("FEEDS_RUN_BUDGET", 40 * 60))
+# Seconds between SIGTERM and SIGKILL when stopping a script's process group
+KILL_GRACE_PERIOD = 5
+
+
+def kill_process_group(process_group):
+    """Terminate every process left in a script's process group (e.g. orphaned Chrome)."""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(process_group, sig)
+        except ProcessLookupError:
+            return
+        time.sleep(KILL_GRACE_PERIOD if sig == signal.SIGTERM else 0)
+
+
+def run_script(script_path, timeout):
+    """Run a generator in its own process group with a deadline.
+
+    The deadline is passed as FEED_DEADLINE so the fetch layer can wind down on
+    its own; if the script is still running at the timeout, its whole process
+    group (including chromedriver and Chrome) is killed.
+
+    Returns:
+        tuple: (return code or None on timeout, captured stderr)
+    """
+    env = dict(os.environ, **{DEADLINE_ENV: str(time.time() + timeout)})
+    # stderr goes to a file rather than a pipe: an orphaned browser inheriting
+    # the pipe would keep it open and make the script look hung
+    with tempfile.TemporaryFile(mode="w+") as stderr_file:
+        process = subprocess.Popen(
+            ["python", script_path],
+            stdout=subprocess.DEVNULL,
+            stderr=stderr_file,
+            text=True,
+            env=env,
+            start_new_session=True,
+        )
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            returncode = None
+        # Also stops browsers a finished script failed to quit
+        kill_process_group(process.pid)
+        process.wait()
+
+        stderr_file.seek(0)
+        return returncode, stderr_file.read()
+
+
 def run_all_feeds():
     """Run all Python scripts in the feed_generators directory.
 
@@ -14,37 +83,77 @@ def run_all_feeds():
         int: Exit code (0 for success, 1 if any script failed)
     """
     feed_generators_dir = os.path.dirname(os.path.abspath(__file__))
-    skip_scripts = []
+    skip_scripts = [script for scripts in BATCH_SCRIPTS.values() for script in scripts]
     failed_scripts = []
     successful_scripts = []
+    backed_off_scripts = []
+    timed_out_scripts = []
+    not_run_scripts = []
+    run_deadline = time.time() + RUN_BUDGET
 
-    for filename in os.listdir(feed_generators_dir):
+    for filename in sorted(os.listdir(feed_generators_dir)):
         if filename.endswith(".py") and filename != os.path.basename(__file__):
             if filename in skip_scripts:
                 logger.info(f"Skipping script: {filename}")
                 continue
 
             script_path = os.path.join(feed_generators_dir, filename)
-            logger.info(f"Running script: {script_path}")
-            result = subprocess.run(["python", script_path], capture_output=True, text=True)
-            if result.returncode == 0:
+            if should_skip(script_path):
+                backed_off_scripts.append(filename)
+                continue
+
+            timeout = min(SCRIPT_TIMEOUTS.get(filename, DEFAULT_SCRIPT_TIMEOUT), run_deadline - time.time())
+            if timeout <= 0:
+                not_run_scripts.append(filename)
+                continue
+
+            logger.info(f"Running script: {script_path} (timeout {timeout:.0f}s)")
+            returncode, stderr = run_script(script_path, timeout)
+            if returncode == 0:
                 logger.info(f"Successfully ran script: {script_path}")
                 successful_scripts.append(filename)
+            elif returncode is None:
+                logger.error(f"Timed out after {timeout:.0f}s, killed script: {script_path}\n{stderr}")
+                timed_out_scripts.append(filename)
+                # A hung source backs off like a broken one; a batch script's
+                # health is recorded per source it generates
+                for source_script in BATCH_SCRIPTS.get(filename, [filename]):
+                    record_failure(os.path.join(feed_generators_dir, source_script), f"timed out after {timeout:.0f}s")
             else:
-                logger.error(f"Error running script: {script_path}\n{result.stderr}")
+                logger.error(f"Error running script: {script_path}\n{stderr}")
                 failed_scripts.append(filename)
 
+    # Publish the manifest for whatever feeds exist now, including ones from earlier runs
+    try:
+        publish_feeds()
+    except Exception as e:
+        logger.error(f"Failed to publish feed manifest: {e}")
+
     # Summary
     logger.info(f"\n{'='*60}")
     logger.info(f"Feed Generation Summary:")
     logger.info(f"  Successful: {len(successful_scripts)}")
     logger.info(f"  Failed: {len(failed_scripts)}")
+    logger.info(f"  Timed out: {len(timed_out_scripts)}")
+    logger.info(f"  Skipped (broken, backing off): {len(backed_off_scripts)}")
+    logger.info(f"  Not run (run budget exhausted): {len(not_run_scripts)}")
 
     if successful_scripts:
         logger.info(f"\nSuccessful feeds:")
         for script in successful_scripts:
             logger.info(f"  ✓ {script}")
 
+    if backed_off_scripts:
+        logger.warning(f"\nBroken feeds (backing off):")
+        for script in backed_off_scripts:
+            logger.warning(f"  - {script}")
+
+    if not_run_scripts:
+        logger.warning(f"\nNot run (run budget exhausted):")
+        for script in not_run_scripts:
+            logger.warning(f"  - {script}")
+
+    failed_scripts += timed_out_scripts
     if failed_scripts:
         logger.error(f"\nFailed feeds:")
         for script in failed_scripts:
@@ -1,4 +1,3 @@
-import undetected_chromedriver as uc
 from bs4 import BeautifulSoup
 from datetime import datetime
 import pytz
@@ -6,13 +5,33 @@ import re
 import time
 import logging
 from pathlib import Path
-from feedgen.feed import FeedGenerator
+
+from utils.browser import setup_selenium_driver, wait_for_selector
+from utils.health import record_failure, record_run
+from utils.output import write_feed
+from utils.state import load_state, save_state
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://mustafa-suleyman.ai"
+# The writing section is revealed by scroll-triggered scripts, which are never blocked
+RENDER_ALLOW = ()
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Post discovery strategies in order of precedence: <article> elements, links in
+# the #writing section, links whose URL looks like a post, card-like div/li
+STRATEGIES = ("article", "writing_section", "post_link", "card")
+# How many posts each strategy contributed in the last run, and which strategies
+# ever contributed any (a strategy that never wins can be pruned)
+STRATEGY_STATE = "suleyman_strategies"
+POST_HREF_PATTERN = re.compile(r'(blog|writing|post|article)', re.I)
+CARD_CLASS_PATTERN = re.compile(r'(card|post|article|item)', re.I)
+WRITING_CLASS_PATTERN = re.compile(r'writing', re.I)
+# Title elements in order of preference: h1-h4, strong, .title, [class*="title"]
+TITLE_SELECTORS = ("h1", "h2", "h3", "h4", "strong", ".title", '[class*="title"]')
+SKIP_HREF_PATTERNS = ['twitter', 'linkedin', 'facebook', 'instagram', 'youtube', 'mailto:', 'tel:', '#', 'javascript:']
 
 
 def get_project_root():
@@ -27,26 +46,16 @@ def ensure_feeds_directory():
     return feeds_dir
 
 
-def setup_selenium_driver():
-    """Set up Selenium WebDriver with undetected-chromedriver."""
-    options = uc.ChromeOptions()
-    options.add_argument("--headless")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    )
-    return uc.Chrome(options=options)
-
-
 def fetch_blog_content_selenium(url=BASE_URL):
     """Fetch the fully loaded HTML content using Selenium."""
     driver = None
     try:
         logger.info(f"Fetching content from URL: {url}")
-        driver = setup_selenium_driver()
+        driver = setup_selenium_driver(
+            user_agent=USER_AGENT,
+            extra_arguments=("--no-sandbox", "--disable-dev-shm-usage"),
+            allow=RENDER_ALLOW,
+        )
         driver.get(url)
 
         # Wait for the page to fully load
@@ -61,19 +70,11 @@ def fetch_blog_content_selenium(url=BASE_URL):
         except:
             pass
 
-        # Wait for writing section content to load
-        try:
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-
-            # Wait for any article links to appear
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='writing'], a[href*='blog'], article a"))
-            )
+        # Wait for any article links in the writing section to appear
+        if wait_for_selector(driver, "a[href*='writing'], a[href*='blog'], article a"):
             logger.info("Writing section loaded successfully")
-        except Exception as e:
-            logger.warning(f"Could not confirm writing section loaded: {e}")
+        else:
+            logger.warning("Could not confirm writing section loaded")
 
         html_content = driver.page_source
         logger.info("Successfully fetched HTML content")
@@ -112,48 +113,72 @@ def parse_date(date_text):
     return None
 
 
-def parse_blog_html(html_content):
-    """Parse the blog HTML content and extract post information."""
+def collect_candidates(soup):
+    """Find every candidate post link once, with the container it is extracted from.
+
+    The four discovery strategies (see STRATEGIES) are gathered in one walk over
+    the document. A link is claimed by the first strategy, in order of
+    precedence, that finds it, exactly as if the strategies ran one after the
+    other.
+
+    Returns:
+        list: (strategy, container, link) tuples in output order
+    """
+    found = {strategy: [] for strategy in STRATEGIES}
+    writing_by_id = writing_by_class = None
+
+    for tag in soup.find_all(True):
+        classes = tag.get('class') or []
+        if tag.name == 'article':
+            link = tag.find('a', href=True)
+            if link:
+                found['article'].append((tag, link))
+        elif tag.name in ('div', 'li') and any(CARD_CLASS_PATTERN.search(c) for c in classes):
+            link = tag.find('a', href=True)
+            if link:
+                found['card'].append((tag, link))
+
+        if tag.name == 'a' and POST_HREF_PATTERN.search(tag.get('href') or ''):
+            found['post_link'].append((tag.parent, tag))
+        if writing_by_id is None and tag.get('id') == 'writing':
+            writing_by_id = tag
+        if writing_by_class is None and any(WRITING_CLASS_PATTERN.search(c) for c in classes):
+            writing_by_class = tag
+
+    writing_section = writing_by_id or writing_by_class
+    if writing_section:
+        found['writing_section'] = [(link.parent, link) for link in writing_section.find_all('a', href=True)]
+
+    candidates = []
+    claimed = set()
+    for strategy in STRATEGIES:
+        for container, link in found[strategy]:
+            href = link.get('href', '')
+            if href in claimed or not is_post_href(href):
+                continue
+            claimed.add(href)
+            candidates.append((strategy, container, link))
+    return candidates
+
+
+def parse_blog_html(html_content, strategy_wins=None):
+    """Parse the blog HTML content and extract post information.
+
+    Args:
+        html_content: Rendered page HTML
+        strategy_wins: Optional dict filled with the number of posts each
+            discovery strategy contributed
+    """
     try:
         soup = BeautifulSoup(html_content, "html.parser")
         blog_posts = []
-        seen_links = set()
 
-        # Try multiple strategies to find blog posts
-
-        # Strategy 1: Look for article elements
-        articles = soup.find_all('article')
-        for article in articles:
-            link = article.find('a', href=True)
-            if link:
-                post = extract_post_from_element(article, link, seen_links)
-                if post:
-                    blog_posts.append(post)
-
-        # Strategy 2: Look for links in the writing section
-        writing_section = soup.find(id='writing') or soup.find(class_=re.compile(r'writing', re.I))
-        if writing_section:
-            links = writing_section.find_all('a', href=True)
-            for link in links:
-                post = extract_post_from_element(link.parent, link, seen_links)
-                if post:
-                    blog_posts.append(post)
-
-        # Strategy 3: Look for any links that look like blog posts
-        all_links = soup.find_all('a', href=re.compile(r'(blog|writing|post|article)', re.I))
-        for link in all_links:
-            post = extract_post_from_element(link.parent, link, seen_links)
+        for strategy, container, link in collect_candidates(soup):
+            post = extract_post_from_element(container, link)
             if post:
                 blog_posts.append(post)
-
-        # Strategy 4: Look for card-like structures with titles
-        cards = soup.find_all(['div', 'li'], class_=re.compile(r'(card|post|article|item)', re.I))
-        for card in cards:
-            link = card.find('a', href=True)
-            if link:
-                post = extract_post_from_element(card, link, seen_links)
-                if post:
-                    blog_posts.append(post)
+                if strategy_wins is not None:
+                    strategy_wins[strategy] = strategy_wins.get(strategy, 0) + 1
 
         logger.info(f"Successfully parsed {len(blog_posts)} blog posts")
         return blog_posts
@@ -163,18 +188,44 @@ def parse_blog_html(html_content):
         raise
 
 
-def extract_post_from_element(container, link, seen_links):
-    """Extract post information from a container element."""
-    href = link.get('href', '')
-    if not href or href in seen_links or href == '#' or href == '/':
-        return None
+def is_post_href(href):
+    """Whether a link could point to a post (not empty, navigation or social)."""
+    if not href or href == '#' or href == '/':
+        return False
+    return not any(pattern in href.lower() for pattern in SKIP_HREF_PATTERNS)
+
+
+def find_title(container):
+    """Return the container's title text, looking for all TITLE_SELECTORS in one walk."""
+    first_matches = [None] * len(TITLE_SELECTORS)
+    for tag in container.find_all(True):
+        classes = tag.get('class') or []
+        class_attr = " ".join(classes)
+        for i, matches in enumerate((
+            tag.name == 'h1',
+            tag.name == 'h2',
+            tag.name == 'h3',
+            tag.name == 'h4',
+            tag.name == 'strong',
+            'title' in classes,
+            'title' in class_attr,
+        )):
+            if matches and first_matches[i] is None:
+                first_matches[i] = tag
+
+    # Selectors in order of preference; a short match is kept only if nothing better follows
+    title = None
+    for title_elem in first_matches:
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+            if title and len(title) > 3:
+                break
+    return title
 
-    # Skip navigation links, social links, etc.
-    skip_patterns = ['twitter', 'linkedin', 'facebook', 'instagram', 'youtube', 'mailto:', 'tel:', '#', 'javascript:']
-    if any(pattern in href.lower() for pattern in skip_patterns):
-        return None
 
-    seen_links.add(href)
+def extract_post_from_element(container, link):
+    """Extract post information from a container element."""
+    href = link.get('href', '')
 
     # Construct full URL
     if href.startswith('http'):
@@ -185,13 +236,7 @@ def extract_post_from_element(container, link, seen_links):
         full_url = f"{BASE_URL}/{href}"
 
     # Extract title
-    title = None
-    for selector in ['h1', 'h2', 'h3', 'h4', 'strong', '.title', '[class*="title"]']:
-        title_elem = container.select_one(selector) if hasattr(container, 'select_one') else None
-        if title_elem:
-            title = title_elem.get_text(strip=True)
-            if title and len(title) > 3:
-                break
+    title = find_title(container) if hasattr(container, 'find_all') else None
 
     if not title:
         title = link.get_text(strip=True)
@@ -236,8 +281,26 @@ def extract_post_from_element(container, link, seen_links):
     }
 
 
+def record_strategy_wins(strategy_wins):
+    """Record how many posts each strategy contributed and which ever contributed any.
+
+    cache/ is committed after every run, so the stats are only written when a
+    run's counts differ from the previous run's.
+    """
+    last_run = {strategy: strategy_wins.get(strategy, 0) for strategy in STRATEGIES}
+    logger.info(f"Posts per discovery strategy: {last_run}")
+    stats = load_state(STRATEGY_STATE, {}) or {}
+    if stats.get("last_run") == last_run:
+        return
+
+    won = set(stats.get("won", [])) | {strategy for strategy, wins in last_run.items() if wins}
+    save_state(STRATEGY_STATE, {"last_run": last_run, "won": [s for s in STRATEGIES if s in won]})
+
+
 def generate_rss_feed(blog_posts, feed_name="suleyman"):
     """Generate RSS feed from blog posts."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Mustafa Suleyman - Writing")
@@ -273,7 +336,7 @@ def save_rss_feed(feed_generator, feed_name="suleyman"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -289,7 +352,10 @@ def main(blog_url=BASE_URL, feed_name="suleyman"):
         html_content = fetch_blog_content_selenium(blog_url)
 
         # Parse blog posts from HTML
-        blog_posts = parse_blog_html(html_content)
+        strategy_wins = {}
+        blog_posts = parse_blog_html(html_content, strategy_wins)
+        record_run(__file__, len(blog_posts))
+        record_strategy_wins(strategy_wins)
 
         if not blog_posts:
             logger.warning("No posts found. The site structure may have changed.")
@@ -307,6 +373,7 @@ def main(blog_url=BASE_URL, feed_name="suleyman"):
 
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {str(e)}")
+        record_failure(__file__, e)
         return False
 
 
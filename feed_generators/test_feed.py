@@ -3,10 +3,13 @@ import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
 from datetime import datetime
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.health import record_failure, record_run
+from utils.fetch import fetch_html
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -27,31 +30,34 @@ def ensure_feeds_directory():
 def fetch_news_content(url="https://www.anthropic.com/news"):
     """Fetch news content from Anthropic's website."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching news content: {str(e)}")
         raise
 
 
-def parse_news_html(html_content):
-    """Parse the news HTML content and extract article information."""
+def parse_news_html(html_content, selector_hits=None):
+    """Parse the news HTML content and extract article information.
+
+    Args:
+        html_content: Raw HTML of the news page
+        selector_hits: Optional dict filled with the number of matches per key selector
+    """
     try:
         soup = BeautifulSoup(html_content, "html.parser")
         articles = []
 
         # Find all article cards
         news_cards = soup.select("a.PostCard_post-card__z_Sqq")
+        title_hits = 0
+        date_hits = 0
 
         for card in news_cards:
             # Extract title
             title_elem = card.select_one("h3.PostCard_post-heading__Ob1pu")
             if not title_elem:
                 continue
+            title_hits += 1
             title = title_elem.text.strip()
 
             # Extract link
@@ -60,6 +66,7 @@ def parse_news_html(html_content):
             # Extract date
             date_elem = card.select_one("div.PostList_post-date__djrOA")
             if date_elem:
+                date_hits += 1
                 try:
                     date = datetime.strptime(date_elem.text.strip(), "%b %d, %Y")
                     date = date.replace(tzinfo=pytz.UTC)
@@ -81,6 +88,15 @@ def parse_news_html(html_content):
                 {"title": title, "link": link, "date": date, "category": category, "description": description}
             )
 
+        if selector_hits is not None:
+            selector_hits.update(
+                {
+                    "a.PostCard_post-card__z_Sqq": len(news_cards),
+                    "h3.PostCard_post-heading__Ob1pu": title_hits,
+                    "div.PostList_post-date__djrOA": date_hits,
+                }
+            )
+
         logger.info(f"Successfully parsed {len(articles)} articles")
         return articles
 
@@ -91,6 +107,8 @@ def parse_news_html(html_content):
 
 def generate_rss_feed(articles, feed_name="anthropic"):
     """Generate RSS feed from news articles."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Anthropic News")
@@ -133,7 +151,7 @@ def save_rss_feed(feed_generator, feed_name="anthropic"):
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
 
         # Save the feed
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -167,7 +185,9 @@ def main(feed_name="anthropic"):
         html_content = fetch_news_content()
 
         # Parse articles from HTML
-        articles = parse_news_html(html_content)
+        selector_hits = {}
+        articles = parse_news_html(html_content, selector_hits)
+        record_run(__file__, len(articles), selector_hits)
 
         # Generate RSS feed with all articles
         feed = generate_rss_feed(articles, feed_name)
@@ -180,6 +200,7 @@ def main(feed_name="anthropic"):
 
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {str(e)}")
+        record_failure(__file__, e)
         return False
 
 
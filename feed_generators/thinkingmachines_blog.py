@@ -3,11 +3,14 @@ import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 from dateutil import parser
 
+from utils.fetch import fetch_html
+from utils.items import FeedItem, add_feed_entry
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -37,12 +40,7 @@ def ensure_feeds_directory():
 def fetch_content(url):
     """Fetch content from website."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching content from {url}: {str(e)}")
         raise
@@ -130,13 +128,13 @@ def extract_articles(soup):
                 author_text = "Thinking Machines Lab"
 
             # Create article object
-            article = {
-                "title": title,
-                "link": link,
-                "description": f"{title} by {author_text}",
-                "pub_date": pub_date,
-                "author": author_text,
-            }
+            article = FeedItem(
+                title=title,
+                link=link,
+                description=f"{title} by {author_text}",
+                date=pub_date,
+                author=author_text,
+            )
 
             articles.append(article)
             logger.info(f"Parsed: {title} ({date_text}) by {author_text}")
@@ -146,7 +144,7 @@ def extract_articles(soup):
             continue
 
     # Sort by date (newest first)
-    articles.sort(key=lambda x: x["pub_date"], reverse=True)
+    articles.sort(key=lambda x: x.date, reverse=True)
 
     logger.info(f"Successfully parsed {len(articles)} articles")
     return articles
@@ -164,6 +162,8 @@ def parse_html(html_content):
 
 def generate_rss_feed(articles, feed_name="thinkingmachines"):
     """Generate RSS feed using feedgen."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Thinking Machines Lab - Connectionism")
@@ -181,13 +181,7 @@ def generate_rss_feed(articles, feed_name="thinkingmachines"):
 
         # Add entries
         for article in articles:
-            fe = fg.add_entry()
-            fe.title(article["title"])
-            fe.description(article["description"])
-            fe.link(href=article["link"])
-            fe.published(article["pub_date"])
-            fe.author({"name": article["author"]})
-            fe.id(article["link"])
+            add_feed_entry(fg, article)
 
         logger.info("Successfully generated RSS feed")
         return fg
@@ -202,7 +196,7 @@ def save_rss_feed(feed_generator, feed_name="thinkingmachines"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
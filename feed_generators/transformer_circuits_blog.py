@@ -1,17 +1,26 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from datetime import datetime
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.fetch import fetch_html
+from utils.fingerprint import generate_unless_unchanged
+from utils.output import write_feed
+from utils.parsing import parse_subtree
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://transformer-circuits.pub"
 
+# The TOC is hand-written static HTML; the common normalization is enough
+FINGERPRINT_RULES = []
+# The TOC and its fallback both live inside .container; the rest of the page is skipped
+CONTAINER_STRAINER = SoupStrainer("div", class_="container")
+
 
 def get_project_root():
     """Get the project root directory."""
@@ -28,12 +37,7 @@ def ensure_feeds_directory():
 def fetch_blog_content(url):
     """Fetch blog content from the given URL."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching blog content: {str(e)}")
         raise
@@ -42,7 +46,7 @@ def fetch_blog_content(url):
 def parse_blog_html(html_content):
     """Parse the blog HTML content and extract post information."""
     try:
-        soup = BeautifulSoup(html_content, "html.parser")
+        soup = parse_subtree(html_content, CONTAINER_STRAINER, ".container")
         blog_posts = []
 
         # Find the table of contents container
@@ -150,6 +154,8 @@ def extract_post(element, current_date):
 
 def generate_rss_feed(blog_posts, feed_name="transformer_circuits"):
     """Generate RSS feed from blog posts."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Transformer Circuits Thread")
@@ -188,7 +194,7 @@ def save_rss_feed(feed_generator, feed_name="transformer_circuits"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -197,27 +203,41 @@ def save_rss_feed(feed_generator, feed_name="transformer_circuits"):
         raise
 
 
+def generate_feed(html_content, feed_name="transformer_circuits"):
+    """Parse the listing page and write the feed; returns False if no posts were found."""
+    # Parse blog posts from HTML
+    blog_posts = parse_blog_html(html_content)
+
+    if not blog_posts:
+        logger.warning("No posts found. Please check the HTML structure.")
+        return False
+
+    # Generate RSS feed
+    feed = generate_rss_feed(blog_posts, feed_name)
+
+    # Save feed to file
+    output_file = save_rss_feed(feed, feed_name)
+
+    logger.info(f"Successfully generated RSS feed with {len(blog_posts)} posts")
+    return True
+
+
 def main(blog_url=BASE_URL, feed_name="transformer_circuits"):
     """Main function to generate RSS feed from Transformer Circuits."""
     try:
         # Fetch blog content
         html_content = fetch_blog_content(blog_url)
 
-        # Parse blog posts from HTML
-        blog_posts = parse_blog_html(html_content)
-
-        if not blog_posts:
-            logger.warning("No posts found. Please check the HTML structure.")
-            return False
-
-        # Generate RSS feed
-        feed = generate_rss_feed(blog_posts, feed_name)
-
-        # Save feed to file
-        output_file = save_rss_feed(feed, feed_name)
-
-        logger.info(f"Successfully generated RSS feed with {len(blog_posts)} posts")
-        return True
+        # Skip parsing when the listing has not changed since the last run
+        feed_path = ensure_feeds_directory() / f"feed_{feed_name}.xml"
+        return generate_unless_unchanged(
+            feed_name,
+            html_content,
+            __file__,
+            feed_path,
+            lambda: generate_feed(html_content, feed_name),
+            FINGERPRINT_RULES,
+        )
 
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {str(e)}")
@@ -0,0 +1 @@
+"""Shared helpers used by the individual feed generator scripts."""
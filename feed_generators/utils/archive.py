@@ -0,0 +1,185 @@
+"""Keep feeds small by moving older items into RFC 5005 archive pages.
+
+The subscription feed (``feeds/feed_<name>.xml``) keeps the newest items; when
+more than ``window + page_size`` items are left over, the oldest ``page_size``
+of them are written to a new page ``feeds/archive/feed_<name>_<n>.xml``.
+Pages are append-only: a page is written once and never renumbered, rewritten
+or deleted, even if its items later change or disappear upstream. The ids of
+archived items are kept in ``cache/archive_<name>.json``, so generators only
+need to pass the items that are not archived yet (plus any they still list),
+and the subscription feed holds between ``window`` and
+``window + page_size - 1`` items.
+
+Pages are linked as described in RFC 5005 section 4 (archived feeds): the
+subscription feed points to the newest page with ``prev-archive``, and every
+page carries ``fh:archive``, a ``current`` link and a ``prev-archive`` link to
+the page before it. Pages have no ``next-archive`` link, since adding one would
+change the page before the newest on every new page.
+"""
+
+import copy
+import logging
+import re
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+import pytz
+from lxml import etree
+
+from utils.output import FEEDS_BASE_URL, parse_feed, write_file, write_serialized_feed
+from utils.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+HISTORY_NS = "http://purl.org/syndication/history/1.0"
+ARCHIVE_DIR = "archive"
+DEFAULT_PAGE_SIZE = 50
+
+
+def get_item_date(item):
+    """Return an item's pubDate as an aware datetime, or None."""
+    pub_date = item.findtext("pubDate")
+    if not pub_date:
+        return None
+    try:
+        return parsedate_to_datetime(pub_date)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_item_id(item):
+    """Return an item's GUID, or its link if it has none."""
+    return (item.findtext("guid") or item.findtext("link") or "").strip()
+
+
+def split_items(items, window, page_size):
+    """Split items into new archive pages (oldest first) and the items kept in the feed.
+
+    Undated items sort as newest, so they stay in the subscription feed.
+    """
+    # Stable sort: items with equal dates keep their feed order reversed (oldest first)
+    undated = datetime.max.replace(tzinfo=pytz.UTC)
+    oldest_first = sorted(reversed(items), key=lambda item: get_item_date(item) or undated)
+    archived_count = max(0, len(items) - window) // page_size * page_size
+    pages = [oldest_first[i:i + page_size] for i in range(0, archived_count, page_size)]
+    return pages, oldest_first[archived_count:]
+
+
+def load_archive(feed_name, archive_dir):
+    """Return the archive state of a feed: {"pages": page count, "ids": archived item ids}.
+
+    Without saved state (e.g. a fresh cache/), the state is rebuilt from the
+    pages in ``archive_dir``.
+    """
+    state = load_state(f"archive_{feed_name}")
+    if state is not None:
+        return state
+
+    state = {"pages": 0, "ids": []}
+    page_pattern = re.compile(rf"feed_{re.escape(feed_name)}_(\d+)\.xml")
+    for path in sorted(archive_dir.glob(f"feed_{feed_name}_*.xml") if archive_dir.exists() else ()):
+        match = page_pattern.fullmatch(path.name)
+        if not match:
+            continue
+        state["pages"] = max(state["pages"], int(match.group(1)))
+        state["ids"].extend(get_item_id(item) for item in parse_feed(path.read_bytes()).find("channel").findall("item"))
+    if state["pages"]:
+        logger.info(f"Rebuilt archive state of {feed_name} from {state['pages']} pages")
+    return state
+
+
+def set_link(channel, rel, href):
+    """Add an atom:link with the given relation to a channel."""
+    link = etree.SubElement(channel, f"{{{ATOM_NS}}}link")
+    link.set("href", href)
+    link.set("rel", rel)
+    link.set("type", "application/rss+xml")
+
+
+def get_archive_page_count(output_path):
+    """Number of archive pages written for the feed at ``output_path``."""
+    output_path = Path(output_path)
+    feed_name = re.sub(r"^feed_", "", output_path.stem)
+    return load_archive(feed_name, output_path.parent / ARCHIVE_DIR)["pages"]
+
+
+def build_archive_page(root, page_items, number, feed_name):
+    """Return the serialized archive page ``number`` (1 = oldest)."""
+    page_root = copy.deepcopy(root)
+    channel = page_root.find("channel")
+    for element in channel.findall("lastBuildDate"):
+        channel.remove(element)
+    for link in channel.findall(f"{{{ATOM_NS}}}link"):
+        if link.get("rel") in ("self", "current", "prev-archive", "next-archive"):
+            channel.remove(link)
+
+    etree.SubElement(channel, f"{{{HISTORY_NS}}}archive")
+    set_link(channel, "self", get_archive_url(feed_name, number))
+    set_link(channel, "current", f"{FEEDS_BASE_URL}/feed_{feed_name}.xml")
+    if number > 1:
+        set_link(channel, "prev-archive", get_archive_url(feed_name, number - 1))
+
+    # Newest first within the page, like the subscription feed
+    for item in reversed(page_items):
+        channel.append(copy.deepcopy(item))
+    etree.cleanup_namespaces(page_root, top_nsmap={"atom": ATOM_NS, "fh": HISTORY_NS})
+    return etree.tostring(page_root, pretty_print=True, encoding="UTF-8", xml_declaration=True)
+
+
+def get_archive_url(feed_name, number):
+    """Absolute URL of archive page ``number`` of a feed."""
+    return f"{FEEDS_BASE_URL}/{ARCHIVE_DIR}/feed_{feed_name}_{number}.xml"
+
+
+def write_archived_feed(feed_generator, output_path, window, page_size=DEFAULT_PAGE_SIZE, pretty=None, compress=None):
+    """Write the newest items to ``output_path`` and append full pages of older ones to the archive.
+
+    Args:
+        feed_generator: feedgen FeedGenerator holding at least every item that
+            is not archived yet; items that already are archived are left out
+        output_path: Path of the subscription feed (feeds/feed_<name>.xml)
+        window: Minimum number of newest items kept in the subscription feed
+        page_size: Items per archive page
+        pretty, compress: Output options, see utils.output.write_serialized_feed
+
+    Returns:
+        Path: The subscription feed that was written
+    """
+    output_path = Path(output_path)
+    feed_name = re.sub(r"^feed_", "", output_path.stem)
+    archive_dir = output_path.parent / ARCHIVE_DIR
+    archive = load_archive(feed_name, archive_dir)
+    archived_ids = set(archive["ids"])
+
+    root = parse_feed(feed_generator.rss_str(pretty=False))
+    channel = root.find("channel")
+    items = channel.findall("item")
+    for item in items:
+        channel.remove(item)
+    items = [item for item in items if get_item_id(item) not in archived_ids]
+    pages, current_items = split_items(items, window, page_size)
+
+    if pages:
+        archive_dir.mkdir(exist_ok=True)
+    for page_items in pages:
+        archive["pages"] += 1
+        page_path = archive_dir / f"feed_{feed_name}_{archive['pages']}.xml"
+        write_file(page_path, build_archive_page(root, page_items, archive["pages"], feed_name))
+        archive["ids"].extend(get_item_id(item) for item in page_items)
+    if pages:
+        save_state(f"archive_{feed_name}", archive)
+
+    # The subscription feed keeps its items in their original order
+    kept = set(map(id, current_items))
+    for item in items:
+        if id(item) in kept:
+            channel.append(item)
+    if archive["pages"]:
+        set_link(channel, "prev-archive", get_archive_url(feed_name, archive["pages"]))
+        logger.info(
+            f"Kept {len(current_items)} items in {output_path.name}, "
+            f"{archive['pages']} archive pages ({len(pages)} new)"
+        )
+    return write_serialized_feed(etree.tostring(root, encoding="UTF-8", xml_declaration=True), output_path, pretty, compress)
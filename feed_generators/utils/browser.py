@@ -0,0 +1,158 @@
+"""Headless Chrome setup shared by the Selenium-backed generators.
+
+Selenium and undetected-chromedriver are imported inside the functions so that
+scripts only pay for them when a page actually has to be rendered.
+
+The generators only need the DOM, so by default Chrome runs with the
+"lightweight" render profile: GPU and extensions are off, and images, media,
+fonts and known trackers are blocked through CDP ``Network.setBlockedURLs``.
+A source can keep some of them with ``allow``, and ``RENDER_PROFILE=full``
+switches blocking off everywhere for debugging.
+"""
+
+import logging
+import os
+import time
+
+from utils.deadline import cap_timeout
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# URL patterns per resource category, blocked by the render profiles below
+BLOCKED_URL_PATTERNS = {
+    "images": ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"),
+    "media": ("*.mp4", "*.webm", "*.mov", "*.m3u8", "*.mp3", "*.m4a", "*.ogg", "*.wav"),
+    "fonts": ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"),
+    "trackers": (
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*segment.com*",
+        "*segment.io*",
+        "*hotjar.com*",
+        "*intercom.io*",
+        "*connect.facebook.net*",
+        "*clarity.ms*",
+        "*sentry.io*",
+        "*vercel-insights.com*",
+    ),
+}
+
+RENDER_PROFILES = {
+    "full": {"arguments": (), "blocked": ()},
+    "lightweight": {
+        "arguments": ("--disable-gpu", "--disable-extensions", "--blink-settings=imagesEnabled=false"),
+        "blocked": ("images", "media", "fonts", "trackers"),
+    },
+}
+DEFAULT_RENDER_PROFILE = "lightweight"
+
+
+def get_blocked_url_patterns(categories, allow=()):
+    """Return the URL patterns to block, minus anything in ``allow``.
+
+    Args:
+        categories: Names of BLOCKED_URL_PATTERNS categories to block
+        allow: Category names or individual URL patterns the source needs
+    """
+    return [
+        pattern
+        for category in categories
+        if category not in allow
+        for pattern in BLOCKED_URL_PATTERNS[category]
+        if pattern not in allow
+    ]
+
+
+def setup_selenium_driver(user_agent=DEFAULT_USER_AGENT, extra_arguments=(), profile=None, allow=()):
+    """Set up Selenium WebDriver with undetected-chromedriver.
+
+    Args:
+        user_agent: User agent for the browser session
+        extra_arguments: Additional Chrome command line arguments
+        profile: Name of a RENDER_PROFILES entry (default: $RENDER_PROFILE or "lightweight")
+        allow: Resource categories or URL patterns this source must not block
+    """
+    import undetected_chromedriver as uc
+
+    profile = profile or os.environ.get("RENDER_PROFILE", DEFAULT_RENDER_PROFILE)
+    settings = RENDER_PROFILES[profile]
+    if "images" in allow:
+        arguments = [a for a in settings["arguments"] if not a.startswith("--blink-settings")]
+    else:
+        arguments = list(settings["arguments"])
+
+    options = uc.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    for argument in arguments + list(extra_arguments):
+        options.add_argument(argument)
+    options.add_argument(f"--user-agent={user_agent}")
+    driver = uc.Chrome(options=options)
+
+    blocked = get_blocked_url_patterns(settings["blocked"], allow)
+    if blocked:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+            logger.info(f"Render profile {profile!r}: blocking {len(blocked)} URL patterns")
+        except Exception as e:
+            logger.warning(f"Could not enable resource blocking: {e}")
+    return driver
+
+
+def wait_for_selector(driver, css_selector, timeout=15):
+    """Wait for an element matching ``css_selector``; return False on timeout."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    timeout = cap_timeout(timeout)
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, css_selector))
+        )
+        return True
+    except Exception as e:
+        logger.debug(f"Timed out waiting for {css_selector}: {e}")
+        return False
+
+
+def render_pages(origin, renderers, warmup_seconds=5, user_agent=DEFAULT_USER_AGENT, profile=None, allow=()):
+    """Render several pages of one origin in a single warmed-up browser session.
+
+    The origin is loaded first so bot checks and cookies are settled once, then
+    each renderer runs in turn in the same session. A failing page does not
+    abort the others.
+
+    Args:
+        origin: URL loaded to warm up the session (e.g. "https://www.anthropic.com")
+        renderers: Mapping of name -> callable(driver) returning the rendered result
+        warmup_seconds: Seconds to let the origin settle after the first load
+        user_agent: User agent for the browser session
+        profile: Render profile, see setup_selenium_driver
+        allow: Resource categories or URL patterns the pages must not block
+
+    Returns:
+        dict: name -> rendered result (e.g. page HTML), or None if rendering that page failed
+    """
+    results = {}
+    driver = setup_selenium_driver(user_agent, profile=profile, allow=allow)
+    try:
+        logger.info(f"Warming up browser session on {origin}")
+        driver.get(origin)
+        time.sleep(warmup_seconds)
+
+        for name, render in renderers.items():
+            try:
+                cap_timeout(0)  # Stop rendering once the run deadline has passed
+                results[name] = render(driver)
+            except Exception as e:
+                logger.error(f"Failed to render {name}: {e}")
+                results[name] = None
+    finally:
+        driver.quit()
+    return results
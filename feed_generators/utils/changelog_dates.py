@@ -0,0 +1,171 @@
+"""Find when each ``## x.y.z`` header first appeared in a changelog's git history.
+
+Changelogs like Claude Code's CHANGELOG.md carry no dates, so the date of the
+commit that introduced a version header is used as its publish date. Dates are
+cached permanently in cache/, so every version is resolved exactly once.
+
+Two backends are supported:
+
+- a local clone (``git log -G``), used when a clone path is given;
+- the GitHub commits API for the file. New versions are added at the top of
+  the file, so "version v exists at commit c" is the same as "the topmost
+  version at c is >= v". Only the first few KB of the file at each commit are
+  needed to read the topmost version, and a binary search over the file's
+  commits finds the first commit where it is reached.
+"""
+
+import logging
+import os
+import re
+import subprocess
+from datetime import datetime
+
+import pytz
+import requests
+
+from utils.fetch import request_with_retries
+from utils.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+VERSION_HEADER_PATTERN = re.compile(r"^## (\d+(?:\.\d+)+)\s*$", re.M)
+# Bytes of the file read at each commit to find its topmost version
+HEAD_BYTES = 8192
+# Raw file lookups allowed per run; unresolved versions are picked up next run
+MAX_LOOKUPS = 60
+
+
+def version_key(version):
+    """Turn "1.0.71" into (1, 0, 71) for comparisons."""
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+def _github_headers():
+    headers = {"Accept": "application/vnd.github+json"}
+    if os.environ.get("GITHUB_TOKEN"):
+        headers["Authorization"] = f"Bearer {os.environ['GITHUB_TOKEN']}"
+    return headers
+
+
+def iter_commit_pages(repo, path, session):
+    """Yield pages of (sha, committer date) for the commits touching a file, newest first."""
+    page = 1
+    while True:
+        response = request_with_retries(
+            f"https://api.github.com/repos/{repo}/commits",
+            session=session,
+            params={"path": path, "per_page": 100, "page": page},
+            headers=_github_headers(),
+        )
+        commits = response.json()
+        if not commits:
+            return
+        yield [(commit["sha"], commit["commit"]["committer"]["date"]) for commit in commits]
+        page += 1
+
+
+def resolve_with_github(versions, repo, path, max_lookups=MAX_LOOKUPS):
+    """Resolve version dates through the GitHub API.
+
+    Returns:
+        dict: version -> ISO date for the versions that could be resolved
+    """
+    session = requests.Session()
+    top_versions = {}
+
+    def top_version_at(sha):
+        # Memoized: the topmost version header of the file at a commit
+        if sha not in top_versions:
+            if len(top_versions) >= max_lookups:
+                raise LookupError("lookup budget exhausted")
+            response = request_with_retries(
+                f"https://raw.githubusercontent.com/{repo}/{sha}/{path}",
+                session=session,
+                headers={"Range": f"bytes=0-{HEAD_BYTES - 1}"},
+            )
+            match = VERSION_HEADER_PATTERN.search(response.text)
+            top_versions[sha] = version_key(match.group(1)) if match else ()
+        return top_versions[sha]
+
+    # Newest first, so the versions at the top of the feed are resolved first
+    pending = sorted(versions, key=version_key, reverse=True)
+    oldest_needed = version_key(pending[-1])
+
+    resolved = {}
+    try:
+        # Stop paging once a page reaches back before every pending version
+        commits = []
+        for page in iter_commit_pages(repo, path, session):
+            commits.extend(page)
+            if top_version_at(page[-1][0]) < oldest_needed:
+                break
+        # Oldest first for the binary search
+        commits.reverse()
+
+        for version in pending:
+            wanted = version_key(version)
+            low, high = 0, len(commits)
+            while low < high:
+                mid = (low + high) // 2
+                if top_version_at(commits[mid][0]) >= wanted:
+                    high = mid
+                else:
+                    low = mid + 1
+            if low < len(commits):
+                resolved[version] = commits[low][1]
+    except LookupError:
+        logger.info(f"Resolved {len(resolved)} version dates, the rest will be resolved next run")
+    return resolved
+
+
+def resolve_with_clone(versions, clone_path, path):
+    """Resolve version dates with ``git log`` in a local clone."""
+    resolved = {}
+    for version in versions:
+        result = subprocess.run(
+            [
+                "git", "-C", str(clone_path), "log", "--reverse", "--format=%cI",
+                "-G", f"^## {re.escape(version)}$", "--", path,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        first_line = result.stdout.split("\n", 1)[0].strip()
+        if first_line:
+            resolved[version] = first_line
+    return resolved
+
+
+def resolve_version_dates(versions, repo, path, state_name, clone_path=None):
+    """Return publish dates for changelog versions, resolving only unknown ones.
+
+    Args:
+        versions: Version strings as they appear in the ``## x.y.z`` headers
+        repo: GitHub "owner/name" of the repository holding the changelog
+        path: Path of the changelog inside the repository
+        state_name: Name of the permanent cache in cache/
+        clone_path: Optional local clone to query instead of the GitHub API
+
+    Returns:
+        dict: version -> aware UTC datetime
+    """
+    known = load_state(state_name, {}) or {}
+    unresolved = [v for v in versions if v not in known and version_key(v)]
+
+    if unresolved:
+        logger.info(f"Resolving dates for {len(unresolved)} changelog versions")
+        try:
+            if clone_path:
+                known.update(resolve_with_clone(unresolved, clone_path, path))
+            else:
+                known.update(resolve_with_github(unresolved, repo, path))
+            save_state(state_name, known)
+        except (requests.RequestException, subprocess.CalledProcessError) as e:
+            logger.warning(f"Could not resolve changelog version dates: {e}")
+
+    return {
+        version: datetime.fromisoformat(known[version].replace("Z", "+00:00")).astimezone(pytz.UTC)
+        for version in versions
+        if version in known
+    }
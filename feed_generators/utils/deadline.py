@@ -0,0 +1,34 @@
+"""Cooperative run deadlines handed down by run_all_feeds.py.
+
+The orchestrator sets ``FEED_DEADLINE`` (a Unix timestamp) for each script it
+starts. Network and browser waits cap their timeouts to the time that is left,
+and give up early once the deadline has passed, so a script winds down on its
+own before the orchestrator has to kill it.
+"""
+
+import os
+import time
+
+DEADLINE_ENV = "FEED_DEADLINE"
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a script runs past the deadline set by the orchestrator."""
+
+
+def remaining_time():
+    """Seconds left until the deadline, or None if no deadline is set."""
+    deadline = os.environ.get(DEADLINE_ENV)
+    if not deadline:
+        return None
+    return float(deadline) - time.time()
+
+
+def cap_timeout(timeout):
+    """Cap a timeout to the time left, raising DeadlineExceeded once it has run out."""
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceeded("Run deadline exceeded")
+    return min(timeout, remaining)
@@ -0,0 +1,326 @@
+"""Extract listing data that sites embed directly in their HTML.
+
+Next.js pages ship their data in ``script#__NEXT_DATA__`` (pages router) or in
+``self.__next_f.push`` RSC chunks (app router), and many blogs add JSON-LD for
+search engines. Reading those over plain HTTP is far cheaper than rendering the
+page in a browser, so generators try this first and only fall back to Selenium
+when nothing usable is found.
+"""
+
+import json
+import logging
+import re
+from datetime import datetime
+from html.parser import HTMLParser
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+NEXT_DATA_PATTERN = re.compile(
+    r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.S
+)
+RSC_PUSH_PATTERN = re.compile(
+    r'self\.__next_f\.push\(\[\s*\d+\s*,\s*("[^"\\]*(?:\\.[^"\\]*)*")\s*\]\)', re.S
+)
+JSON_LD_PATTERN = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.S | re.I,
+)
+FLIGHT_ROW_PATTERN = re.compile(r"([0-9a-f]+):([A-Z]*)")
+FLIGHT_TEXT_LENGTH_PATTERN = re.compile(r"([0-9a-f]+),")
+
+TITLE_KEYS = ("title", "headline", "name")
+DATE_KEYS = (
+    "publishedOn",
+    "publishedAt",
+    "datePublished",
+    "publicationDate",
+    "publishDate",
+    "date",
+)
+DESCRIPTION_KEYS = ("summary", "description", "excerpt", "subtitle")
+URL_KEYS = ("url", "href", "link")
+# Fewer embedded records than this are likely a few featured cards, not the listing
+MIN_RECORDS = 10
+
+
+def extract_next_data(html_content):
+    """Return the decoded ``__NEXT_DATA__`` JSON, or None if the page has none."""
+    match = NEXT_DATA_PATTERN.search(html_content)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except json.JSONDecodeError as e:
+        logger.warning(f"Failed to decode __NEXT_DATA__: {e}")
+        return None
+
+
+def extract_rsc_payload(html_content):
+    """Concatenate and unescape all ``self.__next_f.push`` string chunks."""
+    chunks = []
+    for match in RSC_PUSH_PATTERN.finditer(html_content):
+        try:
+            chunks.append(json.loads(match.group(1)))
+        except json.JSONDecodeError:
+            continue
+    return "".join(chunks)
+
+
+def iter_flight_rows(payload):
+    """Yield ``(row id, value)`` for each row of an RSC flight payload in one pass.
+
+    JSON rows (``<id>:<json>``, optionally tagged like ``<id>:I[...]``) are
+    decoded in place with ``raw_decode``, so a row is never copied or split on
+    newlines. Text rows (``<id>:T<hex byte length>,<text>``) yield the text as a
+    string. Rows that cannot be decoded are skipped up to the next newline.
+    """
+    decoder = json.JSONDecoder()
+    position = 0
+    length = len(payload)
+    while position < length:
+        match = FLIGHT_ROW_PATTERN.match(payload, position)
+        if match:
+            row_id, tag = match.groups()
+            position = match.end()
+            if tag == "T":
+                size = FLIGHT_TEXT_LENGTH_PATTERN.match(payload, position)
+                if size:
+                    start = size.end()
+                    byte_length = int(size.group(1), 16)
+                    # The length counts UTF-8 bytes; never more characters than bytes
+                    text = payload[start:start + byte_length].encode("utf-8")[:byte_length]
+                    text = text.decode("utf-8", errors="ignore")
+                    yield row_id, text
+                    position = start + len(text)
+                    continue
+            else:
+                try:
+                    value, position = decoder.raw_decode(payload, position)
+                except json.JSONDecodeError:
+                    pass
+                else:
+                    yield row_id, value
+                    if payload.startswith("\n", position):
+                        position += 1
+                    continue
+
+        newline = payload.find("\n", position)
+        if newline == -1:
+            break
+        position = newline + 1
+
+
+def iter_rsc_values(payload):
+    """Yield the decoded value of each row in an RSC payload."""
+    for _, value in iter_flight_rows(payload):
+        yield value
+
+
+def extract_json_ld(html_content):
+    """Return all JSON-LD blocks found in the page."""
+    blocks = []
+    for match in JSON_LD_PATTERN.finditer(html_content):
+        try:
+            blocks.append(json.loads(match.group(1)))
+        except json.JSONDecodeError:
+            continue
+    return blocks
+
+
+def iter_dicts(value):
+    """Yield every dict nested anywhere inside a decoded JSON value."""
+    stack = [value]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+
+def extract_records(html_content, is_record, min_records=MIN_RECORDS):
+    """Find listing records in the page's embedded data.
+
+    Every source (``__NEXT_DATA__``, RSC chunks, JSON-LD) is searched and the
+    matches of the source with the most records are returned. When even that
+    source has fewer than ``min_records``, nothing is returned so the caller
+    falls back to rendering the page.
+
+    Args:
+        html_content: Raw HTML of the listing page
+        is_record: Predicate deciding whether a decoded dict is a listing record
+        min_records: Fewest records accepted as the page's listing
+    """
+    sources = (
+        ("__NEXT_DATA__", lambda: [extract_next_data(html_content)]),
+        ("RSC payload", lambda: iter_rsc_values(extract_rsc_payload(html_content))),
+        ("JSON-LD", lambda: extract_json_ld(html_content)),
+    )
+    best_name, best_records = None, []
+    for name, load in sources:
+        records = [
+            record
+            for value in load()
+            if value is not None
+            for record in iter_dicts(value)
+            if is_record(record)
+        ]
+        if len(records) > len(best_records):
+            best_name, best_records = name, records
+
+    if not best_records:
+        return []
+    if len(best_records) < min_records:
+        logger.warning(
+            f"Only {len(best_records)} embedded records in {best_name} "
+            f"(need {min_records}), ignoring the embedded data"
+        )
+        return []
+    logger.info(f"Found {len(best_records)} embedded records in {best_name}")
+    return best_records
+
+
+def _first_value(record, keys):
+    for key in keys:
+        value = record.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def get_slug(record):
+    """Return a record's slug, handling Sanity-style ``{"current": ...}`` slugs."""
+    slug = record.get("slug")
+    if isinstance(slug, dict):
+        slug = slug.get("current")
+    return slug.strip("/") if isinstance(slug, str) and slug.strip("/") else None
+
+
+def parse_iso_date(date_text):
+    """Parse an ISO 8601 date or datetime string into an aware UTC datetime."""
+    if not date_text:
+        return None
+    try:
+        date = datetime.fromisoformat(date_text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if date.tzinfo is None:
+        return date.replace(tzinfo=pytz.UTC)
+    return date.astimezone(pytz.UTC)
+
+
+def has_article_fields(record):
+    """Default record predicate: a title, a slug or URL, and a date."""
+    return bool(
+        _first_value(record, TITLE_KEYS)
+        and (get_slug(record) or _first_value(record, URL_KEYS))
+        and _first_value(record, DATE_KEYS)
+    )
+
+
+def normalize_record(record, link_prefix):
+    """Map an embedded record onto the article dict used by the generators.
+
+    Args:
+        record: Decoded dict describing a single post
+        link_prefix: URL prefix joined with the slug when no absolute URL is present
+    """
+    url = _first_value(record, URL_KEYS)
+    if url and url.startswith("http"):
+        link = url
+    elif get_slug(record):
+        link = f"{link_prefix.rstrip('/')}/{get_slug(record)}"
+    else:
+        return None
+
+    title = _first_value(record, TITLE_KEYS)
+    if not title:
+        return None
+
+    category = None
+    subjects = record.get("subjects") or record.get("tags") or record.get("categories")
+    if isinstance(subjects, list) and subjects:
+        first = subjects[0]
+        if isinstance(first, dict):
+            category = _first_value(first, ("label", "title", "name"))
+        elif isinstance(first, str):
+            category = first
+
+    return {
+        "title": " ".join(title.split()),
+        "link": link,
+        "date": parse_iso_date(_first_value(record, DATE_KEYS)),
+        "category": category,
+        "description": _first_value(record, DESCRIPTION_KEYS) or title,
+    }
+
+
+def extract_articles(html_content, link_prefix, is_record=has_article_fields, min_records=MIN_RECORDS):
+    """Extract de-duplicated article dicts from a page's embedded data."""
+    articles = []
+    seen_links = set()
+    for record in extract_records(html_content, is_record, min_records):
+        article = normalize_record(record, link_prefix)
+        if not article or article["link"] in seen_links:
+            continue
+        seen_links.add(article["link"])
+        articles.append(article)
+    return articles
+
+
+class _HeadMetadataParser(HTMLParser):
+    """Collect the <title> and <meta> tags of a page head."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.title = ""
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta":
+            key = attrs.get("property") or attrs.get("name") or attrs.get("itemprop")
+            if key and attrs.get("content") and key not in self.meta:
+                self.meta[key] = attrs["content"].strip()
+        elif tag == "title":
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+
+def extract_page_metadata(html_content):
+    """Extract title, description and publish date of an article page.
+
+    Uses OpenGraph/``article:*`` meta tags and falls back to JSON-LD, without
+    building a DOM for the page body.
+    """
+    parser = _HeadMetadataParser()
+    head_end = html_content.find("</head>")
+    parser.feed(html_content[: head_end + len("</head>")] if head_end != -1 else html_content)
+    meta = parser.meta
+
+    metadata = {
+        "title": meta.get("og:title") or meta.get("twitter:title") or parser.title.strip() or None,
+        "description": meta.get("og:description") or meta.get("description"),
+        "date": parse_iso_date(
+            meta.get("article:published_time") or meta.get("datePublished") or meta.get("date")
+        ),
+    }
+
+    if not metadata["date"] or not metadata["title"]:
+        for block in extract_json_ld(html_content):
+            for record in iter_dicts(block):
+                metadata["title"] = metadata["title"] or _first_value(record, ("headline",))
+                metadata["date"] = metadata["date"] or parse_iso_date(record.get("datePublished"))
+
+    return metadata
@@ -0,0 +1,247 @@
+"""Fill feed items with article text fetched from the article pages.
+
+Many listing pages only give a title, so feeds fall back to using the title as
+description. enrich_articles fetches each article page once, extracts its main
+text with a small readability-style scorer, and caches the result in
+``cache/enriched_<source>.json`` keyed by URL (with the page's ETag), so later
+runs only fetch articles they have not seen. Articles get a summary as
+``description`` (when they had none of their own) and the extracted HTML as
+``content``, which generate_rss_feed writes to ``content:encoded``.
+
+Set ``SKIP_ENRICHMENT=1`` to leave articles as they are.
+"""
+
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import datetime, timedelta
+from html import escape
+
+import pytz
+import requests
+from bs4 import BeautifulSoup
+
+from utils.deadline import DeadlineExceeded
+from utils.fetch import DEFAULT_HEADERS, request_with_retries
+from utils.items import FeedItem
+from utils.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+# Article pages fetched at once; utils.fetch keeps them within each host's rate limit
+ENRICH_WORKERS = 6
+# New articles fetched per run, so a new source catches up over a few runs
+MAX_NEW_PER_RUN = 40
+# Cached articles are revalidated (If-None-Match) after this long
+REFRESH_AFTER = timedelta(days=30)
+# Cached articles not seen in a feed for this long are dropped
+FORGET_AFTER = timedelta(days=90)
+SUMMARY_LENGTH = 300
+MAX_CONTENT_LENGTH = 20000
+
+# Elements that never hold the article text
+NOISE_TAGS = ["script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form", "iframe", "button"]
+NOISE_HINTS = re.compile(r"comment|footer|header|menu|nav|related|share|social|sidebar|subscribe|newsletter|cookie|banner", re.I)
+CONTENT_HINTS = re.compile(r"article|body|content|entry|main|post|prose|story|text", re.I)
+# Block elements kept in the extracted content
+CONTENT_TAGS = ["p", "h2", "h3", "h4", "li", "blockquote", "pre"]
+
+
+def get_meta_description(soup):
+    """Return the page's og:description or description meta content."""
+    for attrs in ({"property": "og:description"}, {"name": "description"}, {"name": "twitter:description"}):
+        meta = soup.find("meta", attrs=attrs)
+        if meta and meta.get("content", "").strip():
+            return meta["content"].strip()
+    return None
+
+
+def score_container(container):
+    """Score an element as the article container: long, comma-rich paragraphs, few links."""
+    paragraphs = container.find_all("p")
+    text_length = sum(len(p.get_text(strip=True)) for p in paragraphs)
+    if not text_length:
+        return 0
+    link_length = sum(len(a.get_text(strip=True)) for a in container.find_all("a"))
+    commas = sum(p.get_text().count(",") for p in paragraphs)
+    score = text_length + 10 * commas
+    hints = " ".join(container.get("class", [])) + " " + (container.get("id") or "")
+    if CONTENT_HINTS.search(hints):
+        score *= 1.25
+    if NOISE_HINTS.search(hints):
+        score *= 0.5
+    link_density = link_length / max(1, len(container.get_text(strip=True)))
+    return score * (1 - link_density)
+
+
+def extract_article(html):
+    """Extract the main text of an article page.
+
+    Returns:
+        dict: ``summary`` (meta description or leading text) and ``content``
+        (simple HTML of the article's paragraphs), either possibly empty
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    meta_description = get_meta_description(soup)
+
+    for tag in soup.find_all(NOISE_TAGS):
+        tag.decompose()
+
+    # Candidates are the parents (and grandparents) of paragraphs, as in readability
+    candidates = {}
+    for paragraph in soup.find_all("p"):
+        for candidate in (paragraph.parent, paragraph.parent.parent if paragraph.parent else None):
+            if candidate is not None and candidate.name not in ("[document]", "html"):
+                candidates[id(candidate)] = candidate
+    best = max(candidates.values(), key=score_container, default=None)
+
+    blocks = []
+    if best is not None:
+        length = 0
+        for block in best.find_all(CONTENT_TAGS):
+            # Nested blocks (e.g. <p> inside <li>) are covered by their parent
+            if block.find_parent(CONTENT_TAGS):
+                continue
+            text = block.get_text(" ", strip=True)
+            if not text:
+                continue
+            element = f"<{block.name}>{escape(text)}</{block.name}>"
+            if block.name == "li":
+                # Consecutive list items share one list
+                if blocks and blocks[-1].endswith("</li></ul>"):
+                    element = blocks.pop()[:-len("</ul>")] + element + "</ul>"
+                else:
+                    element = f"<ul>{element}</ul>"
+            blocks.append(element)
+            length += len(text)
+            if length >= MAX_CONTENT_LENGTH:
+                break
+
+    summary = meta_description
+    if not summary and best is not None:
+        first_paragraph = next((p.get_text(" ", strip=True) for p in best.find_all("p") if p.get_text(strip=True)), "")
+        summary = first_paragraph
+    if summary and len(summary) > SUMMARY_LENGTH:
+        summary = summary[:SUMMARY_LENGTH].rsplit(" ", 1)[0] + "..."
+
+    return {"summary": summary or "", "content": "".join(blocks)}
+
+
+def fetch_article(url, etag=None):
+    """Fetch and extract one article, using its ETag to skip unchanged pages.
+
+    Returns:
+        dict or None: Extracted fields plus ``etag``, or None if unchanged (304)
+    """
+    headers = None
+    if etag:
+        headers = {**DEFAULT_HEADERS, "If-None-Match": etag}
+    response = request_with_retries(url, headers=headers, timeout=15)
+    if response.status_code == 304:
+        return None
+    extracted = extract_article(response.text)
+    extracted["etag"] = response.headers.get("ETag")
+    return extracted
+
+
+def enrich_articles(articles, source, link_key="link", title_key="title"):
+    """Add fetched summaries and content to articles, fetching only unseen ones.
+
+    Args:
+        articles: FeedItems or article dicts; dicts are updated in place
+        source: Name of the cache (usually the feed name)
+        link_key: Key of the article URL in article dicts
+        title_key: Key of the article title in article dicts; a description
+            equal to the title (or missing) is replaced by the fetched summary
+
+    Returns:
+        list: The articles, with enriched FeedItems replaced by new ones
+    """
+    if os.environ.get("SKIP_ENRICHMENT") == "1" or not articles:
+        return articles
+
+    state_name = f"enriched_{source}"
+    cache = load_state(state_name, {}) or {}
+    now = datetime.now(pytz.UTC)
+
+    def needs_fetch(url):
+        entry = cache.get(url)
+        return entry is None or now - datetime.fromisoformat(entry["fetched"]) > REFRESH_AFTER
+
+    def link_of(article):
+        return article.link if isinstance(article, FeedItem) else article.get(link_key)
+
+    urls = list(dict.fromkeys(link_of(article) for article in articles if link_of(article)))
+    stale = [url for url in urls if needs_fetch(url)]
+    new = [url for url in stale if url not in cache][:MAX_NEW_PER_RUN]
+    to_fetch = new + [url for url in stale if url in cache]
+
+    def fetch(url):
+        try:
+            return url, fetch_article(url, (cache.get(url) or {}).get("etag"))
+        except requests.HTTPError as e:
+            logger.warning(f"Could not enrich {url}: {e}")
+            # Pages that are gone or forbidden are not asked for again until the refresh
+            if e.response is not None and e.response.status_code < 500:
+                return url, {}
+            return url, False
+        except (requests.RequestException, DeadlineExceeded) as e:
+            logger.warning(f"Could not enrich {url}: {e}")
+            return url, False
+
+    if to_fetch:
+        logger.info(f"Fetching {len(to_fetch)} article pages to enrich {source}")
+        with ThreadPoolExecutor(max_workers=ENRICH_WORKERS) as executor:
+            for url, extracted in executor.map(fetch, to_fetch):
+                if extracted is False:
+                    continue
+                entry = cache.get(url, {})
+                if extracted is not None:
+                    entry.update(extracted)
+                entry["fetched"] = now.isoformat()
+                cache[url] = entry
+
+    # Remember which cached articles are still in the feed, and forget old ones
+    for url in urls:
+        if url in cache:
+            cache[url]["seen"] = now.date().isoformat()
+    cutoff = (now - FORGET_AFTER).date().isoformat()
+    cache = {url: entry for url, entry in cache.items() if entry.get("seen", cutoff) >= cutoff}
+    save_state(state_name, cache)
+
+    enriched = []
+    for article in articles:
+        entry = cache.get(link_of(article))
+        if not entry:
+            enriched.append(article)
+            continue
+        updates = {}
+        if isinstance(article, FeedItem):
+            description, title = article.description, article.title
+        else:
+            description, title = article.get("description"), article.get(title_key)
+        if entry.get("summary") and (not description or description == title):
+            updates["description"] = entry["summary"]
+        if entry.get("content"):
+            updates["content"] = entry["content"]
+        if isinstance(article, FeedItem):
+            article = replace(article, **updates)
+        else:
+            article.update(updates)
+        enriched.append(article)
+    return enriched
+
+
+def enrichment_pending(articles, source, link_key="link"):
+    """Count articles that enrich_articles has not fetched yet (or failed to fetch).
+
+    Generators that skip unchanged listings use this to keep regenerating
+    until every article is enriched, so failed fetches are retried.
+    """
+    if os.environ.get("SKIP_ENRICHMENT") == "1":
+        return 0
+    cache = load_state(f"enriched_{source}", {}) or {}
+    links = {article.link if isinstance(article, FeedItem) else article.get(link_key) for article in articles}
+    return len({link for link in links if link and link not in cache})
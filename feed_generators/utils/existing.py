@@ -0,0 +1,58 @@
+"""Read back the items of a previously generated feed and merge new ones into it.
+
+Listing pages and their embedded data often only show the newest posts, so
+generators that build a feed from them keep the older items of the feed they
+wrote last time instead of dropping them.
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+
+def load_feed_articles(feed_path, default_category=None):
+    """Read the items of an existing RSS feed as article dicts.
+
+    Args:
+        feed_path: Path of the feed_<name>.xml file
+        default_category: Category for items that have none
+
+    Returns:
+        list: Article dicts (title, link, date, category, description); empty if
+        the feed does not exist or cannot be parsed
+    """
+    articles = []
+    try:
+        if not feed_path.exists():
+            return articles
+        root = ET.parse(feed_path).getroot()
+        # RSS 2.0: items under channel/item
+        for item in root.findall("./channel/item"):
+            link = (item.findtext("link") or "").strip()
+            pub_date = item.findtext("pubDate")
+            if not link or not pub_date:
+                continue
+            title = (item.findtext("title") or "").strip()
+            articles.append(
+                {
+                    "title": title,
+                    "link": link,
+                    "date": parsedate_to_datetime(pub_date).astimezone(pytz.UTC),
+                    "category": (item.findtext("category") or default_category or "").strip() or None,
+                    "description": (item.findtext("description") or title).strip(),
+                }
+            )
+    except Exception as e:
+        logger.warning(f"Failed to parse existing feed: {str(e)}")
+    return articles
+
+
+def merge_articles(articles, existing_articles):
+    """Return the new articles followed by the existing ones they do not replace."""
+    seen_links = {article["link"] for article in articles}
+    kept = [article for article in existing_articles if article["link"] not in seen_links]
+    return articles + kept
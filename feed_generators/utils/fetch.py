@@ -0,0 +1,182 @@
+"""Plain HTTP fetching shared by the feed generators.
+
+Requests are retried on timeouts, connection errors and 429/5xx responses with
+jittered exponential backoff, honoring ``Retry-After``. Each origin gets a
+retry budget per run so a struggling site is not retried indefinitely, and a
+circuit breaker persisted in cache/ stops requests to an origin after repeated
+failures until a cooldown has passed. Every attempt waits for its host's rate
+limit (see utils.ratelimit), so callers may fetch from many threads at once.
+"""
+
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import pytz
+import requests
+
+from utils.deadline import cap_timeout, remaining_time
+from utils.ratelimit import wait_for_slot
+from utils.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+# Longest Retry-After we are willing to wait for; longer ones fail the request
+MAX_RETRY_AFTER = 60.0
+# Retries allowed per origin in one run, shared by all requests to that origin
+RETRY_BUDGET_PER_ORIGIN = 6
+# Consecutive failed requests before the breaker opens, and how long it stays open
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = timedelta(hours=1)
+BREAKER_STATE = "circuit_breakers"
+
+_lock = threading.Lock()
+_retries_used = {}
+_breakers = None
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request to an origin whose breaker is open."""
+
+
+def get_origin(url):
+    """Return the scheme://host part of a URL."""
+    parts = urlparse(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _load_breakers():
+    global _breakers
+    if _breakers is None:
+        _breakers = load_state(BREAKER_STATE, {}) or {}
+    return _breakers
+
+
+def check_breaker(origin):
+    """Raise CircuitOpenError if the origin's breaker is open."""
+    with _lock:
+        breaker = _load_breakers().get(origin)
+    if breaker and breaker.get("open_until"):
+        open_until = datetime.fromisoformat(breaker["open_until"])
+        if datetime.now(pytz.UTC) < open_until:
+            raise CircuitOpenError(f"Circuit open for {origin} until {open_until} after repeated failures")
+
+
+def record_result(origin, success):
+    """Update the origin's breaker after a request finished or finally failed."""
+    with _lock:
+        breakers = _load_breakers()
+        breaker = breakers.get(origin, {"failures": 0})
+        if success:
+            if not breaker["failures"]:
+                return
+            breakers.pop(origin, None)
+        else:
+            breaker["failures"] += 1
+            if breaker["failures"] >= BREAKER_THRESHOLD:
+                breaker["open_until"] = (datetime.now(pytz.UTC) + BREAKER_COOLDOWN).isoformat()
+                logger.error(f"Opening circuit for {origin} after {breaker['failures']} failed requests")
+            breakers[origin] = breaker
+        save_state(BREAKER_STATE, breakers)
+
+
+def _take_retry(origin):
+    with _lock:
+        used = _retries_used.get(origin, 0)
+        if used >= RETRY_BUDGET_PER_ORIGIN:
+            return False
+        _retries_used[origin] = used + 1
+        return True
+
+
+def get_retry_after(response):
+    """Return the delay requested by a Retry-After header in seconds, or None."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(pytz.UTC)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def get_backoff(attempt, response=None):
+    """Delay before retry ``attempt`` (1-based): Retry-After if given, else full jitter."""
+    retry_after = get_retry_after(response)
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def request_with_retries(url, session=None, headers=None, timeout=10, **kwargs):
+    """GET a URL with rate limiting, retries, per-origin retry budget and circuit breaker.
+
+    Args:
+        url: URL to fetch
+        session: Optional requests.Session to send the request with
+        headers: Request headers (default: DEFAULT_HEADERS)
+        timeout: Per-attempt timeout in seconds, capped to the run deadline
+        **kwargs: Passed on to ``get`` (e.g. params, stream)
+
+    Returns:
+        requests.Response: The successful (or 304 Not Modified) response
+    """
+    origin = get_origin(url)
+    check_breaker(origin)
+    client = session or requests
+    if headers is None and session is None:
+        headers = DEFAULT_HEADERS
+
+    attempt = 0
+    while True:
+        attempt += 1
+        response = None
+        wait_for_slot(url)
+        try:
+            response = client.get(url, headers=headers, timeout=cap_timeout(timeout), **kwargs)
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                record_result(origin, True)
+                return response
+            error = requests.HTTPError(f"{response.status_code} Error for url: {url}", response=response)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error = e
+        except requests.HTTPError:
+            # Other 4xx responses will not get better by retrying
+            record_result(origin, True)
+            raise
+
+        delay = get_backoff(attempt, response)
+        remaining = remaining_time()
+        if (
+            attempt >= MAX_ATTEMPTS
+            or delay > MAX_RETRY_AFTER
+            or (remaining is not None and delay >= remaining)
+            or not _take_retry(origin)
+        ):
+            record_result(origin, False)
+            raise error
+
+        logger.warning(f"Request to {url} failed ({error}), retrying in {delay:.1f}s")
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+
+
+def fetch_html(url, headers=None, timeout=10, session=None):
+    """Fetch a page over plain HTTP and return its decoded text."""
+    return request_with_retries(url, session=session, headers=headers, timeout=timeout).text
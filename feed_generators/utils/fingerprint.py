@@ -0,0 +1,123 @@
+"""Skip regenerating a feed when its listing page has not meaningfully changed.
+
+Many listing pages send no ETag or Last-Modified, yet the markup the parsers
+read rarely changes between hourly runs. The fetched HTML is normalized
+(scripts, styles, comments and volatile tokens removed, whitespace collapsed)
+and hashed together with the generator script, so an edit to the parser still
+regenerates the feed. When the fingerprint matches the last successful run and
+the feed file exists, parsing and feed generation are skipped; generators do
+this through generate_unless_unchanged.
+
+Set ``FORCE_REGENERATE=1`` to regenerate every feed regardless.
+"""
+
+import hashlib
+import logging
+import os
+import re
+
+from utils.health import get_script_hash
+from utils.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "content_fingerprints"
+
+# Markup no parser reads and that often differs on every response: inline and
+# external scripts (build IDs, nonces, timestamps), styles, comments, <meta>/<link>
+VOLATILE_BLOCKS = re.compile(
+    r"<script\b.*?</script\s*>|<style\b.*?</style\s*>|<noscript\b.*?</noscript\s*>"
+    r"|<!--.*?-->|<(?:meta|link)\b[^>]*>",
+    re.I | re.S,
+)
+# Attributes carrying per-response tokens
+VOLATILE_ATTRIBUTES = re.compile(
+    r"""\s(?:nonce|integrity|data-csrf[\w-]*|data-cf-[\w-]+)=(?:"[^"]*"|'[^']*')"""
+    r"""|(\sname=["']_?csrf[\w-]*["'][^>]*?\svalue=)(?:"[^"]*"|'[^']*')""",
+    re.I,
+)
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_html(html, rules=()):
+    """Strip volatile markup from a page so that only meaningful changes remain.
+
+    Args:
+        html: Page HTML as fetched
+        rules: Source-specific (pattern, replacement) pairs applied after the
+            common rules
+    """
+    html = VOLATILE_BLOCKS.sub("", html)
+    html = VOLATILE_ATTRIBUTES.sub(lambda m: m.group(1) + '""' if m.group(1) else "", html)
+    for pattern, replacement in rules:
+        html = re.sub(pattern, replacement, html)
+    return WHITESPACE.sub(" ", html).strip()
+
+
+def get_fingerprint(html, script_path, rules=()):
+    """Hash the normalized page together with the generator script."""
+    digest = hashlib.sha256()
+    digest.update((get_script_hash(script_path) or "").encode())
+    digest.update(normalize_html(html, rules).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def content_unchanged(source, html, script_path, feed_path, rules=()):
+    """Check a fetched listing page against the last successful run.
+
+    Args:
+        source: Name the fingerprint is stored under (usually the feed name)
+        html: Fetched listing page HTML
+        script_path: Path of the generator script (pass ``__file__``)
+        feed_path: Feed file the run would write; a missing feed is always regenerated
+        rules: Source-specific normalization rules, see normalize_html
+
+    Returns:
+        tuple: (unchanged, fingerprint); pass the fingerprint to
+        remember_fingerprint once the feed has been written
+    """
+    fingerprint = get_fingerprint(html, script_path, rules)
+    if os.environ.get("FORCE_REGENERATE"):
+        return False, fingerprint
+
+    known = load_state(STATE_NAME, {}) or {}
+    unchanged = known.get(source) == fingerprint and os.path.exists(feed_path)
+    if unchanged:
+        logger.info(f"Content of {source} unchanged since last run, skipping feed generation")
+    return unchanged, fingerprint
+
+
+def remember_fingerprint(source, fingerprint):
+    """Store the fingerprint of a listing page whose feed was written successfully."""
+    known = load_state(STATE_NAME, {}) or {}
+    if known.get(source) != fingerprint:
+        known[source] = fingerprint
+        save_state(STATE_NAME, known)
+
+
+def generate_unless_unchanged(source, html, script_path, feed_path, generate, rules=()):
+    """Generate a feed from a listing page unless the page is unchanged.
+
+    Args:
+        source: Name the fingerprint is stored under (usually the feed name)
+        html: Fetched listing page HTML
+        script_path: Path of the generator script (pass ``__file__``)
+        feed_path: Feed file ``generate`` writes
+        generate: Callable that parses the page and writes the feed. Returns
+            True when the feed is complete, False when generation failed, or
+            None when the feed was written but should be generated again on the
+            next run even if the page does not change (e.g. while some articles
+            are not enriched yet)
+        rules: Source-specific normalization rules, see normalize_html
+
+    Returns:
+        bool: False only if ``generate`` failed
+    """
+    unchanged, fingerprint = content_unchanged(source, html, script_path, feed_path, rules)
+    if unchanged:
+        return True
+
+    result = generate()
+    if result:
+        remember_fingerprint(source, fingerprint)
+    return result is not False
@@ -0,0 +1,167 @@
+"""Detect when a source's page structure changes and back off while it is broken.
+
+After each run a generator records how many items it parsed and, optionally,
+how many elements its key selectors matched. A run with no items, an item count
+far below the usual one, or a key selector that suddenly matches nothing marks
+the source as broken, and so does a run that raised before recording anything
+(record_failure) or that run_all_feeds.py killed at its timeout. run_all_feeds.py
+then skips broken sources with an exponential backoff, so a redesigned or hung
+site stops costing fetch and Chrome time every hour. A source is retried early
+as soon as its script changes, and a healthy probe run clears the broken state.
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from statistics import median
+
+import pytz
+
+from utils.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "source_health"
+HISTORY_LENGTH = 20
+MIN_HISTORY = 3
+# A run is anomalous when it yields less than this fraction of the usual item count
+MIN_COUNT_RATIO = 0.25
+BACKOFF_BASE = timedelta(hours=1)
+BACKOFF_MAX = timedelta(hours=24)
+
+# Sources recorded by this process, so a failure after record_run is not counted twice
+_recorded_sources = set()
+
+
+def get_source_name(script_path):
+    """Name a source after its generator script (e.g. "xainews_blog")."""
+    return Path(script_path).stem
+
+
+def get_script_hash(script_path):
+    """Hash the generator script so edits to it can be detected."""
+    try:
+        return hashlib.sha256(Path(script_path).read_bytes()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
+def detect_anomaly(entry, item_count, selector_hits, error=None):
+    """Return a description of what looks broken, or None if the run looks healthy.
+
+    Args:
+        entry: Previously recorded health entry of the source
+        item_count: Number of items parsed in this run
+        selector_hits: Mapping of key selector to number of matched elements
+        error: Exception (or message) the run failed with, if any
+    """
+    if error is not None:
+        return f"run failed: {error}"
+
+    if item_count == 0:
+        return "no items parsed"
+
+    history = entry.get("counts", [])
+    if len(history) >= MIN_HISTORY:
+        usual = median(history)
+        if item_count < usual * MIN_COUNT_RATIO:
+            return f"item count dropped to {item_count} (usually {usual:g})"
+
+    previous_hits = entry.get("selectors", {})
+    for selector, hits in (selector_hits or {}).items():
+        if hits == 0 and previous_hits.get(selector, 0) > 0:
+            return f"selector {selector!r} no longer matches"
+
+    return None
+
+
+def record_run(script_path, item_count, selector_hits=None, error=None):
+    """Record the outcome of a generator run and update the source's health.
+
+    Args:
+        script_path: Path of the generator script (pass ``__file__``)
+        item_count: Number of items the run parsed
+        selector_hits: Optional mapping of key selector to number of matched
+            elements; when None (e.g. a run that did not parse the page), the
+            previously recorded selector history is kept
+        error: Exception (or message) the run failed with, if any
+
+    Returns:
+        bool: True if the run looked healthy
+    """
+    source = get_source_name(script_path)
+    _recorded_sources.add(source)
+    state = load_state(STATE_NAME, {}) or {}
+    entry = dict(state.get(source, {}))
+    now = datetime.now(pytz.UTC)
+
+    anomaly = detect_anomaly(entry, item_count, selector_hits, error)
+    if anomaly:
+        failures = entry.get("failures", 0) + 1
+        backoff = min(BACKOFF_BASE * 2 ** (failures - 1), BACKOFF_MAX)
+        entry.update(
+            {
+                "broken": True,
+                "reason": anomaly,
+                "failures": failures,
+                "retry_after": (now + backoff).isoformat(),
+                "script_hash": get_script_hash(script_path),
+            }
+        )
+        logger.error(f"Source {source} looks broken ({anomaly}); backing off for {backoff}")
+    else:
+        if entry.get("broken"):
+            logger.info(f"Source {source} is healthy again")
+        entry = {
+            "counts": (entry.get("counts", []) + [item_count])[-HISTORY_LENGTH:],
+            "selectors": dict(selector_hits) if selector_hits is not None else entry.get("selectors", {}),
+        }
+
+    # cache/ is committed after every run, so unchanged health is not rewritten
+    if state.get(source) != entry:
+        state[source] = entry
+        save_state(STATE_NAME, state)
+    return anomaly is None
+
+
+def record_failure(script_path, error):
+    """Record a run that failed before reporting its items (call from ``except``).
+
+    Does nothing if this process already recorded the run with record_run, so a
+    failure while writing the feed does not count twice.
+
+    Args:
+        script_path: Path of the generator script (pass ``__file__``)
+        error: Exception (or message) the run failed with
+    """
+    if get_source_name(script_path) in _recorded_sources:
+        return
+    record_run(script_path, 0, error=error)
+
+
+def should_skip(script_path):
+    """Return True if the source is broken and still inside its backoff window.
+
+    Set ``IGNORE_SOURCE_HEALTH=1`` to run every source regardless.
+    """
+    if os.environ.get("IGNORE_SOURCE_HEALTH"):
+        return False
+
+    source = get_source_name(script_path)
+    entry = (load_state(STATE_NAME, {}) or {}).get(source)
+    if not entry or not entry.get("broken"):
+        return False
+
+    if entry.get("script_hash") != get_script_hash(script_path):
+        logger.info(f"Script for broken source {source} changed, retrying it")
+        return False
+
+    retry_after = datetime.fromisoformat(entry["retry_after"])
+    if datetime.now(pytz.UTC) >= retry_after:
+        logger.info(f"Backoff for broken source {source} expired, probing it")
+        return False
+
+    logger.warning(f"Skipping broken source {source} until {retry_after} ({entry.get('reason')})")
+    return True
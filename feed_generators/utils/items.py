@@ -0,0 +1,105 @@
+"""A compact, normalized record for feed items.
+
+Generators used to pass items around as dicts with slightly different keys
+(``date``/``pub_date``, ``url``/``link``). FeedItem gives them one schema:
+it is frozen and slotted, so it is small and safe to share between threads and
+worker processes, compares and hashes by its GUID (the link unless set), and
+has a content hash that only changes when what a reader sees changes.
+
+``to_dict``/``from_dict`` convert to and from JSON-ready dicts for caches;
+``from_dict`` also accepts the old key names.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import Optional
+
+import pytz
+
+# Old item dict keys -> FeedItem fields
+KEY_ALIASES = {"url": "link", "pub_date": "date", "published": "date", "id": "guid"}
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class FeedItem:
+    """One feed item; equal to another item with the same GUID."""
+
+    title: str
+    link: str
+    date: Optional[datetime] = None
+    description: str = ""
+    category: Optional[str] = None
+    author: Optional[str] = None
+    content: Optional[str] = None
+    guid: Optional[str] = None
+
+    @property
+    def id(self):
+        """The item's GUID: ``guid`` if set, otherwise the link."""
+        return self.guid or self.link
+
+    def __eq__(self, other):
+        if not isinstance(other, FeedItem):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def content_hash(self):
+        """Stable hash of everything a reader sees, for change detection."""
+        data = json.dumps(self.to_dict(), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+    def to_dict(self):
+        """JSON-ready dict without empty fields; the date is an ISO 8601 string."""
+        data = {key: value for key, value in asdict(self).items() if value not in (None, "")}
+        if self.date is not None:
+            data["date"] = self.date.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an item from a cache or article dict, accepting the old key names."""
+        names = {field.name for field in fields(cls)}
+        values = {}
+        for key, value in data.items():
+            key = KEY_ALIASES.get(key, key)
+            if key in names and key not in values:
+                values[key] = value
+        values["date"] = parse_item_date(values.get("date"))
+        return cls(**values)
+
+
+def parse_item_date(value):
+    """Return a timezone-aware datetime from a datetime or ISO 8601 string (naive means UTC)."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=pytz.UTC)
+    return value
+
+
+def add_feed_entry(feed_generator, item):
+    """Add a FeedItem to a feedgen FeedGenerator and return the entry."""
+    fe = feed_generator.add_entry()
+    fe.title(item.title)
+    fe.link(href=item.link)
+    fe.description(item.description)
+    if item.date is not None:
+        fe.published(item.date)
+    if item.category:
+        fe.category(term=item.category)
+    if item.author:
+        fe.author({"name": item.author})
+    if item.content:
+        fe.content(item.content, type="CDATA")
+    fe.id(item.id)
+    return fe
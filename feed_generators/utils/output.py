@@ -0,0 +1,127 @@
+"""Write generated feeds to feeds/.
+
+feedgen builds the whole XML tree on every ``rss_file``/``rss_str`` call, and
+pretty-printing re-indents it. Here the feed is serialized once, compactly;
+the committed ``feed_<name>.xml`` is pretty-printed from that serialization so
+it stays diffable, and precompressed siblings for static hosting
+(``feed_<name>.xml.gz``, ``.br``) are made from the compact bytes.
+
+Environment:
+    FEED_PRETTY: set to 0 to write ``feed_<name>.xml`` compact as well
+    FEED_COMPRESS: comma-separated variants to write next to the XML
+        (``gz``, ``br``); ``br`` needs the optional ``brotli`` package
+    FEEDS_BASE_URL: URL the feeds directory is served from (default: the
+        ``feeds/`` directory of GITHUB_REPOSITORY, or agoramachina/rss-feeds,
+        on raw.githubusercontent.com)
+"""
+
+import gzip
+import logging
+import os
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Where the feeds directory is served from, for self links and archive links:
+# the repository the workflow runs in (GITHUB_REPOSITORY), or this one
+FEEDS_REPOSITORY = os.environ.get("GITHUB_REPOSITORY") or "agoramachina/rss-feeds"
+FEEDS_BASE_URL = os.environ.get(
+    "FEEDS_BASE_URL", f"https://raw.githubusercontent.com/{FEEDS_REPOSITORY}/main/feeds"
+)
+
+
+def get_compressed_variants(compact, variants):
+    """Return {suffix: bytes} for the requested precompressed variants."""
+    outputs = {}
+    for variant in variants:
+        if variant == "gz":
+            # mtime=0 keeps the bytes identical for identical feeds
+            outputs[".gz"] = gzip.compress(compact, compresslevel=9, mtime=0)
+        elif variant == "br":
+            if brotli is None:
+                logger.warning("brotli is not installed, skipping the .br variant")
+                continue
+            outputs[".br"] = brotli.compress(compact, mode=brotli.MODE_TEXT)
+        elif variant:
+            logger.warning(f"Unknown feed output variant: {variant}")
+    return outputs
+
+
+def write_file(path, data):
+    """Atomically replace ``path`` with ``data``."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def resolve_output_options(pretty=None, compress=None):
+    """Fill in the pretty/compress defaults from FEED_PRETTY and FEED_COMPRESS."""
+    if pretty is None:
+        pretty = os.environ.get("FEED_PRETTY", "1") != "0"
+    if compress is None:
+        compress = os.environ.get("FEED_COMPRESS", "").split(",")
+    return pretty, [variant.strip() for variant in compress if variant.strip()]
+
+
+def parse_feed(xml):
+    """Parse serialized feed XML, keeping CDATA sections (lxml strips them by default)."""
+    # Imported here like feedgen, so generators only load lxml when they write a feed
+    from lxml import etree
+
+    return etree.fromstring(xml, etree.XMLParser(strip_cdata=False))
+
+
+def write_serialized_feed(compact, output_path, pretty=None, compress=None):
+    """Write an already serialized (compact) feed and its precompressed variants.
+
+    Args:
+        compact: Feed XML bytes without indentation
+        output_path: Path of the XML file
+        pretty: Indent the XML file (default: FEED_PRETTY, on)
+        compress: Variants to write, e.g. ("gz", "br") (default: FEED_COMPRESS, none)
+
+    Returns:
+        Path: The XML file that was written
+    """
+    output_path = Path(output_path)
+    pretty, variants = resolve_output_options(pretty, compress)
+    if pretty:
+        from lxml import etree
+
+        # Re-indenting the parsed compact output is much cheaper than building
+        # the feed a second time; CDATA content (content:encoded) is kept as is
+        xml = etree.tostring(parse_feed(compact), pretty_print=True, encoding="UTF-8", xml_declaration=True)
+    else:
+        xml = compact
+
+    write_file(output_path, xml)
+    for suffix, data in get_compressed_variants(compact, variants).items():
+        write_file(output_path.with_name(output_path.name + suffix), data)
+    return output_path
+
+
+def write_feed(feed_generator, output_path, pretty=None, compress=None):
+    """Serialize an RSS feed once and write the XML plus any precompressed variants.
+
+    Args:
+        feed_generator: feedgen FeedGenerator to serialize
+        output_path: Path of the XML file (e.g. feeds/feed_hamel.xml)
+        pretty: Indent the XML file (default: FEED_PRETTY, on)
+        compress: Variants to write, e.g. ("gz", "br") (default: FEED_COMPRESS, none)
+
+    Returns:
+        Path: The XML file that was written
+    """
+    output_path = Path(output_path)
+    pretty, variants = resolve_output_options(pretty, compress)
+
+    if pretty and not variants:
+        write_file(output_path, feed_generator.rss_str(pretty=True))
+        return output_path
+
+    return write_serialized_feed(feed_generator.rss_str(pretty=False), output_path, pretty, variants)
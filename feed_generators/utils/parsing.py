@@ -0,0 +1,36 @@
+"""Parse only the part of a page a generator actually reads.
+
+Listing pages are mostly chrome, inline scripts and styles around one
+container. Passing a SoupStrainer to BeautifulSoup builds a tree of just the
+matching elements (and everything inside them), so parse time and memory
+follow the size of the listing rather than of the page.
+"""
+
+import logging
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+
+def parse_subtree(html, strainer, selector, features="html.parser"):
+    """Parse only the elements kept by a SoupStrainer.
+
+    If the strained tree does not contain ``selector`` (e.g. the page markup
+    changed), the whole page is parsed instead, so callers see the same result
+    as with a full parse.
+
+    Args:
+        html: Page HTML
+        strainer: bs4.SoupStrainer matching the container(s) to keep
+        selector: CSS selector the caller will look up in the returned soup
+        features: Parser passed on to BeautifulSoup
+
+    Returns:
+        BeautifulSoup: The strained soup, or the full one as a fallback
+    """
+    soup = BeautifulSoup(html, features, parse_only=strainer)
+    if soup.select_one(selector) is not None:
+        return soup
+    logger.debug(f"Strained parse found no {selector!r}, parsing the whole page")
+    return BeautifulSoup(html, features)
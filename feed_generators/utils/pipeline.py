@@ -0,0 +1,93 @@
+"""Fetch pages on an I/O event loop and parse them on all cores.
+
+Parsing with BeautifulSoup is CPU-bound and holds the GIL, so parsing fetched
+pages on the fetch threads serializes it on one core. fetch_and_parse runs the
+fetches from an asyncio event loop (on a thread pool, through utils.fetch so
+retries and rate limits still apply) and hands each page to a
+ProcessPoolExecutor as soon as it arrives, so parsing overlaps with the
+remaining fetches and uses every core.
+
+The parse processes are started with the ``spawn`` method: forking while the
+fetch threads hold locks (logging, SSL, the rate limiter) can deadlock the
+child. The parse function runs in another process: it must be a module-level
+function of an importable module (or of a script guarded by
+``if __name__ == "__main__"``) and should return a small record (a tuple of the fields the feed needs, or a
+utils.items.FeedItem) rather than a soup, since its result is pickled back.
+
+Set ``PARSE_WORKERS`` to the number of parse processes (default: CPU count);
+``PARSE_WORKERS=0`` parses in the fetch threads instead.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from utils.fetch import fetch_html
+
+logger = logging.getLogger(__name__)
+
+# Pages fetched at once; utils.fetch keeps them within each host's rate limit
+DEFAULT_IO_WORKERS = 8
+
+
+def get_parse_workers():
+    """Number of parse processes from PARSE_WORKERS, defaulting to the CPU count."""
+    value = os.environ.get("PARSE_WORKERS")
+    if value is not None:
+        try:
+            return max(0, int(value))
+        except ValueError:
+            logger.warning(f"Ignoring invalid PARSE_WORKERS={value!r}")
+    return os.cpu_count() or 1
+
+
+async def _run(urls, parse, fetch, io_pool, parse_pool):
+    """Fetch every URL and parse each page as soon as it arrives."""
+    loop = asyncio.get_running_loop()
+
+    async def fetch_and_parse_one(url):
+        page = await loop.run_in_executor(io_pool, fetch, url)
+        if parse_pool is None:
+            return await loop.run_in_executor(io_pool, parse, page)
+        return await loop.run_in_executor(parse_pool, parse, page)
+
+    return await asyncio.gather(*(fetch_and_parse_one(url) for url in urls))
+
+
+def fetch_and_parse(urls, parse, fetch=fetch_html, io_workers=DEFAULT_IO_WORKERS, parse_workers=None):
+    """Fetch pages concurrently and parse them in worker processes.
+
+    Args:
+        urls: URLs to fetch
+        parse: Module-level function taking the page HTML and returning a
+            picklable record
+        fetch: Function taking a URL and returning its HTML (default: fetch_html)
+        io_workers: Pages fetched at once
+        parse_workers: Parse processes (default: PARSE_WORKERS or the CPU count);
+            0 parses in the fetch threads
+
+    Returns:
+        list: parse(page) for each URL, in the order of ``urls``. A failed fetch
+        or parse raises its exception.
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+    if parse_workers is None:
+        parse_workers = get_parse_workers()
+    # A single page is not worth starting a process for
+    parse_workers = min(parse_workers, len(urls)) if len(urls) > 1 else 0
+
+    logger.info(f"Fetching {len(urls)} pages with {io_workers} I/O workers, parsing with {parse_workers or 'no'} worker processes")
+    if not parse_workers:
+        with ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+            return asyncio.run(_run(urls, parse, fetch, io_pool, None))
+
+    # The parse pool is created before any fetch thread runs, and spawns rather
+    # than forks its workers, so no child inherits a lock held by another thread
+    parse_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=parse_workers, mp_context=parse_context) as parse_pool:
+        with ThreadPoolExecutor(max_workers=io_workers) as io_pool:
+            return asyncio.run(_run(urls, parse, fetch, io_pool, parse_pool))
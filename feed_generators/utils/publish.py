@@ -0,0 +1,137 @@
+"""Publish a manifest of the generated feeds for cheap change detection.
+
+Readers poll the feeds as raw files, so every poll downloads every feed.
+``feeds/manifest.json`` lists each feed with a hash of its content, its item
+count and when it last changed; an aggregator can poll that one small file and
+fetch only the feeds whose hash moved.
+
+The hash ignores ``<lastBuildDate>``, which feedgen sets on every run, so it
+only changes when the feed content does. With ``PUBLISH_BY_HASH=1`` each feed
+is also copied to ``feeds/by-hash/<hash>.xml`` (plus any precompressed variants
+requested through FEED_COMPRESS, see utils.output); those URLs never change
+content and can be cached forever. Copies referenced by the current or the
+previous manifest are kept, older ones are removed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pytz
+from lxml import etree
+
+from utils.output import get_compressed_variants, resolve_output_options, write_file
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+BY_HASH_DIR = "by-hash"
+VOLATILE_ELEMENTS = re.compile(rb"<lastBuildDate>[^<]*</lastBuildDate>")
+VARIANT_SUFFIXES = (".gz", ".br")
+
+
+def get_feeds_dir():
+    """Get the feeds directory at the repository root."""
+    return Path(__file__).resolve().parent.parent.parent / "feeds"
+
+
+def get_content_hash(xml):
+    """Hash a feed's XML, ignoring the build date feedgen stamps on every run."""
+    return hashlib.sha256(VOLATILE_ELEMENTS.sub(b"", xml)).hexdigest()[:16]
+
+
+def count_items(xml):
+    """Count the <item> (RSS) or <entry> (Atom) elements of a feed."""
+    try:
+        root = etree.fromstring(xml)
+    except etree.XMLSyntaxError:
+        return None
+    return len(root.findall("./channel/item")) or len(root.findall("{http://www.w3.org/2005/Atom}entry"))
+
+
+def load_manifest(feeds_dir):
+    """Load the previous manifest, or an empty one."""
+    path = feeds_dir / MANIFEST_NAME
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {"feeds": {}}
+
+
+def write_by_hash_copy(feeds_dir, content_hash, xml, variants):
+    """Write the content-addressed copy of a feed (and its variants) if missing."""
+    by_hash_dir = feeds_dir / BY_HASH_DIR
+    by_hash_dir.mkdir(exist_ok=True)
+    path = by_hash_dir / f"{content_hash}.xml"
+    if not path.exists():
+        write_file(path, xml)
+        for suffix, data in get_compressed_variants(xml, variants).items():
+            write_file(path.with_name(path.name + suffix), data)
+    return path.relative_to(feeds_dir).as_posix()
+
+
+def prune_by_hash_copies(feeds_dir, keep_hashes):
+    """Remove content-addressed copies that no manifest still refers to."""
+    by_hash_dir = feeds_dir / BY_HASH_DIR
+    if not by_hash_dir.exists():
+        return
+    for path in by_hash_dir.iterdir():
+        if path.name.split(".", 1)[0] not in keep_hashes:
+            path.unlink()
+
+
+def publish_feeds(feeds_dir=None, by_hash=None):
+    """Write feeds/manifest.json (and optional content-addressed copies).
+
+    Args:
+        feeds_dir: Directory holding the feed_*.xml files (default: feeds/)
+        by_hash: Also write feeds/by-hash/ copies (default: PUBLISH_BY_HASH)
+
+    Returns:
+        dict: The manifest that was written
+    """
+    feeds_dir = Path(feeds_dir) if feeds_dir else get_feeds_dir()
+    if by_hash is None:
+        by_hash = os.environ.get("PUBLISH_BY_HASH") == "1"
+    _, variants = resolve_output_options()
+
+    previous = load_manifest(feeds_dir).get("feeds", {})
+    now = datetime.now(pytz.UTC).replace(microsecond=0).isoformat()
+    feeds = {}
+
+    for path in sorted(feeds_dir.glob("feed_*.xml")):
+        xml = path.read_bytes()
+        content_hash = get_content_hash(xml)
+        old_entry = previous.get(path.name, {})
+        entry = {
+            "hash": content_hash,
+            "items": count_items(xml),
+            "bytes": len(xml),
+            "changed": old_entry.get("changed", now) if old_entry.get("hash") == content_hash else now,
+            "variants": [
+                path.name + suffix for suffix in VARIANT_SUFFIXES
+                if path.with_name(path.name + suffix).exists()
+            ],
+        }
+        if by_hash:
+            entry["by_hash"] = write_by_hash_copy(feeds_dir, content_hash, xml, variants)
+        feeds[path.name] = entry
+
+    manifest = {"version": 1, "feeds": feeds}
+    write_file(
+        feeds_dir / MANIFEST_NAME,
+        (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8"),
+    )
+
+    if by_hash:
+        keep = {entry["hash"] for entry in feeds.values()} | {entry.get("hash") for entry in previous.values()}
+        prune_by_hash_copies(feeds_dir, keep)
+
+    changed = [name for name, entry in feeds.items() if entry["changed"] == now]
+    logger.info(f"Published manifest for {len(feeds)} feeds ({len(changed)} changed)")
+    return manifest
@@ -0,0 +1,140 @@
+"""Per-host request rate limiting for the shared fetch layer.
+
+Every request made through utils.fetch first takes a token from its host's
+bucket. Buckets refill at DEFAULT_RATE requests per second, or slower when the
+host's robots.txt asks for a ``Crawl-delay`` or ``Request-rate``. Buckets are
+shared by all threads, so generators can fetch article pages concurrently
+without sending a host more than it allows.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import pytz
+import requests
+
+from utils.deadline import DeadlineExceeded, cap_timeout, remaining_time
+from utils.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+# Requests per second and burst size for hosts whose robots.txt sets no limit
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+# Hosts needing a different limit than DEFAULT_RATE: host -> requests per second
+HOST_RATES = {}
+# robots.txt limits are cached in cache/ and fetched again after this long
+ROBOTS_STATE = "robots_rates"
+ROBOTS_MAX_AGE = timedelta(days=1)
+ROBOTS_TIMEOUT = 5
+
+_lock = threading.Lock()
+_buckets = {}
+_host_locks = {}
+_robots_rates = None
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, returning how long to wait before it may be used."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Tokens can go negative: each waiter is queued behind the previous one
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            remaining = remaining_time()
+            if remaining is not None and wait >= remaining:
+                raise DeadlineExceeded("Run deadline exceeded while waiting for the rate limit")
+            time.sleep(wait)
+
+
+def get_robots_rate(scheme, host):
+    """Requests per second allowed by the host's robots.txt, or None if it sets no limit."""
+    parser = RobotFileParser()
+    try:
+        response = requests.get(f"{scheme}://{host}/robots.txt", timeout=cap_timeout(ROBOTS_TIMEOUT))
+    except requests.RequestException as e:
+        logger.debug(f"Could not fetch robots.txt for {host}: {e}")
+        return None
+    if response.status_code != 200:
+        return None
+    parser.parse(response.text.splitlines())
+
+    rates = []
+    crawl_delay = parser.crawl_delay("*")
+    if crawl_delay:
+        rates.append(1 / float(crawl_delay))
+    request_rate = parser.request_rate("*")
+    if request_rate and request_rate.seconds:
+        rates.append(request_rate.requests / request_rate.seconds)
+    return min(rates) if rates else None
+
+
+def _cached_robots_rate(scheme, host):
+    global _robots_rates
+    with _lock:
+        if _robots_rates is None:
+            _robots_rates = load_state(ROBOTS_STATE, {}) or {}
+        entry = _robots_rates.get(host)
+    now = datetime.now(pytz.UTC)
+    if entry and now - datetime.fromisoformat(entry["checked"]) < ROBOTS_MAX_AGE:
+        return entry["rate"]
+
+    rate = get_robots_rate(scheme, host)
+    with _lock:
+        _robots_rates[host] = {"rate": rate, "checked": now.isoformat()}
+        save_state(ROBOTS_STATE, _robots_rates)
+    if rate:
+        logger.info(f"robots.txt for {host} limits requests to {rate:.2f}/s")
+    return rate
+
+
+def get_bucket(url):
+    """Return the shared bucket for the URL's host, creating it on first use."""
+    parts = urlparse(url)
+    host = parts.netloc
+    with _lock:
+        if host in _buckets:
+            return _buckets[host]
+        host_lock = _host_locks.setdefault(host, threading.Lock())
+
+    # robots.txt is fetched under the host's own lock, so only requests to
+    # this host wait for it
+    with host_lock:
+        with _lock:
+            if host in _buckets:
+                return _buckets[host]
+        rate = HOST_RATES.get(host, DEFAULT_RATE)
+        robots_rate = _cached_robots_rate(parts.scheme, host)
+        if robots_rate:
+            # A crawl delay means one request at a time, no bursts
+            bucket = TokenBucket(min(rate, robots_rate), 1)
+        else:
+            bucket = TokenBucket(rate, DEFAULT_BURST)
+        with _lock:
+            _buckets[host] = bucket
+        return bucket
+
+
+def wait_for_slot(url):
+    """Block until a request to the URL's host is allowed."""
+    get_bucket(url).acquire()
@@ -0,0 +1,133 @@
+"""Discover articles from a site's sitemap.xml instead of paging through listings.
+
+The sitemap lists every article URL with its ``<lastmod>``, so comparing it with
+the previous run tells us exactly which articles are new or changed. Only those
+need to be fetched; everything else is served from the cached item data.
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from urllib.parse import urlparse
+
+import pytz
+
+from utils.embedded import parse_iso_date
+from utils.fetch import fetch_html
+from utils.state import load_state, save_state
+
+logger = logging.getLogger(__name__)
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_sitemap(xml_content):
+    """Parse a sitemap or sitemap index.
+
+    Returns:
+        tuple: (list of (loc, lastmod) page entries, list of (loc, lastmod) child sitemaps)
+    """
+    root = ET.fromstring(xml_content.encode("utf-8") if isinstance(xml_content, str) else xml_content)
+    entries = []
+    for node in root:
+        fields = {_local_name(child.tag): (child.text or "").strip() for child in node}
+        if fields.get("loc"):
+            entries.append((fields["loc"], fields.get("lastmod") or None))
+
+    if _local_name(root.tag) == "sitemapindex":
+        return [], entries
+    return entries, []
+
+
+def _known_sitemap(value):
+    """Return (lastmod, parent) of a saved sitemap; old state only saved the lastmod."""
+    if isinstance(value, list):
+        return value[0], value[1]
+    return value, None
+
+
+def _sitemap_subtree(root_url, known_sitemaps):
+    """Return the saved sitemaps below ``root_url`` (including itself)."""
+    subtree = {root_url}
+    added = True
+    while added:
+        added = False
+        for url, value in known_sitemaps.items():
+            if url not in subtree and _known_sitemap(value)[1] in subtree:
+                subtree.add(url)
+                added = True
+    return subtree
+
+
+def _lastmod_sort_key(lastmod):
+    return parse_iso_date(lastmod) or datetime.min.replace(tzinfo=pytz.UTC)
+
+
+def discover_changed_urls(source, sitemap_url, path_prefix=None, fetch=fetch_html):
+    """Enumerate a source's article URLs and report which changed since the last run.
+
+    Child sitemaps of an index whose ``<lastmod>`` did not move are not fetched
+    again; their URLs (and those of any sitemaps nested below them) are carried
+    over from the saved state.
+
+    Args:
+        source: Name used for the state file in cache/
+        sitemap_url: URL of the sitemap or sitemap index
+        path_prefix: Only keep URLs whose path starts with this prefix (e.g. "/news/")
+        fetch: Callable returning the text of a URL
+
+    Returns:
+        tuple: (discovery state to pass to remember_discovery, list of new or
+        changed URLs, most recently modified first)
+    """
+    previous = load_state(f"sitemap_{source}", {}) or {}
+    known_urls = previous.get("urls", {})
+    known_sitemaps = previous.get("sitemaps", {})
+
+    urls = {}
+    sitemaps = {}
+    pending = [(sitemap_url, None, None)]
+    while pending:
+        url, lastmod, parent = pending.pop()
+        if url in sitemaps:
+            continue
+        sitemaps[url] = [lastmod, parent]
+
+        if lastmod and url in known_sitemaps and _known_sitemap(known_sitemaps[url])[0] == lastmod:
+            logger.info(f"Sitemap unchanged since last run: {url}")
+            subtree = _sitemap_subtree(url, known_sitemaps)
+            for child in subtree - {url}:
+                sitemaps.setdefault(child, list(_known_sitemap(known_sitemaps[child])))
+            urls.update({loc: entry for loc, entry in known_urls.items() if entry[1] in subtree})
+            continue
+
+        logger.info(f"Fetching sitemap: {url}")
+        entries, children = parse_sitemap(fetch(url))
+        pending.extend((child, child_lastmod, url) for child, child_lastmod in children)
+        for loc, entry_lastmod in entries:
+            if path_prefix and not urlparse(loc).path.startswith(path_prefix):
+                continue
+            urls[loc] = [entry_lastmod, url]
+
+    changed = [
+        loc
+        for loc, (lastmod, _) in urls.items()
+        if loc not in known_urls or (lastmod and known_urls[loc][0] != lastmod)
+    ]
+    # Newest first, so a capped run processes the most recent articles
+    changed.sort(key=lambda loc: _lastmod_sort_key(urls[loc][0]), reverse=True)
+    logger.info(f"Sitemap lists {len(urls)} URLs, {len(changed)} new or changed")
+    return {"urls": urls, "sitemaps": sitemaps}, changed
+
+
+def remember_discovery(source, discovery, unprocessed=()):
+    """Persist a discovery result so the next run only sees newer changes.
+
+    URLs in ``unprocessed`` are left out so they are reported as changed again.
+    """
+    unprocessed = set(unprocessed)
+    urls = {loc: entry for loc, entry in discovery["urls"].items() if loc not in unprocessed}
+    sitemaps = discovery["sitemaps"] if not unprocessed else {}
+    save_state(f"sitemap_{source}", {"urls": urls, "sitemaps": sitemaps})
@@ -0,0 +1,39 @@
+"""JSON state persisted between runs in the repository's cache/ directory."""
+
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_dir():
+    """Get the cache directory, creating it if needed."""
+    cache_dir = Path(__file__).resolve().parent.parent.parent / "cache"
+    cache_dir.mkdir(exist_ok=True)
+    return cache_dir
+
+
+def load_state(name, default=None):
+    """Load ``cache/<name>.json``, returning ``default`` if it is missing or corrupt."""
+    path = get_cache_dir() / f"{name}.json"
+    if not path.exists():
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable state file {path}: {e}")
+        return default
+
+
+def save_state(name, data):
+    """Atomically write ``data`` to ``cache/<name>.json``."""
+    path = get_cache_dir() / f"{name}.json"
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        f.write("\n")
+    os.replace(tmp_path, path)
+    return path
@@ -1,10 +1,12 @@
 import requests
 from datetime import datetime
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.fetch import request_with_retries
+from utils.output import FEEDS_BASE_URL, write_feed
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
@@ -30,9 +32,7 @@ def fetch_blog_posts():
             "Accept": "*/*",
         }
         url = "https://windsurf.com/api/blog"
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return request_with_retries(url, headers=headers).json()
     except requests.RequestException as e:
         logger.error(f"Error fetching blog posts: {str(e)}")
         raise
@@ -91,6 +91,8 @@ def parse_blog_posts(api_response):
 
 def generate_rss_feed(blog_posts, feed_name="windsurf_blog"):
     """Generate RSS feed from blog posts."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("Windsurf Blog")
@@ -101,7 +103,7 @@ def generate_rss_feed(blog_posts, feed_name="windsurf_blog"):
         fg.author({"name": "Windsurf"})
         fg.subtitle("Read about the latest announcements from Windsurf")
         fg.link(href="https://windsurf.com/blog", rel="alternate")
-        fg.link(href=f"https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_{feed_name}.xml", rel="self")
+        fg.link(href=f"{FEEDS_BASE_URL}/feed_{feed_name}.xml", rel="self")
 
         # Sort by date (newest first)
         blog_posts_sorted = sorted(blog_posts, key=lambda x: x["date"], reverse=True)
@@ -131,7 +133,7 @@ def save_rss_feed(feed_generator, feed_name="windsurf_blog"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
     except Exception as e:
@@ -1,16 +1,44 @@
+import argparse
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 import re
 
+from utils.fetch import fetch_html
+from utils.archive import write_archived_feed
+from utils.output import FEEDS_BASE_URL
+from utils.state import load_state, save_state
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Changelog channels generated by this script, each written to feeds/feed_<feed_name>.xml
+CHANNELS = {
+    "stable": {
+        "url": "https://windsurf.com/changelog",
+        "title": "Windsurf",
+        "feed_name": "windsurf_changelog",
+    },
+    "next": {
+        "url": "https://windsurf.com/changelog/windsurf-next",
+        "title": "Windsurf Next",
+        "feed_name": "windsurf_next_changelog",
+    },
+}
+
+# Newest versions kept in each feed; older ones go to archive pages
+FEED_WINDOW = 50
+
+# Version pattern to find elements with version IDs
+VERSION_PATTERN = re.compile(r"^\d+\.\d+\.\d+$")
+DATE_PATTERN = re.compile(
+    r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}"
+)
+
 
 def get_project_root():
     """Get the project root directory."""
@@ -24,20 +52,46 @@ def ensure_feeds_directory():
     return feeds_dir
 
 
-def fetch_changelog_content(url="https://windsurf.com/changelog"):
-    """Fetch changelog content from Windsurf's website."""
+def fetch_changelog_content(url, session):
+    """Fetch a changelog page using the shared HTTP session."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url, session=session)
     except requests.RequestException as e:
         logger.error(f"Error fetching changelog content: {str(e)}")
         raise
 
 
+def create_session():
+    """Create the HTTP session shared by all channels."""
+    session = requests.Session()
+    session.headers.update(
+        {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+        }
+    )
+    return session
+
+
+def load_known_versions(channel):
+    """Load the entries parsed for a channel in previous runs, keyed by version."""
+    known = load_state(f"windsurf_changelog_{channel}", {}) or {}
+    for entry in known.values():
+        entry["date"] = datetime.fromisoformat(entry["date"])
+    return known
+
+
+def save_known_versions(channel, changelog_entries):
+    """Persist a channel's entries so the next run only builds new versions."""
+    save_state(
+        f"windsurf_changelog_{channel}",
+        {
+            entry["version"]: {"description": entry["description"], "date": entry["date"].isoformat()}
+            for entry in changelog_entries
+            if entry.get("date_found", True)
+        },
+    )
+
+
 def parse_date(date_text):
     """Parse date from various formats used on Windsurf changelog."""
     date_formats = [
@@ -61,81 +115,94 @@ def parse_date(date_text):
     return None
 
 
-def parse_changelog_html(html_content):
-    """Parse the changelog HTML content and extract version entries."""
+def build_description(elem, version):
+    """Build the HTML description of a version from its prose content."""
+    prose_elem = elem.select_one(".prose")
+    if prose_elem:
+        # Get inner HTML, excluding images
+        description_parts = []
+        for child in prose_elem.children:
+            if child.name == "img":
+                continue
+            if child.name == "h1":
+                # Major section header (AI Models, Features & Tools, etc.)
+                heading_text = child.get_text(strip=True)
+                description_parts.append(f"<h3>{heading_text}</h3>")
+            elif child.name in ["h2", "h3"]:
+                # Subheading (Gemini 3 Pro, SWE-1.5, etc.)
+                heading_text = child.get_text(strip=True)
+                description_parts.append(f"<p><strong>{heading_text}</strong></p>")
+            elif child.name == "p":
+                description_parts.append(f"<p>{child.get_text(strip=True)}</p>")
+            elif child.name == "ul":
+                items = [f"<li>{li.get_text(strip=True)}</li>" for li in child.find_all("li")]
+                description_parts.append(f"<ul>{''.join(items)}</ul>")
+        description = "".join(description_parts)
+    else:
+        # Fallback: extract text with separator
+        description = elem.get_text()
+        date_match = DATE_PATTERN.search(description)
+        if date_match:
+            description = description[date_match.end():].strip()
+
+    # Limit length
+    if len(description) > 2000:
+        description = description[:2000] + "..."
+
+    return description or f"Version {version} release"
+
+
+def parse_changelog_html(html_content, channel="stable", known_versions=None):
+    """Parse the changelog HTML content and extract version entries.
+
+    Args:
+        html_content: Raw HTML of the changelog page
+        channel: Key into CHANNELS
+        known_versions: Entries from previous runs keyed by version; these are reused
+            instead of rebuilding their descriptions
+    """
     try:
+        config = CHANNELS[channel]
+        known_versions = known_versions or {}
         soup = BeautifulSoup(html_content, "html.parser")
         changelog_entries = []
-
-        # Version pattern to find elements with version IDs
-        version_pattern = re.compile(r'^\d+\.\d+\.\d+$')
+        new_versions = 0
 
         # Find all elements with version-like IDs
-        version_elements = soup.find_all(id=version_pattern)
+        version_elements = soup.find_all(id=VERSION_PATTERN)
 
         for elem in version_elements:
             version = elem.get("id")
-            elem_text = elem.get_text()
+            link = f"{config['url']}#{version}"
+            entry = {"title": f"{config['title']} {version}", "version": version, "link": link}
+
+            if version in known_versions:
+                entry.update(known_versions[version])
+                changelog_entries.append(entry)
+                continue
+
+            new_versions += 1
+
+            # Look up the text node holding the date instead of the whole subtree's text,
+            # which is only needed when the date is split across tags
+            date_node = elem.find(string=DATE_PATTERN)
+            date_match = DATE_PATTERN.search(date_node if date_node else elem.get_text())
+            date = parse_date(date_match.group()) if date_match else None
+            if not date:
+                logger.warning(f"Could not find date for version {version}")
 
-            # Extract date from the element's text
-            date_match = re.search(
-                r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}',
-                elem_text
+            entry.update(
+                {
+                    "description": build_description(elem, version),
+                    "date": date or datetime.now(pytz.UTC),
+                    "date_found": date is not None,
+                }
             )
+            changelog_entries.append(entry)
 
-            if date_match:
-                date = parse_date(date_match.group())
-            else:
-                logger.warning(f"Could not find date for version {version}")
-                date = datetime.now(pytz.UTC)
-
-            # Extract description from the prose/article content as HTML
-            prose_elem = elem.select_one(".prose")
-            if prose_elem:
-                # Get inner HTML, excluding images
-                description_parts = []
-                for child in prose_elem.children:
-                    if child.name == "img":
-                        continue
-                    if child.name == "h1":
-                        # Major section header (AI Models, Features & Tools, etc.)
-                        heading_text = child.get_text(strip=True)
-                        description_parts.append(f"<h3>{heading_text}</h3>")
-                    elif child.name in ["h2", "h3"]:
-                        # Subheading (Gemini 3 Pro, SWE-1.5, etc.)
-                        heading_text = child.get_text(strip=True)
-                        description_parts.append(f"<p><strong>{heading_text}</strong></p>")
-                    elif child.name == "p":
-                        description_parts.append(f"<p>{child.get_text(strip=True)}</p>")
-                    elif child.name == "ul":
-                        items = [f"<li>{li.get_text(strip=True)}</li>" for li in child.find_all("li")]
-                        description_parts.append(f"<ul>{''.join(items)}</ul>")
-                description = "".join(description_parts)
-            else:
-                # Fallback: extract text with separator
-                description = elem_text
-                if date_match:
-                    description = elem_text[date_match.end():].strip()
-
-            # Limit length
-            if len(description) > 2000:
-                description = description[:2000] + "..."
-
-            if not description:
-                description = f"Version {version} release"
-
-            # Create link with anchor
-            link = f"https://windsurf.com/changelog#{version}"
-
-            changelog_entries.append({
-                "title": f"Windsurf {version}",
-                "version": version,
-                "link": link,
-                "description": description,
-                "date": date,
-            })
-
-        logger.info(f"Successfully parsed {len(changelog_entries)} changelog entries")
+        logger.info(
+            f"Successfully parsed {len(changelog_entries)} {channel} changelog entries ({new_versions} new)"
+        )
         return changelog_entries
 
     except Exception as e:
@@ -143,19 +210,22 @@ def parse_changelog_html(html_content):
         raise
 
 
-def generate_rss_feed(changelog_entries, feed_name="windsurf_changelog"):
+def generate_rss_feed(changelog_entries, channel="stable"):
     """Generate RSS feed from changelog entries."""
+    from feedgen.feed import FeedGenerator
+
     try:
+        config = CHANNELS[channel]
         fg = FeedGenerator()
-        fg.title("Windsurf Changelog")
-        fg.description("Version updates and changes from Windsurf")
-        fg.link(href="https://windsurf.com/changelog")
+        fg.title(f"{config['title']} Changelog")
+        fg.description(f"Version updates and changes from {config['title']}")
+        fg.link(href=config["url"])
         fg.language("en")
 
         fg.author({"name": "Windsurf"})
-        fg.subtitle("Latest version updates from Windsurf")
-        fg.link(href="https://windsurf.com/changelog", rel="alternate")
-        fg.link(href=f"https://raw.githubusercontent.com/Olshansk/rss-feeds/main/feeds/feed_{feed_name}.xml", rel="self")
+        fg.subtitle(f"Latest version updates from {config['title']}")
+        fg.link(href=config["url"], rel="alternate")
+        fg.link(href=f"{FEEDS_BASE_URL}/feed_{config['feed_name']}.xml", rel="self")
 
         # Sort by date (newest first)
         entries_sorted = sorted(changelog_entries, key=lambda x: x["date"], reverse=True)
@@ -182,7 +252,7 @@ def save_rss_feed(feed_generator, feed_name="windsurf_changelog"):
     try:
         feeds_dir = ensure_feeds_directory()
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_archived_feed(feed_generator, output_filename, window=FEED_WINDOW)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
     except Exception as e:
@@ -190,26 +260,49 @@ def save_rss_feed(feed_generator, feed_name="windsurf_changelog"):
         raise
 
 
-def main(feed_name="windsurf_changelog"):
-    """Main function to generate RSS feed from Windsurf changelog."""
-    try:
-        html_content = fetch_changelog_content()
-        changelog_entries = parse_changelog_html(html_content)
+def generate_channel_feed(channel, session):
+    """Fetch, parse and save the feed of a single changelog channel."""
+    config = CHANNELS[channel]
+    known_versions = load_known_versions(channel)
+    html_content = fetch_changelog_content(config["url"], session)
+    changelog_entries = parse_changelog_html(html_content, channel, known_versions)
 
-        if not changelog_entries:
-            logger.warning("No changelog entries found!")
-            return False
+    if not changelog_entries:
+        logger.warning(f"No {channel} changelog entries found!")
+        return False
 
-        feed = generate_rss_feed(changelog_entries, feed_name)
-        output_file = save_rss_feed(feed, feed_name)
+    feed = generate_rss_feed(changelog_entries, channel)
+    save_rss_feed(feed, config["feed_name"])
+    save_known_versions(channel, changelog_entries)
 
-        logger.info(f"Successfully generated RSS feed with {len(changelog_entries)} entries")
-        return True
+    logger.info(f"Successfully generated {channel} RSS feed with {len(changelog_entries)} entries")
+    return True
 
-    except Exception as e:
-        logger.error(f"Failed to generate RSS feed: {str(e)}")
-        return False
+
+def main(channels=None):
+    """Main function to generate RSS feeds from the Windsurf changelogs.
+
+    Args:
+        channels: Channels to generate (default: all of CHANNELS)
+    """
+    session = create_session()
+    success = True
+    for channel in channels or CHANNELS:
+        try:
+            success = generate_channel_feed(channel, session) and success
+        except Exception as e:
+            logger.error(f"Failed to generate {channel} RSS feed: {str(e)}")
+            success = False
+    return success
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate Windsurf changelog RSS feeds")
+    parser.add_argument(
+        "--channel",
+        action="append",
+        choices=list(CHANNELS),
+        help="Changelog channel to generate (repeatable, default: all)",
+    )
+    args = parser.parse_args()
+    main(channels=args.channel)
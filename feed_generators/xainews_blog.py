@@ -3,10 +3,14 @@ import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import pytz
-from feedgen.feed import FeedGenerator
 import logging
 from pathlib import Path
 
+from utils.enrich import enrich_articles
+from utils.health import record_failure, record_run
+from utils.fetch import fetch_html
+from utils.output import write_feed
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -36,12 +40,7 @@ def ensure_feeds_directory():
 def fetch_news_content(url="https://x.ai/news"):
     """Fetch news content from xAI's website."""
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.text
+        return fetch_html(url)
     except requests.RequestException as e:
         logger.error(f"Error fetching news content: {str(e)}")
         raise
@@ -70,7 +69,7 @@ def parse_date(date_text):
     return None  # Return None so caller can use stable fallback with appropriate identifier
 
 
-def extract_articles(soup):
+def extract_articles(soup, selector_hits=None):
     """Extract article information from the parsed HTML."""
     articles = []
     seen_links = set()
@@ -80,6 +79,7 @@ def extract_articles(soup):
     article_containers = soup.select("div.group.relative")
 
     logger.info(f"Found {len(article_containers)} potential article containers")
+    title_link_hits = 0
 
     for container in article_containers:
         try:
@@ -87,6 +87,7 @@ def extract_articles(soup):
             title_link = container.select_one('a[href*="/news/"]')
             if not title_link:
                 continue
+            title_link_hits += 1
 
             href = title_link.get("href", "")
             if not href:
@@ -218,15 +219,19 @@ def extract_articles(soup):
             logger.warning(f"Error parsing article container: {str(e)}")
             continue
 
+    if selector_hits is not None:
+        selector_hits["div.group.relative"] = len(article_containers)
+        selector_hits['div.group.relative a[href*="/news/"]'] = title_link_hits
+
     logger.info(f"Successfully parsed {len(articles)} articles")
     return articles
 
 
-def parse_news_html(html_content):
+def parse_news_html(html_content, selector_hits=None):
     """Parse the news HTML content and extract article information."""
     try:
         soup = BeautifulSoup(html_content, "html.parser")
-        return extract_articles(soup)
+        return extract_articles(soup, selector_hits)
     except Exception as e:
         logger.error(f"Error parsing HTML content: {str(e)}")
         raise
@@ -234,6 +239,8 @@ def parse_news_html(html_content):
 
 def generate_rss_feed(articles, feed_name="xainews"):
     """Generate RSS feed from news articles."""
+    from feedgen.feed import FeedGenerator
+
     try:
         fg = FeedGenerator()
         fg.title("xAI News")
@@ -259,6 +266,8 @@ def generate_rss_feed(articles, feed_name="xainews"):
             fe.published(article["date"])
             fe.category(term=article["category"])
             fe.id(article["link"])
+            if article.get("content"):
+                fe.content(article["content"], type="CDATA")
 
         logger.info("Successfully generated RSS feed")
         return fg
@@ -278,7 +287,7 @@ def save_rss_feed(feed_generator, feed_name="xainews"):
         output_filename = feeds_dir / f"feed_{feed_name}.xml"
 
         # Save the feed
-        feed_generator.rss_file(str(output_filename), pretty=True)
+        write_feed(feed_generator, output_filename)
         logger.info(f"Successfully saved RSS feed to {output_filename}")
         return output_filename
 
@@ -305,12 +314,19 @@ def main(feed_name="xainews", html_file=None):
             html_content = fetch_news_content()
 
         # Parse articles from HTML
-        articles = parse_news_html(html_content)
+        selector_hits = {}
+        articles = parse_news_html(html_content, selector_hits)
+        if not html_file:
+            record_run(__file__, len(articles), selector_hits)
 
         if not articles:
             logger.warning("No articles found!")
             return False
 
+        # Articles without a description use their title; fill those in from the article pages
+        if not html_file:
+            enrich_articles(articles, feed_name)
+
         # Generate RSS feed with all articles
         feed = generate_rss_feed(articles, feed_name)
 
@@ -322,6 +338,8 @@ def main(feed_name="xainews", html_file=None):
 
     except Exception as e:
         logger.error(f"Failed to generate RSS feed: {str(e)}")
+        if not html_file:
+            record_failure(__file__, e)
         return False
 
 
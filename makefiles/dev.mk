@@ -16,3 +16,31 @@ dev_test_feed: ## Run the test_feed.py script
 	$(call print_info,Running test_feed.py)
 	$(Q)python feed_generators/test_feed.py
 	$(call print_success,Test feed completed)
+
+.PHONY: dev_test
+dev_test: ## Run the unit tests in tests/ (needs pytest)
+	$(call check_venv)
+	$(call print_info,Running unit tests)
+	$(Q)python -m pytest -q tests
+	$(call print_success,Unit tests completed)
+
+.PHONY: dev_bench_startup
+dev_bench_startup: ## Benchmark cold-start import time of every feed generator
+	$(call check_venv)
+	$(call print_info,Measuring generator import time with -X importtime)
+	$(Q)python benchmarks/startup_importtime.py
+	$(call print_success,Startup benchmark completed)
+
+.PHONY: dev_bench_eng_parse
+dev_bench_eng_parse: ## Benchmark parsing of the Anthropic Engineering RSC payload
+	$(call check_venv)
+	$(call print_info,Timing streaming vs legacy engineering payload parsing)
+	$(Q)python benchmarks/eng_payload_parse.py
+	$(call print_success,Engineering parse benchmark completed)
+
+.PHONY: dev_bench_eleos_parse
+dev_bench_eleos_parse: ## Benchmark single-sweep vs ancestor-walk parsing of the Eleos research page
+	$(call check_venv)
+	$(call print_info,Timing single-sweep vs legacy Eleos parsing)
+	$(Q)python benchmarks/eleos_parse.py
+	$(call print_success,Eleos parse benchmark completed)
@@ -16,6 +16,13 @@ feeds_anthropic_news: ## Generate RSS feed for Anthropic News
 	$(Q)python feed_generators/anthropic_news_blog.py
 	$(call print_success,Anthropic News feed generated)
 
+.PHONY: feeds_anthropic_batch
+feeds_anthropic_batch: ## Generate Anthropic News and Research feeds in one browser session
+	$(call check_venv)
+	$(call print_info,Generating Anthropic News and Research feeds)
+	$(Q)python feed_generators/anthropic_batch.py
+	$(call print_success,Anthropic News and Research feeds generated)
+
 .PHONY: feeds_anthropic_engineering
 feeds_anthropic_engineering: ## Generate RSS feed for Anthropic Engineering
 	$(call check_venv)
@@ -125,14 +132,14 @@ feeds_windsurf_blog: ## Generate RSS feed for Windsurf Blog
 feeds_windsurf_changelog: ## Generate RSS feed for Windsurf Changelog
 	$(call check_venv)
 	$(call print_info,Generating Windsurf Changelog feed)
-	$(Q)python feed_generators/windsurf_changelog.py
+	$(Q)python feed_generators/windsurf_changelog.py --channel stable
 	$(call print_success,Windsurf Changelog feed generated)
 
 .PHONY: feeds_windsurf_next_changelog
 feeds_windsurf_next_changelog: ## Generate RSS feed for Windsurf Next Changelog
 	$(call check_venv)
 	$(call print_info,Generating Windsurf Next Changelog feed)
-	$(Q)python feed_generators/windsurf_next_changelog.py
+	$(Q)python feed_generators/windsurf_changelog.py --channel next
 	$(call print_success,Windsurf Next Changelog feed generated)
 
 .PHONY: feeds_transformer_circuits
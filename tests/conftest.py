@@ -0,0 +1,21 @@
+"""Shared pytest setup: import the generators like run_all_feeds.py does."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+FEED_GENERATORS_DIR = Path(__file__).resolve().parent.parent / "feed_generators"
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(FEED_GENERATORS_DIR))
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point utils.state (and everything built on it) at a temporary cache/ directory."""
+    from utils import state
+
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    monkeypatch.setattr(state, "get_cache_dir", lambda: directory)
+    return directory
@@ -0,0 +1,98 @@
+"""Append-only RFC 5005 archive pages."""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from feedgen.feed import FeedGenerator
+
+from utils import archive
+from utils.items import FeedItem, add_feed_entry
+from utils.output import parse_feed
+
+WINDOW = 5
+PAGE_SIZE = 3
+START = datetime(2024, 1, 1, tzinfo=pytz.UTC)
+
+
+def make_items(numbers):
+    return [
+        FeedItem(title=f"Post {n}", link=f"https://example.com/{n}", date=START + timedelta(days=n))
+        for n in numbers
+    ]
+
+
+def write(feeds_dir, items):
+    fg = FeedGenerator()
+    fg.title("Test")
+    fg.link(href="https://example.com/")
+    fg.description("Test feed")
+    # feedgen puts each new entry first, so the feed lists the newest first
+    for item in items:
+        add_feed_entry(fg, item)
+    return archive.write_archived_feed(fg, feeds_dir / "feed_test.xml", window=WINDOW, page_size=PAGE_SIZE)
+
+
+def links(path):
+    return [item.findtext("link") for item in parse_feed(path.read_bytes()).find("channel").findall("item")]
+
+
+def archive_links(path, rel):
+    return [
+        link.get("href")
+        for link in parse_feed(path.read_bytes()).find("channel").findall(f"{{{archive.ATOM_NS}}}link")
+        if link.get("rel") == rel
+    ]
+
+
+@pytest.fixture
+def feeds_dir(cache_dir, tmp_path):
+    directory = tmp_path / "feeds"
+    directory.mkdir()
+    return directory
+
+
+def test_full_pages_of_the_oldest_items_are_archived(feeds_dir):
+    feed = write(feeds_dir, make_items(range(10)))
+
+    page = feeds_dir / "archive" / "feed_test_1.xml"
+    assert links(page) == [f"https://example.com/{n}" for n in (2, 1, 0)]
+    assert len(links(feed)) == 7
+    assert archive_links(feed, "prev-archive") == [archive.get_archive_url("test", 1)]
+    assert not (feeds_dir / "archive" / "feed_test_2.xml").exists()
+
+
+def test_pages_are_never_rewritten_or_renumbered(feeds_dir):
+    write(feeds_dir, make_items(range(10)))
+    first_page = feeds_dir / "archive" / "feed_test_1.xml"
+    first_bytes = first_page.read_bytes()
+
+    # New posts, plus one older than every archived post that appears late
+    feed = write(feeds_dir, make_items([-1] + list(range(3, 11))))
+
+    assert first_page.read_bytes() == first_bytes
+    second_page = feeds_dir / "archive" / "feed_test_2.xml"
+    assert links(second_page) == [f"https://example.com/{n}" for n in (4, 3, -1)]
+    assert archive_links(second_page, "prev-archive") == [archive.get_archive_url("test", 1)]
+    assert archive_links(first_page, "next-archive") == []
+    assert archive_links(feed, "prev-archive") == [archive.get_archive_url("test", 2)]
+    assert links(feed) == [f"https://example.com/{n}" for n in range(10, 4, -1)]
+
+
+def test_archived_items_passed_again_stay_out_of_the_feed(feeds_dir):
+    write(feeds_dir, make_items(range(10)))
+
+    feed = write(feeds_dir, make_items(range(10)))
+
+    assert len(links(feed)) == 7
+    assert archive.get_archive_page_count(feed) == 1
+
+
+def test_archive_state_is_rebuilt_from_the_pages(feeds_dir, cache_dir):
+    write(feeds_dir, make_items(range(10)))
+    (cache_dir / "archive_test.json").unlink()
+
+    feed = write(feeds_dir, make_items(range(10)))
+
+    assert archive.get_archive_page_count(feed) == 1
+    assert "https://example.com/0" not in links(feed)
@@ -0,0 +1,161 @@
+"""Changelog version dates against a temporary git repository.
+
+The repository stands in for anthropics/claude-code: every release commit
+prepends a ``## x.y.z`` header to CHANGELOG.md, and other commits edit existing
+entries. The GitHub backend is served from the same repository by a fake
+``request_with_retries`` that answers the commits API and raw file requests.
+"""
+
+import os
+import shutil
+import subprocess
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from utils import changelog_dates
+from utils.changelog_dates import resolve_version_dates, resolve_with_clone, resolve_with_github
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+REPO = "example/changelog"
+PATH = "CHANGELOG.md"
+# Commits per page of the fake commits API (GitHub uses 100; small pages exercise paging)
+PAGE_SIZE = 4
+
+
+def git(repo_dir, *args, date=None):
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+        "GIT_CONFIG_GLOBAL": "/dev/null",
+        "GIT_CONFIG_NOSYSTEM": "1",
+    }
+    if date:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = date
+    return subprocess.run(
+        ["git", "-C", str(repo_dir), *args], capture_output=True, text=True, check=True, env=env
+    ).stdout
+
+
+@pytest.fixture(scope="module")
+def changelog_repo(tmp_path_factory):
+    """Build the repository; returns (path, {version: date of the commit that added it})."""
+    repo_dir = tmp_path_factory.mktemp("changelog")
+    git(repo_dir, "init", "-q")
+    changelog = repo_dir / PATH
+    sections = []
+    introduced = {}
+    day = 1
+    for minor in range(12):
+        version = f"1.{minor}.0"
+        sections.insert(0, f"## {version}\n\n- Change in {version}\n")
+        date = f"2024-01-{day:02d}T12:00:00+00:00"
+        changelog.write_text("# Changelog\n\n" + "\n".join(sections))
+        git(repo_dir, "add", PATH)
+        git(repo_dir, "commit", "-q", "-m", f"Release {version}", date=date)
+        introduced[version] = date
+        day += 1
+
+        # Some releases are followed by an edit that does not add a version
+        if minor % 3 == 1:
+            sections[0] += f"- Follow-up fix for {version}\n"
+            changelog.write_text("# Changelog\n\n" + "\n".join(sections))
+            git(repo_dir, "commit", "-q", "-am", f"Fix notes for {version}", date=f"2024-01-{day:02d}T12:00:00+00:00")
+            day += 1
+    return repo_dir, introduced
+
+
+@pytest.fixture
+def github(changelog_repo, monkeypatch):
+    """Answer GitHub API and raw file requests from the local repository."""
+    repo_dir, _ = changelog_repo
+    log = git(repo_dir, "log", "--format=%H %cI", "--", PATH).split()
+    commits = [
+        {"sha": sha, "commit": {"committer": {"date": date}}}
+        for sha, date in zip(log[::2], log[1::2])
+    ]
+    calls = SimpleNamespace(pages=[], raw=[])
+
+    def request_with_retries(url, session=None, headers=None, params=None, **kwargs):
+        if url == f"https://api.github.com/repos/{REPO}/commits":
+            page = params["page"]
+            calls.pages.append(page)
+            body = commits[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+            return SimpleNamespace(json=lambda: body)
+
+        sha = url.split("/")[-2]
+        calls.raw.append(sha)
+        text = git(repo_dir, "show", f"{sha}:{PATH}")
+        end = int(headers["Range"].split("-")[1]) + 1
+        return SimpleNamespace(text=text.encode()[:end].decode(errors="ignore"))
+
+    monkeypatch.setattr(changelog_dates, "request_with_retries", request_with_retries)
+    return calls
+
+
+def same_instant(a, b):
+    return datetime.fromisoformat(a.replace("Z", "+00:00")) == datetime.fromisoformat(b.replace("Z", "+00:00"))
+
+
+def assert_dates(resolved, introduced):
+    for version, date in resolved.items():
+        assert same_instant(date, introduced[version]), version
+
+
+def test_clone_backend_returns_the_introducing_commit(changelog_repo):
+    repo_dir, introduced = changelog_repo
+
+    resolved = resolve_with_clone(list(introduced), repo_dir, PATH)
+
+    assert set(resolved) == set(introduced)
+    assert_dates(resolved, introduced)
+
+
+def test_github_backend_returns_the_introducing_commit(changelog_repo, github):
+    _, introduced = changelog_repo
+
+    resolved = resolve_with_github(list(introduced), REPO, PATH)
+
+    assert set(resolved) == set(introduced)
+    assert_dates(resolved, introduced)
+    # The oldest version needs every page; the empty page after the last one ends paging
+    assert github.pages == [1, 2, 3, 4, 5]
+
+
+def test_github_backend_stops_paging_once_past_the_oldest_version(changelog_repo, github):
+    _, introduced = changelog_repo
+
+    resolved = resolve_with_github(["1.11.0", "1.10.0"], REPO, PATH)
+
+    assert_dates(resolved, introduced)
+    assert set(resolved) == {"1.11.0", "1.10.0"}
+    # The first page already reaches back before 1.10.0
+    assert github.pages == [1]
+
+
+def test_github_backend_keeps_partial_results_when_the_budget_runs_out(changelog_repo, github):
+    _, introduced = changelog_repo
+
+    resolved = resolve_with_github(list(introduced), REPO, PATH, max_lookups=6)
+
+    assert len(github.raw) == 6
+    assert 0 < len(resolved) < len(introduced)
+    # The newest versions are resolved first
+    assert "1.11.0" in resolved
+    assert_dates(resolved, introduced)
+
+
+def test_resolved_dates_are_cached(changelog_repo, cache_dir, monkeypatch):
+    repo_dir, introduced = changelog_repo
+
+    first = resolve_version_dates(["1.2.0", "1.5.0"], REPO, PATH, "versions", clone_path=repo_dir)
+    monkeypatch.setattr(changelog_dates, "resolve_with_clone", pytest.fail)
+    second = resolve_version_dates(["1.2.0", "1.5.0"], REPO, PATH, "versions", clone_path=repo_dir)
+
+    assert first == second
+    assert first["1.2.0"] == datetime.fromisoformat(introduced["1.2.0"])
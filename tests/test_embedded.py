@@ -0,0 +1,54 @@
+"""Listings read from embedded page data."""
+
+import json
+from datetime import datetime
+
+import pytest
+import pytz
+
+from utils.embedded import MIN_RECORDS, extract_articles
+
+RESEARCH_URL = "https://www.anthropic.com/research"
+
+
+def next_data_page(count):
+    records = [
+        {"title": f"Paper {n}", "slug": {"current": f"paper-{n}"}, "publishedOn": f"2024-05-{n + 1:02d}"}
+        for n in range(count)
+    ]
+    data = {"props": {"pageProps": {"page": {"sections": [{"posts": records}]}}}}
+    return f'<html><script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script></html>'
+
+
+def test_a_few_featured_records_are_not_taken_for_the_listing():
+    assert extract_articles(next_data_page(MIN_RECORDS - 1), RESEARCH_URL) == []
+    assert len(extract_articles(next_data_page(MIN_RECORDS), RESEARCH_URL)) == MIN_RECORDS
+
+
+def test_research_embedded_listing_is_merged_with_the_feed(monkeypatch):
+    pytest.importorskip("selenium")
+    import anthropic_research_blog
+
+    monkeypatch.setattr(anthropic_research_blog, "fetch_html", lambda url: next_data_page(MIN_RECORDS))
+    existing = [
+        {
+            "title": "An older paper",
+            "link": f"{RESEARCH_URL}/older-paper",
+            "date": datetime(2023, 1, 1, tzinfo=pytz.UTC),
+            "category": "Research",
+            "description": "An older paper",
+        },
+        {
+            "title": "Paper 0 (old title)",
+            "link": f"{RESEARCH_URL}/paper-0",
+            "date": datetime(2024, 5, 1, tzinfo=pytz.UTC),
+            "category": "Research",
+            "description": "Paper 0",
+        },
+    ]
+
+    articles = anthropic_research_blog.fetch_research_articles_embedded(existing_articles=existing)
+
+    assert len(articles) == MIN_RECORDS + 1
+    assert articles[-1]["link"] == f"{RESEARCH_URL}/older-paper"
+    assert [a["title"] for a in articles if a["link"].endswith("/paper-0")] == ["Paper 0"]
@@ -0,0 +1,74 @@
+"""Anthropic Engineering: the RSC flight-row decoder on a saved copy of the listing page."""
+
+from datetime import datetime
+
+import pytz
+
+from anthropic_eng_blog import iter_engineering_records, parse_engineering_html
+from conftest import FIXTURES_DIR
+from utils.embedded import extract_rsc_payload, iter_flight_rows
+
+PAGE = (FIXTURES_DIR / "anthropic_engineering.html").read_text(encoding="utf-8")
+SUMMARY = "Agents need tools — and “tools” need careful design.\nSecond line of the summary."
+
+
+def test_rows_split_across_pushes_are_decoded():
+    rows = dict(iter_flight_rows(extract_rsc_payload(PAGE)))
+
+    assert list(rows) == ["0", "1", "2", "a", "b", "c", "d", "e"]
+    assert rows["1"] == [31554, ["4909", "static/chunks/4909.js"], "default"]
+    assert len(rows["d"][3]["articles"]) == 4
+    assert rows["e"][3]["children"] == "© 2025 Anthropic PBC"
+
+
+def test_text_rows_are_sliced_by_utf8_byte_length():
+    rows = dict(iter_flight_rows(extract_rsc_payload(PAGE)))
+
+    assert rows["a"] == SUMMARY
+    assert rows["b"] == "Writing effective tools for agents — with agents"
+
+
+def test_text_rows_run_straight_into_the_next_row():
+    rows = list(iter_flight_rows('1:T5,héll2:["$","p",null,{}]\n3:T3,end'))
+
+    assert rows == [("1", "héll"), ("2", ["$", "p", None, {}]), ("3", "end")]
+
+
+def test_records_resolve_text_row_references():
+    records = list(iter_engineering_records(extract_rsc_payload(PAGE)))
+
+    featured = records[0]
+    assert featured["title"] == "Writing effective tools for agents — with agents"
+    assert featured["summary"] == SUMMARY
+    assert featured["slug"] == "writing-tools-for-agents"
+
+
+def test_parsed_articles():
+    articles = parse_engineering_html(PAGE)
+
+    assert [(a["title"], a["link"], a["date"]) for a in articles] == [
+        (
+            "Writing effective tools for agents — with agents",
+            "https://www.anthropic.com/engineering/writing-tools-for-agents",
+            datetime(2025, 9, 11, tzinfo=pytz.UTC),
+        ),
+        (
+            "How we built our multi-agent research system",
+            "https://www.anthropic.com/engineering/multi-agent-research-system",
+            datetime(2025, 6, 13, tzinfo=pytz.UTC),
+        ),
+        (
+            "Claude Code: Best practices for agentic coding",
+            "https://www.anthropic.com/engineering/claude-code-best-practices",
+            datetime(2025, 4, 18, tzinfo=pytz.UTC),
+        ),
+        (
+            "Building effective agents",
+            "https://www.anthropic.com/engineering/building-effective-agents",
+            datetime(2024, 12, 19, tzinfo=pytz.UTC),
+        ),
+    ]
+    assert articles[0]["description"] == SUMMARY
+    # Without a summary the title stands in for the description
+    assert articles[3]["description"] == "Building effective agents"
+    assert {a["category"] for a in articles} == {"Engineering"}
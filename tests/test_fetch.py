@@ -0,0 +1,124 @@
+"""Retries, retry budget and circuit breaker of utils.fetch against a local HTTP server."""
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from utils import fetch
+
+# How long /slow takes to answer; requests to it use a shorter timeout
+SLOW_RESPONSE = 0.5
+
+
+class Handler(BaseHTTPRequestHandler):
+    """/limited answers 429 once then 200, /unavailable always 503, /slow never in time."""
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.hits[self.path] += 1
+            hits = self.server.hits[self.path]
+
+        if self.path == "/limited" and hits == 1:
+            self.send_response(429)
+            self.send_header("Retry-After", "2")
+        elif self.path.startswith("/unavailable"):
+            self.send_response(503)
+        elif self.path == "/slow":
+            time.sleep(SLOW_RESPONSE)
+            self.send_response(200)
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.hits = Counter()
+    httpd.lock = threading.Lock()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def sleeps(cache_dir, monkeypatch):
+    """Fresh per-process fetch state, no rate limiting, and backoff sleeps recorded instead of slept."""
+    monkeypatch.setattr(fetch, "_retries_used", {})
+    monkeypatch.setattr(fetch, "_breakers", None)
+    monkeypatch.setattr(fetch, "wait_for_slot", lambda url: None)
+    recorded = []
+    monkeypatch.setattr(fetch, "time", SimpleNamespace(sleep=recorded.append))
+    return recorded
+
+
+def test_429_is_retried_after_the_retry_after_delay(server, sleeps):
+    response = fetch.request_with_retries(f"{server.url}/limited")
+
+    assert response.status_code == 200
+    assert server.hits["/limited"] == 2
+    assert sleeps == [2.0]
+
+
+def test_503_is_retried_until_max_attempts(server, sleeps):
+    with pytest.raises(requests.HTTPError):
+        fetch.request_with_retries(f"{server.url}/unavailable")
+
+    assert server.hits["/unavailable"] == fetch.MAX_ATTEMPTS
+    assert len(sleeps) == fetch.MAX_ATTEMPTS - 1
+
+
+def test_timeouts_are_retried(server, sleeps):
+    with pytest.raises(requests.Timeout):
+        fetch.request_with_retries(f"{server.url}/slow", timeout=SLOW_RESPONSE / 5)
+
+    assert server.hits["/slow"] == fetch.MAX_ATTEMPTS
+
+
+def test_retry_budget_is_shared_by_every_request_to_an_origin(server, sleeps):
+    retries_per_request = fetch.MAX_ATTEMPTS - 1
+    requests_within_budget = fetch.RETRY_BUDGET_PER_ORIGIN // retries_per_request
+
+    for i in range(requests_within_budget + 1):
+        with pytest.raises(requests.HTTPError):
+            fetch.request_with_retries(f"{server.url}/unavailable/{i}")
+
+    assert len(sleeps) == fetch.RETRY_BUDGET_PER_ORIGIN
+    # Once the budget is spent a request gets a single attempt
+    assert server.hits[f"/unavailable/{requests_within_budget}"] == 1
+
+
+def test_breaker_opens_after_repeated_failures_and_is_persisted(server, sleeps, cache_dir):
+    for i in range(fetch.BREAKER_THRESHOLD):
+        with pytest.raises(requests.HTTPError):
+            fetch.request_with_retries(f"{server.url}/unavailable/{i}")
+    hits = sum(server.hits.values())
+
+    with pytest.raises(fetch.CircuitOpenError):
+        fetch.request_with_retries(f"{server.url}/ok")
+    assert sum(server.hits.values()) == hits
+
+    breakers = json.loads((cache_dir / f"{fetch.BREAKER_STATE}.json").read_text())
+    assert breakers[server.url]["failures"] == fetch.BREAKER_THRESHOLD
+    assert breakers[server.url]["open_until"]
+
+    # A later run loads the open breaker from cache/ and still refuses the origin
+    fetch._breakers = None
+    with pytest.raises(fetch.CircuitOpenError):
+        fetch.request_with_retries(f"{server.url}/ok")
+    assert server.hits["/ok"] == 0
@@ -0,0 +1,52 @@
+"""Skipping unchanged listing pages."""
+
+import pytest
+
+from utils import enrich
+from utils.fingerprint import generate_unless_unchanged
+
+PAGE = '<html><body><ul><li><a href="/post">Post</a></li></ul><script>build=1</script></body></html>'
+
+
+@pytest.fixture
+def feed_path(cache_dir, tmp_path, monkeypatch):
+    monkeypatch.delenv("FORCE_REGENERATE", raising=False)
+    path = tmp_path / "feed_test.xml"
+    path.write_text("<rss/>")
+    return path
+
+
+def run(feed_path, result, page=PAGE):
+    """Run the helper once; returns (its result, whether generate was called)."""
+    calls = []
+
+    def generate():
+        calls.append(True)
+        return result
+
+    return generate_unless_unchanged("test", page, __file__, feed_path, generate), bool(calls)
+
+
+def test_unchanged_page_is_not_generated_again(feed_path):
+    assert run(feed_path, True) == (True, True)
+    assert run(feed_path, True, PAGE.replace("build=1", "build=2")) == (True, False)
+    assert run(feed_path, True, PAGE.replace("Post", "New post")) == (True, True)
+
+
+def test_incomplete_feed_is_generated_again(feed_path):
+    assert run(feed_path, None) == (True, True)
+    assert run(feed_path, True) == (True, True)
+    assert run(feed_path, True) == (True, False)
+
+
+def test_failed_generation_is_reported_and_retried(feed_path):
+    assert run(feed_path, False) == (False, True)
+    assert run(feed_path, True) == (True, True)
+
+
+def test_enrichment_pending_counts_uncached_articles(cache_dir, monkeypatch):
+    monkeypatch.delenv("SKIP_ENRICHMENT", raising=False)
+    articles = [{"link": "https://example.com/a"}, {"link": "https://example.com/b"}]
+    enrich.save_state("enriched_test", {"https://example.com/a": {"fetched": "2024-01-01T00:00:00+00:00"}})
+
+    assert enrich.enrichment_pending(articles, "test") == 1
@@ -0,0 +1,81 @@
+"""Source health recording and back-off."""
+
+import pytest
+
+from utils import health
+
+SCRIPT = __file__
+
+
+@pytest.fixture(autouse=True)
+def fresh_process(cache_dir, monkeypatch):
+    """Each test starts like a new generator process with an empty cache."""
+    monkeypatch.setattr(health, "_recorded_sources", set())
+    monkeypatch.delenv("IGNORE_SOURCE_HEALTH", raising=False)
+
+
+def get_entry():
+    return health.load_state(health.STATE_NAME)[health.get_source_name(SCRIPT)]
+
+
+def test_failure_before_record_run_backs_the_source_off():
+    health.record_failure(SCRIPT, RuntimeError("connection refused"))
+
+    entry = get_entry()
+    assert entry["broken"]
+    assert entry["reason"] == "run failed: connection refused"
+    assert health.should_skip(SCRIPT)
+
+
+def test_failure_after_record_run_is_not_counted_twice():
+    health.record_run(SCRIPT, 12, {"a.card": 12})
+    health.record_failure(SCRIPT, OSError("disk full"))
+
+    entry = get_entry()
+    assert not entry.get("broken")
+    assert entry["counts"] == [12]
+
+
+def test_run_without_selector_hits_keeps_the_selector_history():
+    health.record_run(SCRIPT, 12, {"a.card": 12})
+    health.record_run(SCRIPT, 12)
+
+    assert get_entry()["selectors"] == {"a.card": 12}
+
+    # The history still detects a selector that stops matching later
+    assert not health.record_run(SCRIPT, 12, {"a.card": 0})
+
+
+def test_unchanged_health_is_not_rewritten(monkeypatch):
+    for _ in range(health.HISTORY_LENGTH):
+        health.record_run(SCRIPT, 12, {"a.card": 12})
+    saves = []
+    monkeypatch.setattr(health, "save_state", lambda *args: saves.append(args))
+
+    health.record_run(SCRIPT, 12, {"a.card": 12})
+    assert saves == []
+
+    # A real change is still written
+    health.record_run(SCRIPT, 0, {"a.card": 12})
+    assert len(saves) == 1
+
+
+def test_timed_out_batch_script_backs_off_every_source_it_generates(monkeypatch):
+    import run_all_feeds
+
+    ran = []
+
+    def run_script(script_path, timeout):
+        ran.append(script_path)
+        return None, ""
+
+    monkeypatch.setattr(run_all_feeds, "run_script", run_script)
+    monkeypatch.setattr(run_all_feeds, "publish_feeds", lambda: None)
+    monkeypatch.setattr(run_all_feeds.os, "listdir", lambda path: ["anthropic_batch.py", "ollama_blog.py"])
+
+    run_all_feeds.run_all_feeds()
+
+    state = health.load_state(health.STATE_NAME)
+    assert set(state) == {"anthropic_news_blog", "anthropic_research_blog", "ollama_blog"}
+    assert all(entry["broken"] and "timed out" in entry["reason"] for entry in state.values())
+    assert health.should_skip(run_all_feeds.__file__.replace("run_all_feeds.py", "ollama_blog.py"))
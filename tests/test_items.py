@@ -0,0 +1,87 @@
+"""FeedItem: GUID identity, dict conversion and content hashing."""
+
+import pickle
+from datetime import datetime
+
+import pytz
+
+from utils.items import FeedItem
+
+DATE = datetime(2024, 3, 1, 12, 30, tzinfo=pytz.UTC)
+
+
+def make_item(**overrides):
+    values = {
+        "title": "Post",
+        "link": "https://example.com/post",
+        "date": DATE,
+        "description": "Summary",
+        "category": "Blog",
+    }
+    values.update(overrides)
+    return FeedItem(**values)
+
+
+def test_items_are_equal_and_hash_by_guid():
+    item = make_item()
+
+    assert item == make_item(title="Edited title", description="Edited")
+    assert len({item, make_item(title="Edited title")}) == 1
+    assert item != make_item(link="https://example.com/other")
+    assert make_item(guid="post-1") == make_item(link="https://example.com/moved", guid="post-1")
+    assert make_item(guid="post-1") != item
+    assert hash(make_item(guid="post-1")) == hash(make_item(link="https://example.com/moved", guid="post-1"))
+    assert item.id == "https://example.com/post"
+
+
+def test_from_dict_accepts_the_old_key_names():
+    item = FeedItem.from_dict(
+        {
+            "title": "Post",
+            "url": "https://example.com/post",
+            "pub_date": "2024-03-01T12:30:00Z",
+            "id": "post-1",
+            "unknown": "ignored",
+        }
+    )
+
+    assert item.link == "https://example.com/post"
+    assert item.date == DATE
+    assert item.guid == "post-1"
+
+
+def test_from_dict_naive_dates_are_utc():
+    naive = datetime(2024, 3, 1, 12, 30)
+
+    item = FeedItem.from_dict({"title": "Post", "link": "https://example.com/post", "date": naive})
+
+    assert item.date == DATE
+    assert item.date.tzinfo is not None
+
+
+def test_to_dict_round_trip():
+    item = make_item(author="Someone", content="<p>Body</p>", guid="post-1")
+
+    data = item.to_dict()
+
+    assert data["date"] == "2024-03-01T12:30:00+00:00"
+    assert FeedItem.from_dict(data).to_dict() == data
+    assert "content" not in make_item().to_dict()
+
+
+def test_content_hash_only_changes_with_what_readers_see():
+    item = make_item()
+
+    assert item.content_hash() == make_item().content_hash()
+    assert item.content_hash() == FeedItem.from_dict(item.to_dict()).content_hash()
+    assert item.content_hash() != make_item(title="Edited title").content_hash()
+    assert item.content_hash() != make_item(date=datetime(2024, 3, 2, tzinfo=pytz.UTC)).content_hash()
+
+
+def test_items_survive_pickling():
+    item = make_item(guid="post-1")
+
+    copy = pickle.loads(pickle.dumps(item))
+
+    assert copy == item
+    assert copy.to_dict() == item.to_dict()
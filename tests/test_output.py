@@ -0,0 +1,37 @@
+"""Feed serialization keeps what feedgen wrote."""
+
+import gzip
+from datetime import datetime
+
+import pytz
+from feedgen.feed import FeedGenerator
+
+from utils.output import write_feed
+
+CONTENT = "<p>Body with <a href='https://example.com/?a=1&b=2'>a link</a> & more</p>"
+
+
+def build_feed():
+    fg = FeedGenerator()
+    fg.title("Test feed")
+    fg.link(href="https://example.com/")
+    fg.description("A test feed")
+    fg.lastBuildDate(datetime(2024, 1, 1, tzinfo=pytz.UTC))
+    fe = fg.add_entry()
+    fe.title("Post")
+    fe.link(href="https://example.com/post")
+    fe.description("Summary")
+    fe.content(CONTENT, type="CDATA")
+    return fg
+
+
+def test_reindented_feed_keeps_cdata(tmp_path):
+    fg = build_feed()
+    path = tmp_path / "feed_test.xml"
+
+    write_feed(fg, path, pretty=True, compress=("gz",))
+
+    xml = path.read_bytes()
+    assert f"<content:encoded><![CDATA[{CONTENT}]]></content:encoded>".encode() in xml
+    assert xml == fg.rss_str(pretty=True)
+    assert gzip.decompress((tmp_path / "feed_test.xml.gz").read_bytes()) == fg.rss_str(pretty=False)
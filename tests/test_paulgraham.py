@@ -0,0 +1,56 @@
+"""Paul Graham essays are fetched once and served from the cache afterwards."""
+
+import pytest
+
+import paulgraham_blog
+
+ESSAY_COUNT = 5
+
+
+def essays_page(count):
+    links = "".join(f'<a href="essay{i}.html">Essay {i}</a><br>' for i in reversed(range(count)))
+    return f'<html><body><font size="2">{links}</font></body></html>'
+
+
+def essay_html(i):
+    text = f"March {2000 + i} " + "An essay about startups. " * 10
+    return f'<html><body><font size="2">{text}</font></body></html>'
+
+
+@pytest.fixture
+def fetched(cache_dir, monkeypatch):
+    """Serve essay pages without the network, parse inline, and record fetched URLs."""
+    urls = []
+
+    def fetch(url):
+        urls.append(url)
+        return essay_html(int(url.rsplit("essay", 1)[1].split(".")[0]))
+
+    monkeypatch.setattr(paulgraham_blog, "fetch_html_content", fetch)
+    monkeypatch.setenv("PARSE_WORKERS", "0")
+    return urls
+
+
+def test_only_new_essays_are_fetched(fetched):
+    first = paulgraham_blog.parse_essays_page(essays_page(ESSAY_COUNT))
+    assert len(fetched) == ESSAY_COUNT
+
+    fetched.clear()
+    second = paulgraham_blog.parse_essays_page(essays_page(ESSAY_COUNT + 1))
+
+    assert fetched == [f"https://paulgraham.com/essay{ESSAY_COUNT}.html"]
+    assert [post.link for post in second[1:]] == [post.link for post in first]
+    assert [post.description for post in second[1:]] == [post.description for post in first]
+    assert second[0].date.year == 2000 + ESSAY_COUNT
+
+
+def test_new_essays_are_fetched_over_several_runs(fetched, monkeypatch):
+    monkeypatch.setattr(paulgraham_blog, "MAX_NEW_ESSAYS_PER_RUN", 3)
+
+    first = paulgraham_blog.parse_essays_page(essays_page(ESSAY_COUNT))
+    second = paulgraham_blog.parse_essays_page(essays_page(ESSAY_COUNT))
+
+    # The newest essays come first; the next run fetches the rest
+    assert [post.title for post in first] == ["Essay 4", "Essay 3", "Essay 2"]
+    assert len(fetched) == ESSAY_COUNT
+    assert len(second) == ESSAY_COUNT
@@ -0,0 +1,30 @@
+"""Fetching on threads and parsing in spawned worker processes."""
+
+import os
+
+from utils.pipeline import fetch_and_parse
+
+URLS = [f"https://example.com/{n}" for n in range(6)]
+
+
+def fetch(url):
+    return f"<h1>{url.rsplit('/', 1)[1]}</h1>"
+
+
+def parse(page):
+    """Module-level, so spawned workers can import it."""
+    return page[4:-5], os.getpid()
+
+
+def test_pages_are_parsed_in_worker_processes_in_url_order():
+    records = fetch_and_parse(URLS, parse, fetch=fetch, io_workers=3, parse_workers=2)
+
+    assert [title for title, _ in records] == [str(n) for n in range(6)]
+    assert all(pid != os.getpid() for _, pid in records)
+
+
+def test_zero_parse_workers_parses_in_the_fetch_threads():
+    records = fetch_and_parse(URLS, parse, fetch=fetch, parse_workers=0)
+
+    assert [title for title, _ in records] == [str(n) for n in range(6)]
+    assert all(pid == os.getpid() for _, pid in records)
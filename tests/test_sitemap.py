@@ -0,0 +1,138 @@
+"""Sitemap discovery against the fixture sitemaps in fixtures/sitemap/."""
+
+import shutil
+from datetime import datetime
+
+import pytest
+import pytz
+
+from conftest import FIXTURES_DIR
+from utils.sitemap import discover_changed_urls, remember_discovery
+
+ROOT_URL = "https://example.com/sitemap.xml"
+
+
+@pytest.fixture
+def sitemap_dir(tmp_path):
+    """A writable copy of the fixture sitemaps."""
+    directory = tmp_path / "sitemap"
+    shutil.copytree(FIXTURES_DIR / "sitemap", directory)
+    return directory
+
+
+@pytest.fixture
+def fetch(sitemap_dir):
+    """Serve https://example.com/<name> from the sitemap copy and record what was fetched."""
+
+    def fetch(url):
+        fetch.fetched.append(url)
+        return (sitemap_dir / url.rsplit("/", 1)[-1]).read_text()
+
+    fetch.fetched = []
+    return fetch
+
+
+def test_first_run_reports_every_article_newest_first(cache_dir, fetch):
+    discovery, changed = discover_changed_urls("test", ROOT_URL, path_prefix="/news/", fetch=fetch)
+
+    assert changed == [
+        "https://example.com/news/newest",
+        "https://example.com/news/middle",
+        "https://example.com/news/launch",
+        "https://example.com/news/older",
+    ]
+    assert set(discovery["urls"]) == set(changed)
+
+
+def test_unchanged_nested_index_keeps_its_whole_subtree(cache_dir, fetch):
+    discovery, _ = discover_changed_urls("test", ROOT_URL, path_prefix="/news/", fetch=fetch)
+    remember_discovery("test", discovery)
+    fetch.fetched.clear()
+
+    discovery, changed = discover_changed_urls("test", ROOT_URL, path_prefix="/news/", fetch=fetch)
+
+    # Only the root index (which has no lastmod of its own) is fetched again
+    assert fetch.fetched == [ROOT_URL]
+    assert changed == []
+    assert set(discovery["urls"]) == {
+        "https://example.com/news/launch",
+        "https://example.com/news/older",
+        "https://example.com/news/newest",
+        "https://example.com/news/middle",
+    }
+
+    # The carried-over subtree is saved again, so a third run still has it
+    remember_discovery("test", discovery)
+    discovery, changed = discover_changed_urls("test", ROOT_URL, path_prefix="/news/", fetch=fetch)
+    assert len(discovery["urls"]) == 4
+    assert changed == []
+
+
+def test_moved_lastmod_reports_only_that_article(cache_dir, fetch, sitemap_dir):
+    discovery, _ = discover_changed_urls("test", ROOT_URL, path_prefix="/news/", fetch=fetch)
+    remember_discovery("test", discovery)
+
+    for name in ("sitemap.xml", "sitemap-news-index.xml"):
+        path = sitemap_dir / name
+        path.write_text(path.read_text().replace("2024-05-03", "2024-06-01"))
+    leaf = sitemap_dir / "sitemap-news-2024.xml"
+    leaf.write_text(leaf.read_text().replace("2024-02-01", "2024-06-01"))
+    fetch.fetched.clear()
+
+    _, changed = discover_changed_urls("test", ROOT_URL, path_prefix="/news/", fetch=fetch)
+
+    assert changed == ["https://example.com/news/older"]
+    assert "https://example.com/sitemap-pages.xml" not in fetch.fetched
+
+
+def test_unprocessed_urls_are_reported_again(cache_dir, fetch):
+    discovery, changed = discover_changed_urls("test", ROOT_URL, path_prefix="/news/", fetch=fetch)
+    remember_discovery("test", discovery, unprocessed=changed[2:])
+
+    _, changed_again = discover_changed_urls("test", ROOT_URL, path_prefix="/news/", fetch=fetch)
+
+    assert changed_again == changed[2:]
+
+
+def test_news_sitemap_fetches_newest_and_merges_with_the_feed(cache_dir, fetch, monkeypatch):
+    pytest.importorskip("selenium")
+    import anthropic_news_blog
+
+    fetched_articles = []
+
+    def fetch_article(url):
+        fetched_articles.append(url)
+        slug = url.rsplit("/", 1)[-1]
+        return (
+            f'<html><head><meta property="og:title" content="Article {slug} | Anthropic">'
+            f'<meta property="article:published_time" content="2024-05-01T00:00:00Z"></head></html>'
+        )
+
+    monkeypatch.setattr(anthropic_news_blog, "fetch_html", fetch_article)
+    monkeypatch.setattr(anthropic_news_blog, "MAX_ARTICLE_FETCHES", 2)
+    existing = [
+        {
+            "title": "An article already in the feed",
+            "link": "https://example.com/news/from-the-feed",
+            "date": datetime(2023, 1, 1, tzinfo=pytz.UTC),
+            "category": "News",
+            "description": "An article already in the feed",
+        }
+    ]
+    config = {"sitemap_url": ROOT_URL, "path_prefix": "/news/", "fetch": fetch}
+
+    articles = anthropic_news_blog.fetch_news_articles_sitemap(config, existing_articles=existing)
+
+    assert fetched_articles == ["https://example.com/news/newest", "https://example.com/news/middle"]
+    assert [article["link"] for article in articles] == [
+        "https://example.com/news/newest",
+        "https://example.com/news/middle",
+        "https://example.com/news/from-the-feed",
+    ]
+    assert articles[0]["title"] == "Article newest"
+
+    # The next run picks up the remaining articles
+    fetched_articles.clear()
+    articles = anthropic_news_blog.fetch_news_articles_sitemap(config, existing_articles=existing)
+    assert fetched_articles == ["https://example.com/news/launch", "https://example.com/news/older"]
+    assert len(articles) == 5
@@ -0,0 +1,122 @@
+"""Suleyman post discovery: the one-pass candidate collection against the sequential strategies."""
+
+import random
+import re
+
+import pytest
+
+pytest.importorskip("selenium")
+from bs4 import BeautifulSoup  # noqa: E402
+
+import suleyman_blog  # noqa: E402
+
+FRAGMENTS = 3000
+
+TAGS = ["div", "li", "section", "article", "span", "p", "h2", "h3", "strong", "ul"]
+CLASSES = ["", "card", "post-item", "writing-list", "title", "meta", "grid", "article-body", "nav"]
+HREFS = [
+    "/blog/first-post",
+    "/blog/second-post",
+    "/writing/essay",
+    "https://example.com/article/news",
+    "/about",
+    "/",
+    "#",
+    "https://twitter.com/mustafasuleyman",
+    "/post/third",
+    "mailto:someone@example.com",
+]
+TEXTS = [
+    "The coming wave",
+    "March 3, 2024",
+    "12 January 2023",
+    "2022-07-15",
+    "Home",
+    "AI",
+    "A longer description of what the essay is about.",
+    "Read more",
+]
+
+
+def random_element(rng, depth):
+    if depth > 2 or rng.random() < 0.3:
+        if rng.random() < 0.5:
+            return f'<a href="{rng.choice(HREFS)}">{rng.choice(TEXTS)}</a>'
+        return rng.choice(TEXTS)
+    tag = rng.choice(TAGS)
+    attrs = ""
+    if rng.random() < 0.6:
+        attrs += f' class="{rng.choice(CLASSES)}"'
+    if rng.random() < 0.05:
+        attrs += ' id="writing"'
+    children = "".join(random_element(rng, depth + 1) for _ in range(rng.randint(1, 3)))
+    return f"<{tag}{attrs}>{children}</{tag}>"
+
+
+def sequential_parse(html_content):
+    """The parser before the one-pass collection: four strategies run one after another."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    posts = []
+    seen_links = set()
+
+    def extract(container, link):
+        href = link.get("href", "")
+        if href in seen_links or not suleyman_blog.is_post_href(href):
+            return
+        seen_links.add(href)
+        title = None
+        for selector in suleyman_blog.TITLE_SELECTORS:
+            title_elem = container.select_one(selector) if hasattr(container, "select_one") else None
+            if title_elem:
+                title = title_elem.get_text(strip=True)
+                if title and len(title) > 3:
+                    break
+        if not title:
+            title = link.get_text(strip=True)
+        post = suleyman_blog.extract_post_from_element(container, link)
+        if post:
+            assert post["title"] == title
+            posts.append(post)
+
+    for article in soup.find_all("article"):
+        link = article.find("a", href=True)
+        if link:
+            extract(article, link)
+
+    writing_section = soup.find(id="writing") or soup.find(class_=re.compile(r"writing", re.I))
+    if writing_section:
+        for link in writing_section.find_all("a", href=True):
+            extract(link.parent, link)
+
+    for link in soup.find_all("a", href=re.compile(r"(blog|writing|post|article)", re.I)):
+        extract(link.parent, link)
+
+    for card in soup.find_all(["div", "li"], class_=re.compile(r"(card|post|article|item)", re.I)):
+        link = card.find("a", href=True)
+        if link:
+            extract(card, link)
+
+    return posts
+
+
+def test_one_pass_collection_matches_the_sequential_strategies():
+    rng = random.Random(44)
+    for _ in range(FRAGMENTS):
+        html = "<html><body>" + "".join(random_element(rng, 0) for _ in range(rng.randint(1, 6))) + "</body></html>"
+        assert suleyman_blog.parse_blog_html(html) == sequential_parse(html), html
+
+
+def test_strategy_stats_are_only_written_when_they_change(cache_dir, monkeypatch):
+    saves = []
+    save_state = suleyman_blog.save_state
+    monkeypatch.setattr(suleyman_blog, "save_state", lambda *args: saves.append(args) or save_state(*args))
+
+    suleyman_blog.record_strategy_wins({"article": 3})
+    suleyman_blog.record_strategy_wins({"article": 3})
+    assert len(saves) == 1
+
+    suleyman_blog.record_strategy_wins({"article": 2, "card": 1})
+    stats = suleyman_blog.load_state(suleyman_blog.STRATEGY_STATE)
+    assert len(saves) == 2
+    assert stats["won"] == ["article", "card"]
+    assert stats["last_run"]["card"] == 1